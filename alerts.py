@@ -0,0 +1,31 @@
+# alerts.py
+# Materialized dashboard alerts: the sets of students with low attendance and
+# with pending fees, kept up to date one student at a time as records change,
+# so showing the alerts is just two len() calls.
+
+
+class AlertView:
+    """student_id sets behind the dashboard alerts."""
+
+    def __init__(self, threshold=75.0):
+        self.threshold = threshold
+        self.low_attendance = set()
+        self.pending_fees = set()
+
+    def update_attendance(self, student_id, present, recorded):
+        # no recorded days counts as 0%, as in calculate_attendance_percentage
+        percent = present / recorded * 100 if recorded else 0.0
+        if percent < self.threshold:
+            self.low_attendance.add(student_id)
+        else:
+            self.low_attendance.discard(student_id)
+
+    def update_fee(self, student_id, pending):
+        if pending:
+            self.pending_fees.add(student_id)
+        else:
+            self.pending_fees.discard(student_id)
+
+    def remove(self, student_id):
+        self.low_attendance.discard(student_id)
+        self.pending_fees.discard(student_id)
@@ -0,0 +1,304 @@
+# analytics.py
+# Grades and class statistics for all students at once. Marks are packed into
+# a students x subjects NumPy matrix with a mask for missing cells, so averages,
+# grades (searchsorted over GRADE_BOUNDARIES) and per-class mean, median,
+# std-dev and percentiles each come out of one vectorized pass. NumPy is
+# optional: without it the same numbers are computed student by student.
+
+from bisect import bisect_right
+from statistics import mean, median, pstdev
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# an average >= boundary[i] earns at least label[i + 1]
+GRADE_BOUNDARIES = (50.0, 60.0, 70.0, 80.0, 90.0)
+GRADE_LABELS = ('F', 'C', 'B', 'B+', 'A', 'A+')
+PERCENTILES = (25, 75, 90)
+# an exam is passed at the lowest grade boundary
+PASS_PERCENT = GRADE_BOUNDARIES[0]
+# exam score histogram: ten 10-point percentage bands (the top one includes 100), then above 100 from bonus
+BANDS = tuple(f"{lo}-{lo + 9}" for lo in range(0, 90, 10)) + ('90-100', '>100')
+
+
+def grade_for(avg, boundaries=GRADE_BOUNDARIES, labels=GRADE_LABELS):
+    """Grade label for one average (or percentage)."""
+    return labels[bisect_right(boundaries, avg)]
+
+
+def _percentile(sorted_values, q):
+    # linear interpolation between closest ranks, as numpy.percentile does by default
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _summary(values, percentiles=()):
+    """count, mean, median, std (population), min, max and p<q> of a list of numbers."""
+    values = sorted(values)
+    entry = {'count': len(values)}
+    if values:
+        entry.update({'mean': mean(values), 'median': median(values), 'std': pstdev(values),
+                      'min': values[0], 'max': values[-1]})
+        entry.update({f'p{q}': _percentile(values, q) for q in percentiles})
+    return entry
+
+
+def _group_summary(codes, values, groups, percentiles=()):
+    """
+    The same figures as _summary for every group at once: codes[i] in
+    range(groups) says which group values[i] belongs to. Returns a dict of
+    per-group arrays plus the codes and values sorted by (group, value).
+    """
+    order = np.lexsort((values, codes))
+    codes = codes[order]
+    values = values[order]
+    counts = np.bincount(codes, minlength=groups)
+    # each group is now one sorted run starting here
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(int)
+    safe = np.maximum(counts, 1)
+    means = np.bincount(codes, weights=values, minlength=groups) / safe
+    stds = np.sqrt(np.bincount(codes, weights=(values - means[codes]) ** 2, minlength=groups) / safe)
+    padded = values if len(values) else np.zeros(1)
+    last = len(padded) - 1
+
+    def quantile(q):
+        pos = (safe - 1) * q / 100
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, safe - 1)
+        frac = pos - lo
+        return (padded[np.minimum(starts + lo, last)] * (1 - frac)
+                + padded[np.minimum(starts + hi, last)] * frac)
+
+    out = {'count': counts, 'mean': means, 'median': quantile(50), 'std': stds,
+           'min': padded[np.minimum(starts, last)], 'max': padded[np.minimum(starts + safe - 1, last)],
+           'codes': codes, 'values': values}
+    out.update({f'p{q}': quantile(q) for q in percentiles})
+    return out
+
+
+def _entry(summary, i, keys):
+    # one group's figures as plain floats; only the count when the group is empty
+    count = int(summary['count'][i])
+    entry = {'count': count}
+    if count:
+        entry.update({key: float(summary[key][i]) for key in keys})
+    return entry
+
+
+def _band(pct):
+    return len(BANDS) - 1 if pct > 100 else min(int(max(pct, 0) // 10), len(BANDS) - 2)
+
+
+def exam_statistics(exams, pass_percent=PASS_PERCENT):
+    """
+    Statistics for many exams in one pass. exams yields (exam_id, max_marks,
+    marks, bonuses) with one mark and one bonus per result. Returns
+    {exam_id: {'count', 'mean', 'median', 'std', 'min', 'max' (of marks + bonus),
+    'mean_percent', 'pass_rate', 'histogram': {band: n}, 'bonus': {...}}};
+    an exam without results only has 'count' and an empty histogram.
+    """
+    exams = list(exams)
+    if np is None:
+        return {exam_id: _exam_entry_python(max_marks, marks, bonuses, pass_percent)
+                for exam_id, max_marks, marks, bonuses in exams}
+    n = len(exams)
+    sizes = [len(marks) for _, _, marks, _ in exams]
+    codes = np.repeat(np.arange(n), sizes)
+    marks = np.fromiter((m for _, _, ms, _ in exams for m in ms), dtype=float, count=sum(sizes))
+    bonus = np.fromiter((b for _, _, _, bs in exams for b in bs), dtype=float, count=sum(sizes))
+    max_marks = np.array([mx for _, mx, _, _ in exams], dtype=float)[codes]
+    total = marks + bonus
+    # 0% when an exam has no maximum, as in calculate_student_percentage
+    scale = np.divide(100.0, max_marks, out=np.zeros_like(max_marks), where=max_marks > 0)
+    pct = total * scale
+    summary = _group_summary(codes, total, n)
+    safe = np.maximum(summary['count'], 1)
+    mean_pct = np.bincount(codes, weights=pct, minlength=n) / safe
+    passed = pct >= pass_percent
+    pass_rate = np.bincount(codes, weights=passed, minlength=n) / safe
+    passed_by_bonus = np.bincount(codes, weights=passed & (marks * scale < pass_percent), minlength=n)
+    has_bonus = bonus > 0
+    bonus_count = np.bincount(codes, weights=has_bonus, minlength=n)
+    bonus_sum = np.bincount(codes, weights=bonus, minlength=n)
+    uplift = np.bincount(codes, weights=bonus * scale, minlength=n) / safe
+    bands = np.where(pct > 100, len(BANDS) - 1, np.minimum((np.maximum(pct, 0) // 10).astype(int), len(BANDS) - 2))
+    hist = np.bincount(codes * len(BANDS) + bands, minlength=n * len(BANDS)).reshape(n, len(BANDS))
+    stats = {}
+    for i, (exam_id, _, _, _) in enumerate(exams):
+        entry = _entry(summary, i, ('mean', 'median', 'std', 'min', 'max'))
+        entry['histogram'] = {band: int(c) for band, c in zip(BANDS, hist[i]) if c}
+        if entry['count']:
+            entry['mean_percent'] = float(mean_pct[i])
+            entry['pass_rate'] = float(pass_rate[i])
+            entry['bonus'] = {
+                'students': int(bonus_count[i]),
+                'mean': float(bonus_sum[i] / bonus_count[i]) if bonus_count[i] else 0.0,
+                'uplift_percent': float(uplift[i]),
+                'passed_by_bonus': int(passed_by_bonus[i]),
+            }
+        stats[exam_id] = entry
+    return stats
+
+
+def _exam_entry_python(max_marks, marks, bonuses, pass_percent):
+    scale = 100.0 / max_marks if max_marks > 0 else 0.0
+    totals = [m + b for m, b in zip(marks, bonuses)]
+    entry = _summary(totals)
+    hist = {}
+    for total in totals:
+        band = BANDS[_band(total * scale)]
+        hist[band] = hist.get(band, 0) + 1
+    entry['histogram'] = {band: hist[band] for band in BANDS if band in hist}
+    if totals:
+        count = len(totals)
+        with_bonus = [b for b in bonuses if b > 0]
+        entry['mean_percent'] = sum(totals) * scale / count
+        entry['pass_rate'] = sum(1 for t in totals if t * scale >= pass_percent) / count
+        entry['bonus'] = {
+            'students': len(with_bonus),
+            'mean': sum(with_bonus) / len(with_bonus) if with_bonus else 0.0,
+            'uplift_percent': sum(bonuses) * scale / count,
+            'passed_by_bonus': sum(1 for m, b in zip(marks, bonuses)
+                                   if (m + b) * scale >= pass_percent and m * scale < pass_percent),
+        }
+    return entry
+
+
+class GradeBook:
+    """
+    Averages and grades of a list of students, plus class statistics over
+    those averages. Build a new one after marks change; the manager keeps one
+    and drops it whenever a student record changes.
+    """
+
+    def __init__(self, students, boundaries=GRADE_BOUNDARIES, labels=GRADE_LABELS):
+        if len(labels) != len(boundaries) + 1:
+            raise ValueError("Need exactly one more grade label than boundaries.")
+        self.boundaries = tuple(boundaries)
+        self.labels = tuple(labels)
+        self.ids = [stu.get_student_id() for stu in students]
+        self.classes = [stu.class_section for stu in students]
+        # first entry wins on duplicate ids, like the manager's registry
+        self._rows = {}
+        for i, sid in enumerate(self.ids):
+            self._rows.setdefault(sid, i)
+        # True when the arrays are NumPy's
+        self.vectorized = np is not None
+        if self.vectorized:
+            self._pack(students)
+        else:
+            self.subjects = sorted({s for stu in students for s in stu._mark_subjects})
+            self.averages = [sum(stu._mark_values) / len(stu._mark_values) if stu._mark_values else None
+                             for stu in students]
+            self.grades = [grade_for(avg, self.boundaries, self.labels) if avg is not None else None
+                           for avg in self.averages]
+
+    def _pack(self, students):
+        # students share a handful of subject tuples, so map each tuple to its columns once
+        columns = {}
+        subjects = {}
+        values = []
+        rows = []
+        cols = []
+        for i, stu in enumerate(students):
+            marks = stu._mark_values
+            if not marks:
+                continue
+            key = stu._mark_subjects
+            idx = columns.get(key)
+            if idx is None:
+                idx = columns[key] = [subjects.setdefault(s, len(subjects)) for s in key]
+            values.extend(marks)
+            cols.extend(idx)
+            rows.extend([i] * len(idx))
+        n = len(students)
+        self.subjects = list(subjects)
+        self.marks = np.zeros((n, len(subjects)))
+        self.mask = np.zeros((n, len(subjects)), dtype=bool)
+        self.marks[rows, cols] = values
+        self.mask[rows, cols] = True
+        counts = self.mask.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # NaN for students without marks
+            self.averages = self.marks.sum(axis=1) / counts
+        codes = np.searchsorted(np.array(self.boundaries), self.averages, side='right')
+        labels = np.array(self.labels + (None,), dtype=object)
+        codes[counts == 0] = len(self.labels)
+        self.grades = labels[codes]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def average(self, student_id):
+        """Average mark of a student, or None without marks or when unknown."""
+        row = self._rows.get(student_id)
+        if row is None:
+            return None
+        avg = self.averages[row]
+        return None if avg is None or avg != avg else float(avg)
+
+    def grade(self, student_id):
+        row = self._rows.get(student_id)
+        return None if row is None else self.grades[row]
+
+    def ranked(self, n=None):
+        """(student_id, average) best first, students without marks left out; ties keep list order."""
+        if self.vectorized:
+            order = np.argsort(-self.averages, kind='stable')
+            order = order[~np.isnan(self.averages[order])][:n]
+            return [(self.ids[i], float(self.averages[i])) for i in order]
+        scored = [(sid, avg) for sid, avg in zip(self.ids, self.averages) if avg is not None]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[:n]
+
+    def class_stats(self, percentiles=PERCENTILES):
+        """
+        {class: {'students', 'graded', 'mean', 'median', 'std', 'p25', ..., 'grades': {label: count}}}
+        over the averages of the students with marks in each class.
+        """
+        if not self.vectorized:
+            return self._class_stats_python(percentiles)
+        names, codes = np.unique(np.array(self.classes, dtype=str), return_inverse=True)
+        sizes = np.bincount(codes, minlength=len(names))
+        graded = ~np.isnan(self.averages)
+        summary = _group_summary(codes[graded], self.averages[graded], len(names), percentiles)
+        keys = ['mean', 'median', 'std'] + [f'p{q}' for q in percentiles]
+        grade_codes = np.searchsorted(np.array(self.boundaries), summary['values'], side='right')
+        dist = np.zeros((len(names), len(self.labels)), dtype=int)
+        np.add.at(dist, (summary['codes'], grade_codes), 1)
+        stats = {}
+        for i, name in enumerate(names):
+            entry = _entry(summary, i, keys)
+            entry = {'students': int(sizes[i]), 'graded': entry.pop('count'), **entry}
+            entry['grades'] = {label: int(c) for label, c in zip(self.labels, dist[i]) if c}
+            stats[str(name)] = entry
+        return stats
+
+    def _class_stats_python(self, percentiles):
+        groups = {}
+        sizes = {}
+        for cls, avg in zip(self.classes, self.averages):
+            cls = str(cls)
+            sizes[cls] = sizes.get(cls, 0) + 1
+            groups.setdefault(cls, [])
+            if avg is not None:
+                groups[cls].append(avg)
+        stats = {}
+        for cls in sorted(groups):
+            avgs = groups[cls]
+            entry = _summary(avgs, percentiles)
+            del entry['count']
+            entry.pop('min', None)
+            entry.pop('max', None)
+            entry = {'students': sizes[cls], 'graded': len(avgs), **entry}
+            grades = {}
+            for avg in avgs:
+                label = grade_for(avg, self.boundaries, self.labels)
+                grades[label] = grades.get(label, 0) + 1
+            entry['grades'] = {label: grades[label] for label in self.labels if label in grades}
+            stats[cls] = entry
+        return stats
@@ -0,0 +1,585 @@
+# attendance.py
+# Columnar attendance storage: one bytearray row per date, one column per student,
+# one status byte per cell (0 = no record). Exposes a dict-like view so existing
+# code can keep using attendance[date][student_id] == 'Present'.
+# Dates are also kept in a sorted timeline (parsed YYYY-MM-DD, searched with
+# bisect) with per-date and per-month/week present/recorded counters, so range
+# queries and rollups never scan the whole history.
+
+import os
+import struct
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import MutableMapping
+from datetime import date
+
+MAGIC = b'SMSATT'
+# 2: names are length-prefixed (1 joined them with newlines; still readable)
+VERSION = 2
+# status codes 1 and 2 are fixed; any other status string gets the next free code
+BASE_STATUSES = ['', 'Present', 'Absent']
+PRESENT = 1
+PERIODS = ('month', 'week')
+
+
+def parse_day(value):
+    """date, or 'YYYY-MM-DD' -> proleptic ordinal; None when it isn't a valid date."""
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def period_keys(ordinal):
+    """('YYYY-MM', 'YYYY-Www') for a date ordinal; weeks are ISO weeks."""
+    day = date.fromordinal(ordinal)
+    year, week, _ = day.isocalendar()
+    return f"{day.year:04d}-{day.month:02d}", f"{year:04d}-W{week:02d}"
+
+
+class DayView(MutableMapping):
+    """student_id -> status mapping for one date, backed by a row of the store."""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, student_id):
+        col = self._store._student_index.get(student_id)
+        if col is None:
+            raise KeyError(student_id)
+        data = self._store._rows[self._row]
+        code = data[col] if col < len(data) else 0
+        if not code:
+            raise KeyError(student_id)
+        return self._store._statuses[code]
+
+    def __setitem__(self, student_id, status):
+        self._store.set(self._store.dates[self._row], student_id, status)
+
+    def __delitem__(self, student_id):
+        if not self._store.clear(self._store.dates[self._row], student_id):
+            raise KeyError(student_id)
+
+    def __iter__(self):
+        students = self._store.students
+        for col, code in enumerate(self._store._rows[self._row]):
+            if code:
+                yield students[col]
+
+    def __len__(self):
+        data = self._store._rows[self._row]
+        return len(data) - data.count(0)
+
+    def __contains__(self, student_id):
+        col = self._store._student_index.get(student_id)
+        if col is None:
+            return False
+        data = self._store._rows[self._row]
+        return col < len(data) and data[col] != 0
+
+    def items(self):
+        students = self._store.students
+        statuses = self._store._statuses
+        return [(students[col], statuses[code])
+                for col, code in enumerate(self._store._rows[self._row]) if code]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class AttendanceStore:
+    """
+    date -> {student_id: status}, stored as a byte matrix with per-student
+    present/recorded counters maintained on every write.
+    """
+
+    def __init__(self):
+        self.dates = []
+        self._date_index = {}
+        self.students = []
+        self._student_index = {}
+        self._rows = []
+        self._statuses = list(BASE_STATUSES)
+        self._status_codes = {s: i for i, s in enumerate(self._statuses) if s}
+        self._present = array('L')
+        self._total = array('L')
+        # per-date counters, parallel to _rows
+        self._day_present = array('L')
+        self._day_total = array('L')
+        # sorted (ordinal, row) for the dates that parse; dates that don't
+        # stay out of range queries and rollups
+        self._timeline = []
+        # row -> (month, week) keys, or None for unparseable dates
+        self._row_periods = []
+        # period -> {key: [present, recorded, dates]}
+        self._rollups = {period: {} for period in PERIODS}
+
+    @classmethod
+    def from_dict(cls, data):
+        store = cls()
+        for date, records in (data or {}).items():
+            if not isinstance(records, dict):
+                continue
+            store.add_date(date)
+            for sid, status in records.items():
+                store.set(date, sid, status)
+        return store
+
+    def to_dict(self):
+        return {date: dict(self[date].items()) for date in self.dates}
+
+    # ---- axes ----
+    def add_date(self, date_str):
+        row = self._date_index.get(date_str)
+        if row is None:
+            row = len(self.dates)
+            self.dates.append(date_str)
+            self._date_index[date_str] = row
+            self._rows.append(bytearray(len(self.students)))
+            self._day_present.append(0)
+            self._day_total.append(0)
+            self._index_date(row)
+        return row
+
+    def _index_date(self, row):
+        ordinal = parse_day(self.dates[row])
+        if ordinal is None:
+            self._row_periods.append(None)
+            return
+        insort(self._timeline, (ordinal, row))
+        keys = period_keys(ordinal)
+        self._row_periods.append(keys)
+        for period, key in zip(PERIODS, keys):
+            self._rollups[period].setdefault(key, [0, 0, 0])[2] += 1
+
+    def _count_day(self, row, present, total):
+        # apply a change of present/recorded cells on one date to its counters and rollups
+        self._day_present[row] += present
+        self._day_total[row] += total
+        keys = self._row_periods[row]
+        if keys is not None:
+            for period, key in zip(PERIODS, keys):
+                entry = self._rollups[period][key]
+                entry[0] += present
+                entry[1] += total
+
+    def _column(self, student_id):
+        col = self._student_index.get(student_id)
+        if col is None:
+            col = len(self.students)
+            self.students.append(student_id)
+            self._student_index[student_id] = col
+            self._present.append(0)
+            self._total.append(0)
+        return col
+
+    def _code(self, status):
+        code = self._status_codes.get(status)
+        if code is None:
+            if len(self._statuses) > 255:
+                raise ValueError("Too many distinct attendance statuses.")
+            code = len(self._statuses)
+            self._statuses.append(status)
+            self._status_codes[status] = code
+        return code
+
+    # ---- cell access ----
+    def set(self, date_str, student_id, status):
+        row = self._rows[self.add_date(date_str)]
+        col = self._column(student_id)
+        if col >= len(row):
+            row.extend(bytes(len(self.students) - len(row)))
+        old = row[col]
+        new = self._code(status)
+        present = total = 0
+        if not old:
+            self._total[col] += 1
+            total = 1
+        elif old == PRESENT:
+            self._present[col] -= 1
+            present = -1
+        if new == PRESENT:
+            self._present[col] += 1
+            present += 1
+        row[col] = new
+        if present or total:
+            self._count_day(self._date_index[date_str], present, total)
+
+    def set_many(self, cells):
+        """set() for an iterable of (date, student_id, status), with the lookups hoisted out of the loop."""
+        date_index = self._date_index
+        student_index = self._student_index
+        status_codes = self._status_codes
+        rows = self._rows
+        present = self._present
+        total = self._total
+        # rows written to; their day counters are recounted once at the end
+        touched = set()
+        last_row = None
+        for date_str, student_id, status in cells:
+            row_idx = date_index.get(date_str)
+            if row_idx is None:
+                row_idx = self.add_date(date_str)
+            col = student_index.get(student_id)
+            if col is None:
+                col = self._column(student_id)
+            if row_idx != last_row:
+                touched.add(row_idx)
+                last_row = row_idx
+            row = rows[row_idx]
+            if col >= len(row):
+                row.extend(bytes(len(self.students) - len(row)))
+            new = status_codes.get(status)
+            if new is None:
+                new = self._code(status)
+            old = row[col]
+            if not old:
+                total[col] += 1
+            elif old == PRESENT:
+                present[col] -= 1
+            if new == PRESENT:
+                present[col] += 1
+            row[col] = new
+        for row_idx in touched:
+            row = rows[row_idx]
+            self._count_day(row_idx, row.count(PRESENT) - self._day_present[row_idx],
+                            len(row) - row.count(0) - self._day_total[row_idx])
+
+    def clear(self, date_str, student_id):
+        row_idx = self._date_index.get(date_str)
+        col = self._student_index.get(student_id)
+        if row_idx is None or col is None:
+            return False
+        row = self._rows[row_idx]
+        if col >= len(row) or not row[col]:
+            return False
+        present = 0
+        if row[col] == PRESENT:
+            self._present[col] -= 1
+            present = -1
+        self._total[col] -= 1
+        row[col] = 0
+        self._count_day(row_idx, present, -1)
+        return True
+
+    def clear_student(self, student_id):
+        """Clear every cell of one student (e.g. after deleting them); returns the dates that changed."""
+        col = self._student_index.get(student_id)
+        if col is None:
+            return []
+        cleared = []
+        for row_idx, row in enumerate(self._rows):
+            if col < len(row) and row[col]:
+                self._count_day(row_idx, -1 if row[col] == PRESENT else 0, -1)
+                row[col] = 0
+                cleared.append(self.dates[row_idx])
+        self._present[col] = 0
+        self._total[col] = 0
+        return cleared
+
+    def student_history(self, student_id, start=None, end=None):
+        """
+        [(date, status)] for one student in date order, limited to [start, end]
+        when given. Without a range, dates that don't parse come last.
+        """
+        col = self._student_index.get(student_id)
+        if col is None:
+            return []
+        rows = self._rows_between(start, end)
+        if start is None and end is None and len(rows) < len(self._rows):
+            rows += [i for i, keys in enumerate(self._row_periods) if keys is None]
+        statuses = self._statuses
+        return [(self.dates[i], statuses[self._rows[i][col]])
+                for i in rows if col < len(self._rows[i]) and self._rows[i][col]]
+
+    # ---- date ranges ----
+    @staticmethod
+    def _bound(value):
+        ordinal = parse_day(value)
+        if ordinal is None:
+            raise ValueError(f"Invalid date {value!r}, use YYYY-MM-DD.")
+        return ordinal
+
+    def _rows_between(self, start=None, end=None):
+        # rows of the dates in [start, end] (None = open), in date order
+        timeline = self._timeline
+        lo = 0 if start is None else bisect_left(timeline, (self._bound(start),))
+        hi = len(timeline) if end is None else bisect_left(timeline, (self._bound(end) + 1,))
+        return [row for _, row in timeline[lo:hi]]
+
+    def dates_between(self, start=None, end=None):
+        """Recorded dates in [start, end] (dates or 'YYYY-MM-DD', inclusive), in date order."""
+        return [self.dates[row] for row in self._rows_between(start, end)]
+
+    def _cols(self, student_ids):
+        index = self._student_index
+        return [col for col in map(index.get, student_ids) if col is not None]
+
+    def counts_between(self, start=None, end=None, student_ids=None):
+        """
+        (present, recorded) over the dates in [start, end]: school-wide from the
+        per-date counters, or only for student_ids.
+        """
+        rows = self._rows_between(start, end)
+        if student_ids is None:
+            return sum(self._day_present[r] for r in rows), sum(self._day_total[r] for r in rows)
+        present = total = 0
+        for counts in self.student_counts_between(student_ids, start, end).values():
+            present += counts[0]
+            total += counts[1]
+        return present, total
+
+    def student_counts_between(self, student_ids, start=None, end=None):
+        """{student_id: (present, recorded)} over the dates in [start, end]."""
+        index = self._student_index
+        counts = {}
+        rows = [self._rows[r] for r in self._rows_between(start, end)]
+        for sid in student_ids:
+            col = index.get(sid)
+            present = total = 0
+            if col is not None:
+                for row in rows:
+                    if col < len(row) and row[col]:
+                        total += 1
+                        if row[col] == PRESENT:
+                            present += 1
+            counts[sid] = (present, total)
+        return counts
+
+    def rollup(self, period='month', start=None, end=None, student_ids=None):
+        """
+        [(key, present, recorded, dates)] per month ('YYYY-MM') or ISO week
+        ('YYYY-Www') over the dates in [start, end], oldest first. School-wide
+        totals without a range are the maintained rollups; with a range they
+        are summed from the per-date counters. Only student_ids queries read cells.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period {period!r}, use one of: {', '.join(PERIODS)}.")
+        if student_ids is None and start is None and end is None:
+            entries = self._rollups[period]
+            return [(key, *entries[key]) for key in sorted(entries)]
+        which = PERIODS.index(period)
+        cols = None if student_ids is None else self._cols(student_ids)
+        out = {}
+        for r in self._rows_between(start, end):
+            entry = out.setdefault(self._row_periods[r][which], [0, 0, 0])
+            entry[2] += 1
+            if cols is None:
+                entry[0] += self._day_present[r]
+                entry[1] += self._day_total[r]
+                continue
+            row = self._rows[r]
+            for col in cols:
+                if col < len(row) and row[col]:
+                    entry[1] += 1
+                    if row[col] == PRESENT:
+                        entry[0] += 1
+        return [(key, *out[key]) for key in sorted(out)]
+
+    # ---- counters ----
+    def counts(self, student_id):
+        """Return (present_days, recorded_days) for a student."""
+        col = self._student_index.get(student_id)
+        if col is None:
+            return 0, 0
+        return self._present[col], self._total[col]
+
+    def total_present(self):
+        return sum(self._present)
+
+    def total_recorded(self):
+        return sum(self._total)
+
+    def _count(self):
+        present = array('L', [0]) * len(self.students)
+        total = array('L', [0]) * len(self.students)
+        for row in self._rows:
+            for col, code in enumerate(row):
+                if code:
+                    total[col] += 1
+                    if code == PRESENT:
+                        present[col] += 1
+        return present, total
+
+    def rebuild_counters(self):
+        self._present, self._total = self._count()
+        self._rebuild_days()
+
+    def _rebuild_days(self):
+        # per-date counters, timeline and rollups from the matrix
+        rows = self._rows
+        self._day_present = array('L', [0]) * len(rows)
+        self._day_total = array('L', [0]) * len(rows)
+        self._timeline = []
+        self._row_periods = []
+        self._rollups = {period: {} for period in PERIODS}
+        for i, row in enumerate(rows):
+            self._index_date(i)
+            self._count_day(i, row.count(PRESENT), len(row) - row.count(0))
+
+    def check_counters(self, repair=True):
+        """
+        Recount from the matrix; returns True when the counters were consistent.
+        Covers the per-student counters, the per-date counters and the
+        month/week rollups.
+        """
+        present, total = self._count()
+        consistent = present == self._present and total == self._total
+        if not consistent and repair:
+            self._present, self._total = present, total
+        kept = (self._day_present, self._day_total, self._timeline, self._row_periods, self._rollups)
+        self._rebuild_days()
+        if (kept[0] != self._day_present or kept[1] != self._day_total
+                or kept[4] != self._rollups):
+            consistent = False
+        if not consistent and not repair:
+            # report only: put the counters back as they were found
+            (self._day_present, self._day_total, self._timeline,
+             self._row_periods, self._rollups) = kept
+        return consistent
+
+    # ---- dict-like interface (date -> DayView) ----
+    def __getitem__(self, date_str):
+        row = self._date_index.get(date_str)
+        if row is None:
+            raise KeyError(date_str)
+        return DayView(self, row)
+
+    def __setitem__(self, date_str, records):
+        row = self.add_date(date_str)
+        for sid in list(DayView(self, row)):
+            self.clear(date_str, sid)
+        for sid, status in dict(records).items():
+            self.set(date_str, sid, status)
+
+    def __contains__(self, date_str):
+        return date_str in self._date_index
+
+    def __iter__(self):
+        return iter(self.dates)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def get(self, date_str, default=None):
+        row = self._date_index.get(date_str)
+        return default if row is None else DayView(self, row)
+
+    def setdefault(self, date_str, default=None):
+        row = self.add_date(date_str)
+        if default:
+            for sid, status in dict(default).items():
+                self.set(date_str, sid, status)
+        return DayView(self, row)
+
+    def keys(self):
+        return list(self.dates)
+
+    def values(self):
+        return [DayView(self, i) for i in range(len(self.dates))]
+
+    def items(self):
+        return [(date, DayView(self, i)) for i, date in enumerate(self.dates)]
+
+    # ---- binary format ----
+    # MAGIC, version byte, then <III: dates, students, statuses; three
+    # length-prefixed utf-8 '\n'-joined name blocks; the counters as uint32
+    # arrays; and finally one row of len(students) bytes per date.
+    def save(self, filename):
+        def block(names):
+            # each name length-prefixed, so any character (newlines included) round trips
+            out = [struct.pack('<I', len(names))]
+            for name in names:
+                raw = name.encode('utf-8')
+                out.append(struct.pack('<I', len(raw)))
+                out.append(raw)
+            return b''.join(out)
+
+        width = len(self.students)
+        # written aside and swapped in, so a crash never leaves a truncated file
+        tmp = filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(MAGIC + bytes([VERSION]))
+            f.write(struct.pack('<III', len(self.dates), width, len(self._statuses)))
+            f.write(block(self.dates))
+            f.write(block(self.students))
+            f.write(block(self._statuses))
+            f.write(array('I', self._present).tobytes())
+            f.write(array('I', self._total).tobytes())
+            for row in self._rows:
+                f.write(row)
+                if len(row) < width:
+                    f.write(bytes(width - len(row)))
+        os.replace(tmp, filename)
+
+    @classmethod
+    def load(cls, filename):
+        """Read a file written by save(); ValueError when it is damaged or its sizes don't add up."""
+        with open(filename, 'rb') as f:
+            buf = f.read()
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filename} is not an attendance store file")
+        version = buf[len(MAGIC)] if len(buf) > len(MAGIC) else None
+        if version not in (1, VERSION):
+            raise ValueError(f"Unsupported attendance store version {version}")
+        pos = len(MAGIC) + 1
+
+        def unpack(fmt):
+            nonlocal pos
+            try:
+                values = struct.unpack_from(fmt, buf, pos)
+            except struct.error:
+                raise ValueError(f"{filename} is truncated") from None
+            pos += struct.calcsize(fmt)
+            return values
+
+        def take(size):
+            nonlocal pos
+            if pos + size > len(buf):
+                raise ValueError(f"{filename} is truncated")
+            pos += size
+            return buf[pos - size:pos]
+
+        def block(expected):
+            if version == 1:
+                # version 1 joined the names with newlines
+                (size,) = unpack('<I')
+                raw = take(size).decode('utf-8')
+                names = raw.split('\n') if raw else []
+            else:
+                (count,) = unpack('<I')
+                names = []
+                for _ in range(count):
+                    (size,) = unpack('<I')
+                    names.append(take(size).decode('utf-8'))
+            if len(names) != expected:
+                raise ValueError(f"{filename} lists {len(names)} names where {expected} were expected")
+            return names
+
+        n_dates, width, n_statuses = unpack('<III')
+        store = cls()
+        store.dates = block(n_dates)
+        store.students = block(width)
+        store._statuses = block(n_statuses)
+        store._status_codes = {s: i for i, s in enumerate(store._statuses) if s}
+        store._date_index = {d: i for i, d in enumerate(store.dates)}
+        store._student_index = {s: i for i, s in enumerate(store.students)}
+
+        counters = array('I')
+        counters.frombytes(take(8 * width))
+        store._present = array('L', counters[:width])
+        store._total = array('L', counters[width:])
+
+        if len(buf) - pos != n_dates * width:
+            raise ValueError(f"{filename} holds {len(buf) - pos} attendance cells, expected {n_dates * width}")
+        if max(buf[pos:], default=0) >= len(store._statuses):
+            raise ValueError(f"{filename} has an unknown status code")
+        view = memoryview(buf)
+        store._rows = [bytearray(view[pos + i * width:pos + (i + 1) * width]) for i in range(n_dates)]
+        store._rebuild_days()
+        return store
@@ -0,0 +1,97 @@
+# autosave.py
+# Debounced background saving. Changes only nudge a worker thread; it writes
+# once things have been quiet for a moment (or enough changes piled up), so
+# menus never wait on disk I/O. The worker and the menus share manager.lock,
+# which keeps a save from running halfway through an edit.
+
+import atexit
+import threading
+import time
+
+
+class AutoSaver:
+    """
+    Worker thread that flushes a SchoolManager after quiet_period seconds
+    without changes, or as soon as max_changes changes are waiting.
+    stop() flushes whatever is left; it is also registered with atexit.
+    With backup=True the data file is backed up once, right before the
+    session's first write, so the backup holds the file as it was at startup.
+    """
+
+    def __init__(self, manager, quiet_period=2.0, max_changes=50, backup=False):
+        self.manager = manager
+        self.quiet_period = quiet_period
+        self.max_changes = max_changes
+        self.backup = backup
+        self._backed_up = False
+        self._cond = threading.Condition()
+        self._changes = 0
+        self._last_change = 0.0
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+            self._thread.start()
+            self.manager.autosaver = self
+            atexit.register(self.stop)
+        return self
+
+    def notify(self):
+        """Note one change; the manager itself tracks which records are dirty."""
+        with self._cond:
+            self._changes += 1
+            self._last_change = time.monotonic()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    if not self._changes:
+                        self._cond.wait()
+                        continue
+                    if self._changes >= self.max_changes:
+                        break
+                    remaining = self._last_change + self.quiet_period - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def flush(self):
+        """Write pending changes now (from any thread)."""
+        with self._cond:
+            self._changes = 0
+        manager = self.manager
+        with manager.lock:
+            if self.backup and not self._backed_up and manager.data_changed:
+                try:
+                    manager.backup_data()
+                except Exception:
+                    pass
+                self._backed_up = True
+            # both saves return straight away when their side has nothing pending
+            manager.save_attendance(verbose=False)
+            manager.save_data(verbose=False)
+
+    def stop(self, timeout=10.0):
+        """Stop the worker and flush; safe to call more than once."""
+        thread = self._thread
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+        if self.manager.autosaver is self:
+            self.manager.autosaver = None
@@ -0,0 +1,426 @@
+# benchmark.py
+# Synthetic large-school benchmark for SchoolManager.
+# Generates a deterministic school (students, teachers, exams with results,
+# multi-year attendance, fee transactions), then times loading, saving, every
+# report, search, CSV import/export and dashboard alerts without any prompts.
+#
+#   python benchmark.py                          # 1k, 10k, 100k and 1M students
+#   python benchmark.py --sizes 1000,10000 --out results.json
+#   python benchmark.py --memory                 # compact vs dict-based entity classes
+#
+# init_* rows load school_data.json; init_snapshot_* load the same data from a
+# binary snapshot (snapshot.py).
+
+import argparse
+import builtins
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime, timedelta
+from hashlib import sha256
+
+from colorama import Fore, init
+from tabulate import tabulate
+
+import snapshot
+from classes import SchoolManager, Student, Teacher
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SUBJECTS = ['Math', 'Science', 'English', 'Nepali', 'Social', 'Computer']
+FIRST_NAMES = ['Aarav', 'Sita', 'Ram', 'Gita', 'Hari', 'Maya', 'Bikash', 'Anita', 'Suman', 'Rita', 'Kiran', 'Puja']
+LAST_NAMES = ['Sharma', 'Thapa', 'Gurung', 'Rai', 'Karki', 'Shrestha', 'Magar', 'Tamang', 'Adhikari', 'Bhattarai']
+CLASS_SIZE = 40
+
+
+def _class_names(n_students):
+    """12 grades with as many sections per grade as needed for ~CLASS_SIZE students per class."""
+    sections = max(1, -(-n_students // (12 * CLASS_SIZE)))
+    names = []
+    for grade in range(1, 13):
+        for s in range(sections):
+            # A..Z, then AA, AB, ...
+            label = ''
+            s += 1
+            while s:
+                s, r = divmod(s - 1, 26)
+                label = chr(65 + r) + label
+            names.append(f"{grade}-{label}")
+    return names
+
+
+def _school_days(years=2, start=date(2023, 1, 2)):
+    days = []
+    d = start
+    end = start + timedelta(days=365 * years)
+    while d < end:
+        if d.weekday() < 5:
+            days.append(d.isoformat())
+        d += timedelta(days=1)
+    return days
+
+
+def generate_school(n_students, seed=42, days=40, attendance_cells=5_000_000, exams_per_class=2):
+    """
+    Return (school_data, attendance) dicts in the on-disk JSON shapes.
+    The number of attendance dates is capped so that students * dates stays
+    within attendance_cells.
+    """
+    rng = random.Random(seed)
+    student_pw = sha256('4321'.encode()).hexdigest()
+    teacher_pw = sha256('1234'.encode()).hexdigest()
+    classes = _class_names(n_students)
+    fee_structure = {cls: float(5000 + 500 * int(cls.split('-')[0])) for cls in classes}
+
+    students = []
+    fee_transactions = []
+    for i in range(1, n_students + 1):
+        sid = f"STU{i:03d}"
+        cls = classes[(i - 1) // CLASS_SIZE % len(classes)]
+        fee = fee_structure[cls]
+        paid = rng.choice((0.0, fee / 2, fee, fee))
+        students.append({
+            'student_id': sid,
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            'contact': {'Phone': f"98{rng.randrange(10**8):08d}", 'Email': f"student{i}@school.edu"},
+            'marks': {sub: float(rng.randint(20, 100)) for sub in rng.sample(SUBJECTS, 4)},
+            'paid_amount': paid,
+            'fee_status': 'Paid' if paid >= fee else 'Pending',
+            'class_section': cls,
+            'password': student_pw,
+        })
+        if paid:
+            fee_transactions.append({'student_id': sid, 'amount': paid, 'date': '2024-04-15',
+                                     'method': rng.choice(('Cash', 'Bank', 'Online'))})
+
+    teachers = []
+    for i in range(1, max(1, n_students // 25) + 1):
+        teachers.append({
+            'teacher_id': f"TCH{i:03d}",
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} T{i}",
+            'contact': {'Phone': f"97{rng.randrange(10**8):08d}", 'Email': f"teacher{i}@school.edu"},
+            'subjects': rng.sample(SUBJECTS, 2),
+            'role-description': 'Teacher',
+            'password': teacher_pw,
+        })
+
+    roster = {}
+    for stu in students:
+        roster.setdefault(stu['class_section'], []).append(stu['student_id'])
+    exams = []
+    for cls in classes:
+        members = roster.get(cls)
+        if not members:
+            continue
+        for term in range(1, exams_per_class + 1):
+            exams.append({
+                'exam_id': f"EX{len(exams) + 1:03d}",
+                'exam_name': f"Term {term}",
+                'class': cls,
+                'subject': SUBJECTS[(term - 1) % len(SUBJECTS)],
+                'date': f"2024-0{term % 9 + 1}-10",
+                'max_marks': 100.0,
+                'allow_bonus': False,
+                'results': {sid: {'marks': float(rng.randint(20, 100)), 'bonus': 0.0} for sid in members},
+            })
+
+    all_days = _school_days()
+    n_days = max(1, min(days, attendance_cells // max(1, n_students), len(all_days)))
+    step = len(all_days) / n_days
+    attendance = {}
+    for k in range(n_days):
+        day = all_days[int(k * step)]
+        attendance[day] = {s['student_id']: ('Present' if rng.random() < 0.9 else 'Absent') for s in students}
+
+    data = {
+        'students': students,
+        'teachers': teachers,
+        'admins': [],
+        'exams': exams,
+        'fee_structure': fee_structure,
+        'fee_transactions': fee_transactions,
+        'last_student_id': n_students,
+        'last_teacher_id': len(teachers),
+        'last_admin_id': 1,
+        'last_exam_id': len(exams),
+    }
+    return data, attendance
+
+
+class LegacyPerson:
+    """The pre-__slots__ entity layout: instance __dict__, dict contact/marks, hex password str."""
+
+    def __init__(self, name, contact_info, role):
+        self.name = name
+        self.role = role
+        self.contact_info = contact_info if contact_info is not None else {'Phone': '', 'Email': ''}
+
+
+class LegacyStudent(LegacyPerson):
+    def __init__(self, name, contact_info, student_id):
+        super().__init__(name, contact_info, 'Student')
+        self.__student_id = student_id
+        self.marks = {}
+        self.fee_status = 'Pending'
+        self.paid_amount = 0.0
+        self.class_section = 'N/A'
+        self.password = sha256('4321'.encode()).hexdigest()
+
+
+class LegacyTeacher(LegacyPerson):
+    def __init__(self, name, contact_info, teacher_id, subject_assigned=None):
+        super().__init__(name, contact_info, 'Teacher')
+        self.__teachers_id = teacher_id
+        self.subject_assigned = subject_assigned or []
+        self.role_description = 'Teacher'
+        self.password = sha256('1234'.encode()).hexdigest()
+
+
+def _build_entities(data, student_cls, teacher_cls):
+    # mirrors SchoolManager._build_student/_build_teacher, copying each field out of the raw record
+    students = []
+    for s in data['students']:
+        stu = student_cls(s['name'], dict(s['contact']), s['student_id'])
+        stu.marks = dict(s['marks'])
+        stu.paid_amount = float(s['paid_amount'])
+        stu.fee_status = ''.join(s['fee_status'])
+        stu.class_section = ''.join(s['class_section'])
+        stu.password = ''.join(s['password'])
+        students.append(stu)
+    teachers = []
+    for t in data['teachers']:
+        teacher = teacher_cls(t['name'], dict(t['contact']), t['teacher_id'], list(t['subjects']))
+        teacher.role_description = ''.join(t['role-description'])
+        teacher.password = ''.join(t['password'])
+        teachers.append(teacher)
+    return students, teachers
+
+
+def measure_memory(n_students, seed=42):
+    """Bytes allocated for n_students students (and their teachers) with each class layout."""
+    data, _ = generate_school(n_students, seed, days=1, attendance_cells=1, exams_per_class=0)
+    result = {'students': n_students, 'teachers': len(data['teachers'])}
+    for label, student_cls, teacher_cls in (('legacy', LegacyStudent, LegacyTeacher),
+                                            ('compact', Student, Teacher)):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        entities = _build_entities(data, student_cls, teacher_cls)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del entities
+        result[f'{label}_bytes'] = used
+        result[f'{label}_bytes_per_student'] = used / max(1, n_students)
+    result['saving'] = 1 - result['compact_bytes'] / max(1, result['legacy_bytes'])
+    return result
+
+
+def _no_input(prompt=''):
+    raise RuntimeError(f"benchmark reached an interactive prompt: {prompt!r}")
+
+
+@contextmanager
+def _quiet():
+    # reports print large tables; keep them off the terminal while timing
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
+
+
+def run_size(n_students, workdir, seed=42, days=40, attendance_cells=5_000_000, exams_per_class=2, workers=1):
+    timings = {}
+
+    def timed(name, fn):
+        with _quiet():
+            start = time.perf_counter()
+            result = fn()
+            timings[name] = time.perf_counter() - start
+        return result
+
+    start = time.perf_counter()
+    data, attendance = generate_school(n_students, seed, days, attendance_cells, exams_per_class)
+    data_file = os.path.join(workdir, 'school_data.json')
+    attendance_file = os.path.join(workdir, 'attendance.json')
+    with open(data_file, 'w') as f:
+        json.dump(data, f)
+    with open(attendance_file, 'w') as f:
+        json.dump(attendance, f)
+    generate_seconds = time.perf_counter() - start
+    info = {
+        'students': n_students,
+        'teachers': len(data['teachers']),
+        'exams': len(data['exams']),
+        'fee_transactions': len(data['fee_transactions']),
+        'attendance_days': len(attendance),
+        'generate_seconds': generate_seconds,
+    }
+    first_date = next(iter(attendance))
+    sample = data['students'][n_students // 2]
+    del data, attendance
+
+    # ---- load / save ----
+    timed('init_lazy', lambda: SchoolManager(data_file, attendance_file=attendance_file, lazy=True))
+    manager = timed('init', lambda: SchoolManager(data_file, attendance_file=attendance_file))
+    timed('load_data', manager.load_data)
+    timed('load_attendance', manager.load_attendance)
+
+    # saves skip clean data, so flag everything as changed to time a full write
+    def full_save():
+        manager.data_changed = True
+        manager.save_data()
+
+    def full_attendance_save():
+        manager.attendance_changed = True
+        manager.save_attendance()
+    timed('save_data', full_save)
+    timed('save_attendance', full_attendance_save)
+
+    # ---- binary snapshot of the same data ----
+    snapshot_file = os.path.join(workdir, 'school_data.bin')
+    timed('save_snapshot', lambda: snapshot.dump(manager, snapshot_file))
+    timed('init_snapshot_lazy', lambda: SchoolManager(snapshot_file, attendance_file=attendance_file, lazy=True))
+    timed('init_snapshot', lambda: SchoolManager(snapshot_file, attendance_file=attendance_file))
+    info['json_bytes'] = os.path.getsize(data_file)
+    info['snapshot_bytes'] = os.path.getsize(snapshot_file)
+
+    # ---- reports ----
+    timed('list_students', manager.list_students)
+    timed('list_teachers', manager.list_teachers)
+    timed('list_exams', manager.list_exams)
+    timed('exam_statistics_report', manager.exam_statistics_report)
+    timed('student_report', manager.student_report)
+    timed('report_by_class', lambda: manager.report_by_class(sample['class_section']))
+    timed('report_by_fee', manager.report_by_fee)
+    timed('report_top_students', manager.report_top_students)
+    timed('school_attendance_percentage', manager.school_attendance_percentage)
+    timed('low_attendance_report', manager.low_attendance_report)
+    timed('view_attendance_by_date', lambda: manager.view_attendance(date_str=first_date))
+    timed('view_attendance_by_student', lambda: manager.view_attendance(student_id=sample['student_id']))
+    timed('attendance_summary_report', manager.attendance_summary_report)
+    timed('attendance_summary_by_class',
+          lambda: manager.attendance_summary_report('week', class_section=sample['class_section']))
+    timed('student_exam_report', lambda: manager.student_exam_report(sample['student_id']))
+    timed('quick_dashboard_stats', manager.quick_dashboard_stats)
+    timed('dashboard_alerts', manager.show_dashboard_alerts)
+
+    # ---- search ----
+    timed('search_students_first', lambda: manager.search_students(keywords=sample['name']))
+    timed('search_students', lambda: manager.search_students(keywords=sample['student_id']))
+    timed('search_teachers', lambda: manager.search_teachers(keywords='math'))
+
+    # ---- CSV export, then import into an empty school ----
+    csv_path = lambda name: os.path.join(workdir, name)
+    timed('export_students_csv', lambda: manager.export_students_csv(csv_path('students.csv')))
+    timed('export_teachers_csv', lambda: manager.export_teachers_csv(csv_path('teachers.csv')))
+    timed('export_attendance_csv', lambda: manager.export_attendance_csv(csv_path('attendance.csv')))
+    timed('export_exams_csv', lambda: manager.export_exams_csv(csv_path('exams.csv')))
+    timed('export_fee_transactions_csv', lambda: manager.export_fee_transactions_csv(csv_path('fees.csv')))
+    fee_structure = dict(manager.fee_structure)
+    del manager
+
+    target = timed('init_empty', lambda: SchoolManager(csv_path('import_data.json'),
+                                                       attendance_file=csv_path('import_attendance.json')))
+    # the school's classes exist before students are imported into them
+    target.fee_structure = fee_structure
+    timed('import_students_csv', lambda: target.import_students_csv(csv_path('students.csv')))
+    timed('import_teachers_csv', lambda: target.import_teachers_csv(csv_path('teachers.csv')))
+    timed('import_attendance_csv', lambda: target.import_attendance_csv(csv_path('attendance.csv')))
+    timed('import_exams_csv', lambda: target.import_exams_csv(csv_path('exams.csv')))
+    timed('import_fee_transactions_csv', lambda: target.import_fee_transactions_csv(csv_path('fees.csv')))
+
+    # the same two files parsed by worker processes, into a second empty school
+    if workers > 1:
+        parallel = timed('init_empty_parallel', lambda: SchoolManager(
+            csv_path('parallel_data.json'), attendance_file=csv_path('parallel_attendance.json')))
+        timed('import_attendance_csv_parallel',
+              lambda: parallel.import_attendance_csv(csv_path('attendance.csv'), workers=workers))
+        timed('import_fee_transactions_csv_parallel',
+              lambda: parallel.import_fee_transactions_csv(csv_path('fees.csv'), workers=workers))
+        info['parallel_workers'] = workers
+        info['parallel_matches'] = (parallel.attendance.to_dict() == target.attendance.to_dict()
+                                    and parallel.fee_transactions == target.fee_transactions)
+
+    info['timings'] = timings
+    return info
+
+
+def main(argv=None):
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Benchmark SchoolManager on synthetic schools.")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated student counts (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--days', type=int, default=40, help="attendance dates to generate (spread over two years)")
+    parser.add_argument('--attendance-cells', type=int, default=5_000_000,
+                        help="cap on students x attendance dates, so large schools get fewer dates")
+    parser.add_argument('--exams-per-class', type=int, default=2)
+    parser.add_argument('--out', default='benchmark_results.json', help="where to write the JSON results")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="processes for the parallel import rows; 1 skips them (default: %(default)s)")
+    parser.add_argument('--workdir', default=None, help="keep generated files here instead of a temp dir")
+    parser.add_argument('--memory', action='store_true',
+                        help="compare entity memory use (compact vs legacy classes) instead of timing operations")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(s.replace('_', '')) for s in args.sizes.split(',') if s.strip()]
+    except ValueError:
+        print(Fore.RED + f"❌ Invalid --sizes value: {args.sizes}")
+        return 2
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'runs': [],
+    }
+    if args.memory:
+        results['memory'] = []
+        for n in sizes:
+            print(Fore.CYAN + f"🧮 Measuring entity memory for {n:,} students...")
+            results['memory'].append(measure_memory(n, args.seed))
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+        table = [[f"{m['students']:,}", f"{m['legacy_bytes'] / 2**20:.1f}", f"{m['compact_bytes'] / 2**20:.1f}",
+                  f"{m['legacy_bytes_per_student']:.0f}", f"{m['compact_bytes_per_student']:.0f}",
+                  f"{m['saving'] * 100:.0f}%"] for m in results['memory']]
+        print(tabulate(table, headers=['Students', 'Legacy MiB', 'Compact MiB', 'Legacy B/stu', 'Compact B/stu', 'Saved'],
+                       tablefmt='fancy_grid', stralign='center'))
+        print(Fore.GREEN + f"✅ Results written to {args.out}")
+        return 0
+
+    real_input = builtins.input
+    builtins.input = _no_input
+    try:
+        for n in sizes:
+            print(Fore.CYAN + f"⏱️ Benchmarking {n:,} students...")
+            if args.workdir:
+                workdir = os.path.join(args.workdir, str(n))
+                os.makedirs(workdir, exist_ok=True)
+                run = run_size(n, workdir, args.seed, args.days, args.attendance_cells, args.exams_per_class,
+                               args.workers)
+            else:
+                with tempfile.TemporaryDirectory(prefix='sms-bench-') as workdir:
+                    run = run_size(n, workdir, args.seed, args.days, args.attendance_cells, args.exams_per_class,
+                               args.workers)
+            results['runs'].append(run)
+            # write after every size so a long run still leaves partial results behind
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+    finally:
+        builtins.input = real_input
+
+    names = list(results['runs'][0]['timings']) if results['runs'] else []
+    table = [[name] + [f"{run['timings'][name] * 1000:.1f}" for run in results['runs']] for name in names]
+    headers = ['Operation (ms)'] + [f"{run['students']:,}" for run in results['runs']]
+    print(tabulate(table, headers=headers, tablefmt='fancy_grid', stralign='center'))
+    print(Fore.GREEN + f"✅ Results written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
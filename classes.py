@@ -10,7 +10,12 @@
 
 import json
 import os
-from datetime import datetime
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from itertools import repeat
+from datetime import datetime, timedelta
 from hashlib import sha256
 import re
 import csv
@@ -19,7 +24,45 @@ init(autoreset=True)
 
 from tabulate import tabulate
 
+from alerts import AlertView
+from analytics import BANDS, GRADE_LABELS, GradeBook, exam_statistics, grade_for
+from attendance import AttendanceStore
+from compact import ContactView, MarksView, digest_to_hex, hex_to_digest, intern_str, pack_marks
+from importer import ImportStats, invalid_values, parallel_records, parse_floats, read_chunks
+from leaderboard import Leaderboard, StudentBoards
+from pager import PAGE_SIZE, Column, Pager
+import snapshot
+from search import NGramIndex
+from sections import SectionIndex, class_key
+from storage import Journal
+
 TABLE_FMT = 'fancy_grid'
+LOW_ATTENDANCE_ALERT = 75
+
+@contextmanager
+def open_output(target):
+    """Writable text file for a path, an already open file object, or '-' (stdout)."""
+    if target == '-':
+        yield sys.stdout
+    elif hasattr(target, 'write'):
+        yield target
+    else:
+        with open(target, 'w', newline='') as f:
+            yield f
+
+@contextmanager
+def open_input(target):
+    """Readable text file for a path, an already open file object, or '-' (stdin)."""
+    if target == '-':
+        yield sys.stdin
+    elif hasattr(target, 'read'):
+        yield target
+    else:
+        with open(target, 'r', newline='') as f:
+            yield f
+
+def target_name(target):
+    return getattr(target, 'name', target)
 
 def print_section(title, color=Fore.CYAN):
     line = "-" * 60
@@ -41,7 +84,59 @@ def is_valid_class_section(cls: str) -> bool:
     pattern = r'^([0-9]{1,2}(-[A-Za-z])?|[A-Za-z]+)$'
     return bool(re.match(pattern, cls.strip()))
 
+def is_valid_date(date_str):
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+# ---- CSV row parsers; module-level so parallel imports can send them to worker processes ----
+def attendance_records(chunk, stats):
+    """(date, student_id, status) for the valid rows of an attendance CSV chunk."""
+    dates = chunk.column('Date')
+    statuses = chunk.column('Status')
+    bad_dates = invalid_values(dates, is_valid_date)
+    # normalize status
+    status_norm = {s: 'Present' if s.lower().startswith('p') else 'Absent' for s in set(statuses)}
+    records = []
+    for date, student_id, status in zip(dates, chunk.column('Student ID'), statuses):
+        if not date or not student_id or not status:
+            stats.skip('incomplete')
+            continue
+        if date in bad_dates:
+            stats.skip('invalid date')
+            continue
+        records.append((date, student_id, status_norm[status]))
+    return records
+
+def fee_transaction_records(chunk, stats):
+    """Transaction dicts for the valid rows of a fee transactions CSV chunk."""
+    records = []
+    for student_id, amount, date, method in zip(
+            chunk.column('Student ID'), parse_floats(chunk.column('Amount')),
+            chunk.column('Date', 'N/A'), chunk.column('Method', 'N/A')):
+        if amount is None:
+            # imported as 0, as the row-by-row import did
+            stats.warn('invalid amount, imported as 0')
+            amount = 0.0
+        records.append({
+            'student_id': student_id,
+            'amount': amount,
+            'date': date,
+            'method': method
+        })
+    return records
+
+# every record starts with one of these, so they are shared rather than stored per person
+DEFAULT_STUDENT_DIGEST = sha256('4321'.encode()).digest()
+DEFAULT_TEACHER_DIGEST = sha256('1234'.encode()).digest()
+SHARED_DIGESTS = {d: d for d in (DEFAULT_STUDENT_DIGEST, DEFAULT_TEACHER_DIGEST)}
+
 class Person:
+    # no per-instance __dict__: contact details live in slots behind a mapping view
+    __slots__ = ('name', 'role', '_phone', '_email', '_contact_extra', '_password')
+
     def __init__(self, name, contact_info, role='Person'):
         self.name = name
         self.role = role
@@ -49,6 +144,28 @@ class Person:
             self.contact_info = {'Phone': '', 'Email': ''}
         else:
             self.contact_info = contact_info
+
+    @property
+    def contact_info(self):
+        return ContactView(self)
+
+    @contact_info.setter
+    def contact_info(self, value):
+        items = list(value.items())
+        self._phone = self._email = self._contact_extra = None
+        view = ContactView(self)
+        for key, val in items:
+            view[key] = val
+
+    @property
+    def password(self):
+        # sha256 hex digest, kept as 32 raw bytes
+        return digest_to_hex(self._password)
+
+    @password.setter
+    def password(self, value):
+        digest = hex_to_digest(value)
+        self._password = SHARED_DIGESTS.get(digest, digest)
     
     def update_contact(self, new_contact):
         if isinstance(new_contact, dict):
@@ -63,11 +180,14 @@ class Person:
     def to_dict(self):
         return {
             "name": self.name,
-            "contact": self.contact_info,
+            "contact": dict(self.contact_info),
             "role": self.role
         }
 
 class Student(Person):
+    __slots__ = ('__student_id', '_mark_subjects', '_mark_values', '_mark_extra', '_fee_status', 'paid_amount',
+                 '_class_section')
+
     def __init__(self, name , contact_info, student_id):
         super().__init__( name, contact_info, role='Student')
         self.__student_id = student_id
@@ -76,7 +196,32 @@ class Student(Person):
         self.paid_amount = 0.0
         self.class_section = "N/A"
         # ensure non-empty hashed password; default '4321'
-        self.password = sha256('4321'.encode()).hexdigest()
+        self._password = DEFAULT_STUDENT_DIGEST
+
+    @property
+    def marks(self):
+        return MarksView(self)
+
+    @marks.setter
+    def marks(self, value):
+        # subject names are shared between students, only the values are per student
+        self._mark_subjects, self._mark_values, self._mark_extra = pack_marks(value)
+
+    @property
+    def fee_status(self):
+        return self._fee_status
+
+    @fee_status.setter
+    def fee_status(self, value):
+        self._fee_status = intern_str(value)
+
+    @property
+    def class_section(self):
+        return self._class_section
+
+    @class_section.setter
+    def class_section(self, value):
+        self._class_section = intern_str(value)
 
     def add_update_marks(self, subject ,  mark):
         if not isinstance(mark, (int,float)):
@@ -85,22 +230,10 @@ class Student(Person):
         print(f"Marks updated for {self.name} - {subject}: {mark}")
     
     def calculate_grade(self):
-        if not self.marks:
+        # one student; reports over many students read SchoolManager.gradebook() instead
+        if not self._mark_values:
             return None
-        avg = sum(self.marks.values()) / len(self.marks)
-        
-        if avg >= 90:
-            return "A+"
-        elif avg >= 80:
-            return "A"
-        elif avg >= 70:
-            return "B+"
-        elif avg >= 60:
-            return "B"
-        elif avg >= 50:
-            return "C"
-        else:
-            return "F"
+        return grade_for(sum(self._mark_values) / len(self._mark_values))
     
     def pay_fee(self):
         self.fee_status = "Paid"
@@ -110,7 +243,7 @@ class Student(Person):
         base = super().to_dict()
         base.update({
             "student_id": self.__student_id,
-            "marks": self.marks,
+            "marks": dict(self.marks.items()),
             "fee_status": self.fee_status,
             'paid_amount': self.paid_amount,
             "class_section": self.class_section,
@@ -145,23 +278,35 @@ class Student(Person):
             print(Fore.RED + "❌ Passwords do not match.")
             return
 
-        self.password = sha256(new_pass.encode()).hexdigest()
-        print(Fore.GREEN + "✅ Password Updated Successfully!")
-
         if manager:
-            manager.data_changed = True
-            manager.save_data()
+            with manager.lock:
+                self.password = sha256(new_pass.encode()).hexdigest()
+                manager.mark_changed('student', self.get_student_id())
+                manager.request_save()
+        else:
+            self.password = sha256(new_pass.encode()).hexdigest()
+        print(Fore.GREEN + "✅ Password Updated Successfully!")
 
         
 class Teacher(Person):
+    __slots__ = ('__teachers_id', 'subject_assigned', '_role_description')
+
     def __init__(self, name , contact_info, teachers_id, subject_assigned = None):
         super().__init__( name, contact_info, role='Teacher')
         self.__teachers_id = teachers_id
         if subject_assigned is None:
             subject_assigned = []
-        self.subject_assigned = subject_assigned
+        self.subject_assigned = [intern_str(s) for s in subject_assigned]
         self.role_description = "Teacher"
-        self.password = sha256('1234'.encode()).hexdigest()
+        self._password = DEFAULT_TEACHER_DIGEST
+
+    @property
+    def role_description(self):
+        return self._role_description
+
+    @role_description.setter
+    def role_description(self, value):
+        self._role_description = intern_str(value)
         
     def get_teacher_id(self):
         return self.__teachers_id
@@ -171,7 +316,7 @@ class Teacher(Person):
     
     def add_subject(self, subject_name):
         if subject_name not in self.subject_assigned:
-            self.subject_assigned.append(subject_name)
+            self.subject_assigned.append(intern_str(subject_name))
             
     def remove_subject(self,subject_name):
         if subject_name in self.subject_assigned:
@@ -180,10 +325,10 @@ class Teacher(Person):
     def to_dict(self):
         return {
             'name':self.name,
-            'contact': self.contact_info,
+            'contact': dict(self.contact_info),
             'role': self.role,
             'teacher_id': self.__teachers_id,
-            'subjects': self.subject_assigned,
+            'subjects': list(self.subject_assigned),
             'role-description': self.role_description,
             'password': self.password
         }
@@ -208,14 +353,18 @@ class Teacher(Person):
             print(Fore.RED + "❌ Passwords do not match.")
             return
 
-        self.password = sha256(new_pass.encode()).hexdigest()
-        print(Fore.GREEN + "✅ Password Updated Successfully!")
-
         if manager:
-            manager.data_changed = True
-            manager.save_data()
+            with manager.lock:
+                self.password = sha256(new_pass.encode()).hexdigest()
+                manager.mark_changed('teacher', self.get_teacher_id())
+                manager.request_save()
+        else:
+            self.password = sha256(new_pass.encode()).hexdigest()
+        print(Fore.GREEN + "✅ Password Updated Successfully!")
 
 class Admin(Person):
+    __slots__ = ('username', '__admin_id', 'permissions')
+
     def __init__(self, name , contact_info, admin_id, username='admin', password='1234'):
         super().__init__( name, contact_info, role='Admin')
         self.username = username
@@ -252,118 +401,556 @@ class Admin(Person):
             print(Fore.RED + "❌ Passwords do not match.")
             return
 
-        self.password = sha256(new_pass.encode()).hexdigest()
-        print(Fore.GREEN + "✅ Password Updated Successfully!")
-
         if manager:
-            manager.data_changed = True
-            manager.save_data()
+            with manager.lock:
+                self.password = sha256(new_pass.encode()).hexdigest()
+                manager.mark_changed('admin', self.get_admin_id())
+                manager.request_save()
+        else:
+            self.password = sha256(new_pass.encode()).hexdigest()
+        print(Fore.GREEN + "✅ Password Updated Successfully!")
     
+class IdAllocator:
+    """
+    Hands out PREFIX### ids from a counter plus a live set of ids in use,
+    both updated incrementally so nothing is rescanned per call.
+    """
+    _SUFFIX = re.compile(r'(\d+)$')
+
+    def __init__(self, prefix, width=3):
+        self.prefix = prefix
+        self.width = width
+        self.last = 0
+        self._live = set()
+
+    @classmethod
+    def numeric_suffix(cls, identifier):
+        if not identifier:
+            return 0
+        m = cls._SUFFIX.search(str(identifier))
+        return int(m.group(1)) if m else 0
+
+    def observe(self, identifier):
+        """Note an id that is in use (loaded, imported or user-supplied)."""
+        if not identifier:
+            return
+        self._live.add(identifier)
+        suffix = self.numeric_suffix(identifier)
+        if suffix > self.last:
+            self.last = suffix
+
+    def release(self, identifier):
+        # the counter never goes back, so released ids are not handed out again
+        self._live.discard(identifier)
+
+    def reset(self, identifiers):
+        self._live = set()
+        for identifier in identifiers:
+            self.observe(identifier)
+
+    def allocate(self):
+        while True:
+            self.last += 1
+            candidate = f"{self.prefix}{self.last:0{self.width}d}"
+            if candidate not in self._live:
+                self._live.add(candidate)
+                return candidate
+
+    def reserve(self, count):
+        """Allocate a block of count ids in one call (bulk imports)."""
+        return [self.allocate() for _ in range(count)]
+
+
 class SchoolManager:
-    def __init__(self, data_file = 'school_data.json'):
+    # lazy mode: raw records waiting to be turned into objects (None once hydrated)
+    _raw_students = None
+    _raw_teachers = None
+    _raw_exams = None
+    _attendance_pending = False
+    _service = None
+    # dashboard alert sets, built on first use (None = needs a full count)
+    _alerts = None
+    # AutoSaver worker when one is running (see autosave.py)
+    autosaver = None
+    # rows per page in the long list views; None prints them in one table
+    page_size = PAGE_SIZE
+    # GradeBook over all students, built on first use and dropped when a student changes
+    _gradebook = None
+    # StudentBoards (see leaderboard.py), built on first top-N query and then kept up to date
+    _leaderboards = None
+    # SectionIndex of students by normalized class, built on first use and then kept up to date
+    _sections = None
+
+    def __init__(self, data_file = 'school_data.json', journal=False, journal_compact_threshold=500, storage=None,
+                 attendance_file='attendance.json', lazy=False):
+        # lazy=True keeps raw records after load and builds objects on first access
+        self.lazy = lazy
+        self.startup_timings = {}
+        # held by whoever mutates or saves while an autosave worker may be running
+        self.lock = threading.RLock()
+        self._peeked_students = {}
+        self._peeked_teachers = {}
+        self._raw_students_by_id = None
+        self._raw_teachers_by_id = None
+        # ID allocators; the last_*_id attributes are views of their counters
+        self._id_allocators = {
+            'student': IdAllocator('STU'),
+            'teacher': IdAllocator('TCH'),
+            'admin': IdAllocator('ADM'),
+            'exam': IdAllocator('EX'),
+        }
         self.students = []
         self.teachers = []
-        self.last_student_id = 0  
-        self.last_teacher_id = 0
-        self.last_admin_id = 0
-        self.last_exam_id = 0
         self.data_file = data_file
-        self.attendance = {}
+        # attendance.json, or a .bin file in AttendanceStore's binary format
+        self.attendance_file = attendance_file
+        self.attendance = AttendanceStore()
         self.admins = []
         self.exams = []
         self.fee_structure = {}
         self.fee_transactions = []
-        self.data_changed = False
-        self.load_data()
-        self.load_attendance()
+        # ID-keyed registries so lookups don't scan the lists
+        self._students_by_id = {}
+        self._teachers_by_id = {}
+        self._admins_by_username = {}
+        self._admins_by_id = {}
+        # fee transaction seq -> transaction, and the seq the next one gets
+        self._fee_by_seq = {}
+        self._next_fee_seq = 0
+        # trigram search indexes, built on first search and then kept up to date
+        self._student_search = None
+        self._teacher_search = None
+        # exam_id -> exam, exam_id -> position in self.exams, and the inverted
+        # student_id -> {exam_id: (marks, bonus, max_marks)} results index
+        self._exams_by_id = {}
+        self._exam_order = {}
+        self._results_by_student = {}
+        # exam_id -> statistics dict (see analytics.exam_statistics); dropped when a result changes
+        self._exam_stats = {}
+        # exam_id -> Leaderboard of marks + bonus, built per exam on first top-N query
+        self._exam_boards = {}
+        # (kind, key) of records changed since the last save; consumed by the journal
+        # and SQLite storage. Attendance dates are tracked apart so that marking
+        # attendance never rewrites the data file.
+        self._pending_changes = {}
+        self._pending_attendance = set()
+        # set when a change wasn't recorded per record; the next save rewrites everything
+        self._rewrite_all = False
+        # set when the data file exists but couldn't be loaded; the first save moves it aside
+        self._load_failed = False
+        self.journal_compact_threshold = journal_compact_threshold
+        self._journal = Journal(data_file + '.journal') if journal else None
+        # optional backend (e.g. storage.SQLiteStorage); None keeps the JSON files
+        self.storage = storage
+        with self._timed('load_data'):
+            self.load_data()
+        if lazy:
+            self._attendance_pending = True
+        else:
+            with self._timed('load_attendance'):
+                self.load_attendance()
         # ensure internal counters are accurate after load
-        self._update_last_ids()
-        
-    # ID generators with uniqueness ensured by incrementing and checking existing sets
+        with self._timed('update_last_ids'):
+            self._update_last_ids()
+
+    @property
+    def service(self):
+        """SchoolService the interactive menus delegate to; saving stays with the menus."""
+        if self._service is None:
+            from service import SchoolService
+            self._service = SchoolService(self, autosave=False)
+        return self._service
+
+    # ---- startup timing ----
+    @contextmanager
+    def _timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings[phase] = self.startup_timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def startup_report(self):
+        print_section("⏱️ LOAD TIMINGS", Fore.CYAN)
+        table = [[phase, f"{secs * 1000:.1f}"] for phase, secs in self.startup_timings.items()]
+        print(tabulate(table, headers=['Phase', 'ms'], tablefmt=TABLE_FMT, stralign='center'))
+        print()
+
+    # ---- lazily hydrated collections ----
+    @property
+    def students(self):
+        if self._raw_students is not None:
+            self._hydrate_students()
+        return self._students
+
+    @students.setter
+    def students(self, value):
+        self._alerts = None
+        self._raw_students = None
+        self._raw_students_by_id = None
+        self._peeked_students = {}
+        self._students = value
+
+    @property
+    def teachers(self):
+        if self._raw_teachers is not None:
+            self._hydrate_teachers()
+        return self._teachers
+
+    @teachers.setter
+    def teachers(self, value):
+        self._raw_teachers = None
+        self._raw_teachers_by_id = None
+        self._peeked_teachers = {}
+        self._teachers = value
+
+    @property
+    def exams(self):
+        if self._raw_exams is not None:
+            self._hydrate_exams()
+        return self._exams
+
+    @exams.setter
+    def exams(self, value):
+        self._raw_exams = None
+        self._exams = value
+
+    @property
+    def attendance(self):
+        if self._attendance_pending:
+            self._attendance_pending = False
+            with self._timed('load_attendance'):
+                self.load_attendance()
+        return self._attendance
+
+    @attendance.setter
+    def attendance(self, value):
+        self._alerts = None
+        self._attendance_pending = False
+        self._attendance = value
+
+    def _hydrate_students(self):
+        with self._timed('hydrate_students'):
+            raw, peeked = self._raw_students, self._peeked_students
+            students = []
+            for s in raw:
+                # reuse objects already handed out by find_student_by_id
+                stu = peeked.pop(s.get('student_id'), None) if s.get('student_id') else None
+                students.append(stu if stu is not None else self._build_student(s))
+            self.students = students
+            self._rebuild_student_registry()
+
+    def _hydrate_teachers(self):
+        with self._timed('hydrate_teachers'):
+            raw, peeked = self._raw_teachers, self._peeked_teachers
+            teachers = []
+            for t_data in raw:
+                teacher = peeked.pop(t_data.get('teacher_id'), None) if t_data.get('teacher_id') else None
+                teachers.append(teacher if teacher is not None else self._build_teacher(t_data))
+            self.teachers = teachers
+            self._rebuild_teacher_registry()
+
+    def _hydrate_exams(self):
+        with self._timed('normalize_exams'):
+            self.exams = [self._normalize_exam(ex) for ex in self._raw_exams]
+            self._rebuild_exam_index()
+
+    def _peek_student(self, student_id):
+        # build a single student straight from its raw record
+        stu = self._peeked_students.get(student_id)
+        if stu is None and student_id:
+            if self._raw_students_by_id is None:
+                self._raw_students_by_id = {}
+                for s in self._raw_students:
+                    self._raw_students_by_id.setdefault(s.get('student_id'), s)
+            raw = self._raw_students_by_id.get(student_id)
+            if raw is not None:
+                stu = self._peeked_students[student_id] = self._build_student(raw)
+        return stu
+
+    def _peek_teacher(self, teacher_id):
+        teacher = self._peeked_teachers.get(teacher_id)
+        if teacher is None and teacher_id:
+            if self._raw_teachers_by_id is None:
+                self._raw_teachers_by_id = {}
+                for t_data in self._raw_teachers:
+                    self._raw_teachers_by_id.setdefault(t_data.get('teacher_id'), t_data)
+            raw = self._raw_teachers_by_id.get(teacher_id)
+            if raw is not None:
+                teacher = self._peeked_teachers[teacher_id] = self._build_teacher(raw)
+        return teacher
+        
+    # ID generators: O(1) per call, uniqueness kept by the allocators' live id sets
     def generate_student_id(self):
         """
         Generate a unique student id by incrementing last_student_id.
         Ensures uniqueness against existing students.
         """
-        existing_ids = {stu.get_student_id() for stu in self.students}
-        # keep incrementing until unique found
-        while True:
-            self.last_student_id += 1
-            candidate = f"STU{self.last_student_id:03d}"
-            if candidate not in existing_ids:
-                return candidate
+        return self._id_allocators['student'].allocate()
 
     def generate_teacher_id(self):
-        existing_ids = {t.get_teacher_id() for t in self.teachers}
-        while True:
-            self.last_teacher_id += 1
-            candidate = f"TCH{self.last_teacher_id:03d}"
-            if candidate not in existing_ids:
-                return candidate
+        return self._id_allocators['teacher'].allocate()
 
     def generate_admin_id(self):
-        existing_ids = {a.get('admin_id') for a in self.admins if a.get('admin_id')}
-        while True:
-            self.last_admin_id += 1
-            candidate = f"ADM{self.last_admin_id:03d}"
-            if candidate not in existing_ids:
-                return candidate
+        return self._id_allocators['admin'].allocate()
 
     def generate_exam_id(self):
-        existing_ids = {ex.get('exam_id') for ex in self.exams if ex.get('exam_id')}
-        while True:
-            self.last_exam_id += 1
-            candidate = f"EX{self.last_exam_id:03d}"
-            if candidate not in existing_ids:
-                return candidate
-    
-    def _extract_numeric_suffix(self, identifier):
-        if not identifier:
-            return 0
-        m = re.search(r'(\d+)$', str(identifier))
-        if m:
-            try:
-                return int(m.group(1))
-            except Exception:
-                return 0
-        return 0
+        return self._id_allocators['exam'].allocate()
 
-    def _update_last_ids(self):
-        # students
-        max_s = 0
-        for s in self.students:
-            sid = s.get_student_id()
-            max_s = max(max_s, self._extract_numeric_suffix(sid))
-        self.last_student_id = max(self.last_student_id, max_s)
-
-        # teachers
-        max_t = 0
+    def reserve_ids(self, kind, count):
+        """Reserve a block of ids for a bulk import ('student', 'teacher', 'admin' or 'exam')."""
+        return self._id_allocators[kind].reserve(count)
+
+    def _last_id_property(kind):
+        def getter(self):
+            return self._id_allocators[kind].last
+
+        def setter(self, value):
+            self._id_allocators[kind].last = int(value or 0)
+        return property(getter, setter)
+
+    last_student_id = _last_id_property('student')
+    last_teacher_id = _last_id_property('teacher')
+    last_admin_id = _last_id_property('admin')
+    last_exam_id = _last_id_property('exam')
+    del _last_id_property
+    
+    # ---- registry: dicts keyed by ID, kept in sync with the lists ----
+    def _register_student(self, stu):
+        self._students_by_id[stu.get_student_id()] = stu
+        self._id_allocators['student'].observe(stu.get_student_id())
+        self._refresh_student(stu)
+
+    def _refresh_student(self, stu):
+        # re-derive indexed data after a student's fields changed in place
+        self._gradebook = None
+        if self._students_by_id.get(stu.get_student_id()) is stu:
+            if self._leaderboards is not None:
+                self._leaderboards.update(stu)
+            if self._sections is not None:
+                self._sections.add(stu)
+        if self._student_search is not None:
+            self._student_search.add(stu.get_student_id(), self._student_search_fields(stu))
+        if self._alerts is not None:
+            self._track_alerts(stu, self._alerts)
+
+    def _unregister_student(self, stu):
+        sid = stu.get_student_id()
+        self._gradebook = None
+        if self._students_by_id.get(sid) is stu:
+            del self._students_by_id[sid]
+            self._id_allocators['student'].release(sid)
+            if self._leaderboards is not None:
+                self._leaderboards.remove(sid)
+            if self._sections is not None:
+                self._sections.remove(sid)
+            if self._student_search is not None:
+                self._student_search.remove(sid)
+            if self._alerts is not None:
+                self._alerts.remove(sid)
+
+    def _register_teacher(self, teacher):
+        self._teachers_by_id[teacher.get_teacher_id()] = teacher
+        self._id_allocators['teacher'].observe(teacher.get_teacher_id())
+        self._refresh_teacher(teacher)
+
+    def _refresh_teacher(self, teacher):
+        if self._teacher_search is not None:
+            self._teacher_search.add(teacher.get_teacher_id(), self._teacher_search_fields(teacher))
+
+    def _unregister_teacher(self, teacher):
+        tid = teacher.get_teacher_id()
+        if self._teachers_by_id.get(tid) is teacher:
+            del self._teachers_by_id[tid]
+            self._id_allocators['teacher'].release(tid)
+            if self._teacher_search is not None:
+                self._teacher_search.remove(tid)
+
+    def _register_admin(self, admin):
+        self._admins_by_username[admin.get('username')] = admin
+        self._admins_by_id[admin.get('admin_id')] = admin
+        self._id_allocators['admin'].observe(admin.get('admin_id'))
+
+    def _unregister_admin(self, admin):
+        if self._admins_by_id.get(admin.get('admin_id')) is admin:
+            del self._admins_by_id[admin.get('admin_id')]
+        if self._admins_by_username.get(admin.get('username')) is admin:
+            del self._admins_by_username[admin.get('username')]
+            self._id_allocators['admin'].release(admin.get('admin_id'))
+
+    def _rebuild_registry(self):
+        self._rebuild_student_registry()
+        self._rebuild_teacher_registry()
+        self._rebuild_admin_registry()
+
+    def _rebuild_student_registry(self):
+        # first entry wins on duplicate ids, matching the old linear scans
+        self._students_by_id = {}
+        for stu in self.students:
+            self._students_by_id.setdefault(stu.get_student_id(), stu)
+        # search index, gradebook, leaderboards and class index are rebuilt lazily on the next query
+        self._student_search = None
+        self._gradebook = None
+        self._leaderboards = None
+        self._sections = None
+
+    def _rebuild_teacher_registry(self):
+        self._teachers_by_id = {}
         for t in self.teachers:
-            tid = t.get_teacher_id()
-            max_t = max(max_t, self._extract_numeric_suffix(tid))
-        self.last_teacher_id = max(self.last_teacher_id, max_t)
+            self._teachers_by_id.setdefault(t.get_teacher_id(), t)
+        self._teacher_search = None
 
-        # admins (admin_id keys in admins list)
-        max_a = 0
+    def _rebuild_admin_registry(self):
+        self._admins_by_username = {}
+        self._admins_by_id = {}
         for a in self.admins:
-            aid = a.get('admin_id') or a.get('admin-id')
-            max_a = max(max_a, self._extract_numeric_suffix(aid))
-        self.last_admin_id = max(self.last_admin_id, max_a)
+            self._admins_by_username.setdefault(a.get('username'), a)
+            self._admins_by_id.setdefault(a.get('admin_id'), a)
+
+    def _rebuild_fee_index(self):
+        # transactions are keyed by a seq number that never changes once given out;
+        # ones saved before seq existed get their position, which is what they were keyed by
+        self._fee_by_seq = {}
+        for i, txn in enumerate(self.fee_transactions):
+            self._fee_by_seq.setdefault(txn.setdefault('seq', i), txn)
+        self._next_fee_seq = max(self._fee_by_seq, default=-1) + 1
+
+    # ---- search: field order must match the weights ----
+    STUDENT_SEARCH_WEIGHTS = (4, 3, 2, 1, 1, 1)   # id, name, class, phone, email, fee status
+    TEACHER_SEARCH_WEIGHTS = (4, 3, 1, 1, 1, 2)   # id, name, role, phone, email, subjects
+
+    @staticmethod
+    def _student_search_fields(stu):
+        return (stu.get_student_id(), stu.name, stu.class_section,
+                stu.contact_info.get('Phone', ''), stu.contact_info.get('Email', ''), stu.fee_status)
+
+    @staticmethod
+    def _teacher_search_fields(t):
+        # newline-joined so a query can't match across two subjects
+        return (t.get_teacher_id(), t.name, t.role_description,
+                t.contact_info.get('Phone', ''), t.contact_info.get('Email', ''), '\n'.join(t.subject_assigned))
+
+    def find_students(self, query, limit=None):
+        """Ranked substring search over ID, name, class, phone, email and fee status."""
+        if self._student_search is None:
+            index = NGramIndex(self.STUDENT_SEARCH_WEIGHTS)
+            self.students  # hydrate in lazy mode
+            for sid, stu in self._students_by_id.items():
+                index.add(sid, self._student_search_fields(stu))
+            self._student_search = index
+        return [self._students_by_id[sid] for sid in self._student_search.search(query, limit)]
+
+    def find_teachers(self, query, limit=None):
+        """Ranked substring search over ID, name, role, phone, email and subjects."""
+        if self._teacher_search is None:
+            index = NGramIndex(self.TEACHER_SEARCH_WEIGHTS)
+            self.teachers  # hydrate in lazy mode
+            for tid, t in self._teachers_by_id.items():
+                index.add(tid, self._teacher_search_fields(t))
+            self._teacher_search = index
+        return [self._teachers_by_id[tid] for tid in self._teacher_search.search(query, limit)]
+
+    def find_admin_by_username(self, username):
+        return self._admins_by_username.get(username)
+
+    def find_admin_by_id(self, admin_id):
+        return self._admins_by_id.get(admin_id)
+
+    def find_fee_transaction(self, seq):
+        return self._fee_by_seq.get(seq)
+
+    def add_fee_transaction(self, txn):
+        """Append a fee transaction under the next seq number and mark it changed."""
+        txn['seq'] = self._next_fee_seq
+        self._next_fee_seq += 1
+        self.fee_transactions.append(txn)
+        self._fee_by_seq[txn['seq']] = txn
+        self.mark_changed('fee_transaction', txn['seq'])
+        return txn
+
+    # ---- exam index: exam_id -> exam and student_id -> parsed results ----
+    @staticmethod
+    def _parse_result(res, max_marks):
+        try:
+            marks = float(res.get('marks', 0) or 0)
+        except (ValueError, TypeError):
+            marks = 0.0
+        try:
+            bonus = float(res.get('bonus', 0) or 0)
+        except (ValueError, TypeError):
+            bonus = 0.0
+        return marks, bonus, max_marks
 
-        # exams
-        max_e = 0
+    @staticmethod
+    def _parse_max_marks(exam):
+        try:
+            return float(exam.get('max_marks', 0) or 0)
+        except (ValueError, TypeError):
+            return 0.0
+
+    def _register_exam(self, exam):
+        exam_id = exam.get('exam_id')
+        if exam_id in self._exams_by_id:
+            return
+        self._exams_by_id[exam_id] = exam
+        self._exam_order[exam_id] = len(self._exam_order)
+        self._id_allocators['exam'].observe(exam_id)
+        max_marks = self._parse_max_marks(exam)
+        for sid, res in (exam.get('results') or {}).items():
+            self._results_by_student.setdefault(sid, {})[exam_id] = self._parse_result(res or {}, max_marks)
+
+    def _index_result(self, exam, student_id):
+        exam_id = exam.get('exam_id')
+        self._exam_stats.pop(exam_id, None)
+        res = exam.get('results', {}).get(student_id) or {}
+        parsed = self._parse_result(res, self._parse_max_marks(exam))
+        self._results_by_student.setdefault(student_id, {})[exam_id] = parsed
+        board = self._exam_boards.get(exam_id)
+        if board is not None:
+            board.set(student_id, parsed[0] + parsed[1])
+
+    def _rebuild_exam_index(self):
+        self._exams_by_id = {}
+        self._exam_order = {}
+        self._results_by_student = {}
+        self._exam_stats = {}
+        self._exam_boards = {}
         for ex in self.exams:
-            eid = ex.get('exam_id')
-            max_e = max(max_e, self._extract_numeric_suffix(eid))
-        self.last_exam_id = max(self.last_exam_id, max_e)
+            self._register_exam(ex)
+
+    def find_exam_by_id(self, exam_id):
+        self.exams  # normalize in lazy mode
+        return self._exams_by_id.get(exam_id)
+
+    def _extract_numeric_suffix(self, identifier):
+        return IdAllocator.numeric_suffix(identifier)
+
+    def _update_last_ids(self):
+        # full resync of the allocators from the current entities; only needed
+        # after a load, normal mutations keep them current incrementally
+        alloc = self._id_allocators
+        if self._raw_students is not None:
+            alloc['student'].reset(s.get('student_id') for s in self._raw_students)
+        else:
+            alloc['student'].reset(s.get_student_id() for s in self.students)
+        if self._raw_teachers is not None:
+            alloc['teacher'].reset(t.get('teacher_id') for t in self._raw_teachers)
+        else:
+            alloc['teacher'].reset(t.get_teacher_id() for t in self.teachers)
+        alloc['admin'].reset(a.get('admin_id') or a.get('admin-id') for a in self.admins)
+        if self._raw_exams is not None:
+            alloc['exam'].reset(ex.get('exam_id') or ex.get('examId') for ex in self._raw_exams)
+        else:
+            alloc['exam'].reset(ex.get('exam_id') for ex in self.exams)
     
     def backup_data(self, max_backup = 5):
         if os.path.exists(self.data_file) and os.path.getsize(self.data_file) > 0:
                 try:
-                    with open(self.data_file, 'r') as f:
-                        data = f.read().strip()
-                    backup_file = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"   
-                    with open(backup_file,'w') as f:
+                    with open(self.data_file, 'rb') as f:
+                        data = f.read()
+                    ext = '.bin' if self.data_file.endswith('.bin') else '.json'
+                    backup_file = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+                    with open(backup_file,'wb') as f:
                         f.write(data)
                     print(Fore.GREEN + f" 🗃️  Backup created: {backup_file}")
                     
@@ -373,8 +960,61 @@ class SchoolManager:
                 except Exception as e:
                     print(Fore.YELLOW + f"⚠️ Backup skipped: {e}")
                 
-    def save_data(self):
-        data = {
+    def mark_changed(self, kind, key):
+        """Record that one record changed: kind is student/teacher/admin/exam/fee_structure/fee_transaction/attendance."""
+        if kind == 'attendance':
+            self._pending_attendance.add(key)
+        else:
+            self._pending_changes[(kind, key)] = True
+        if kind == 'student':
+            self._gradebook = None
+            stu = self._students_by_id.get(key)
+            if self._leaderboards is not None:
+                if stu is None:
+                    self._leaderboards.remove(key)
+                else:
+                    self._leaderboards.update(stu)
+            if self._sections is not None:
+                if stu is None:
+                    self._sections.remove(key)
+                else:
+                    self._sections.add(stu)
+        elif kind == 'exam':
+            self._exam_stats.pop(key, None)
+        if self.autosaver is not None:
+            self.autosaver.notify()
+
+    @property
+    def data_changed(self):
+        """True while the data file is behind; setting it True forces a full rewrite on the next save."""
+        return self._rewrite_all or bool(self._pending_changes)
+
+    @data_changed.setter
+    def data_changed(self, value):
+        self._rewrite_all = bool(value)
+        if not value:
+            self._pending_changes = {}
+
+    @property
+    def attendance_changed(self):
+        """True while some attendance date hasn't been saved; setting it True marks every date."""
+        return bool(self._pending_attendance)
+
+    @attendance_changed.setter
+    def attendance_changed(self, value):
+        self._pending_attendance = set(self.attendance.keys()) if value else set()
+
+    def pending_changes(self):
+        """Unsaved changes as {kind: set of keys}, attendance dates included."""
+        changes = {}
+        for kind, key in self._pending_changes:
+            changes.setdefault(kind, set()).add(key)
+        if self._pending_attendance:
+            changes['attendance'] = set(self._pending_attendance)
+        return changes
+
+    def _snapshot_dict(self):
+        return {
             'last_student_id': self.last_student_id,
             'last_teacher_id': self.last_teacher_id,
             'last_admin_id': self.last_admin_id,
@@ -386,18 +1026,97 @@ class SchoolManager:
             'fee_structure': self.fee_structure,
             'fee_transactions': self.fee_transactions
         }
+
+    def _journal_records(self):
+        records = []
+        for kind, key in self._pending_changes:
+            current = None
+            if kind == 'student':
+                stu = self.find_student_by_id(key)
+                current = stu.to_dict() if stu else None
+            elif kind == 'teacher':
+                t = self.find_teacher_id(key)
+                current = t.to_dict() if t else None
+            elif kind == 'admin':
+                current = self.find_admin_by_id(key)
+            elif kind == 'exam':
+                current = self.find_exam_by_id(key)
+            elif kind == 'fee_structure':
+                current = self.fee_structure.get(key)
+            elif kind == 'fee_transaction':
+                current = self.find_fee_transaction(key)
+
+            if current is None:
+                records.append({'op': 'del', 'kind': kind, 'key': key})
+            else:
+                records.append({'op': 'put', 'kind': kind, 'key': key, 'data': current})
+        records.append({'op': 'meta', 'data': {
+            'last_student_id': self.last_student_id,
+            'last_teacher_id': self.last_teacher_id,
+            'last_admin_id': self.last_admin_id,
+            'last_exam_id': self.last_exam_id,
+        }})
+        return records
+
+    def _write_snapshot(self):
+        # write to a temp file and swap it in so a crash never leaves a half-written snapshot
+        tmp_file = self.data_file + '.tmp'
+        if self.data_file.endswith('.bin'):
+            snapshot.dump(self, tmp_file)
+        else:
+            with open(tmp_file, 'w') as f:
+                json.dump(self._snapshot_dict(), f, indent=4)
+        os.replace(tmp_file, self.data_file)
+        if self._journal is not None:
+            self._journal.truncate()
+
+    def compact_journal(self):
+        """Write a fresh snapshot and start an empty journal."""
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=4)
-            print(Fore.GREEN + " 🗃️ Data saved successfully!")
+            self._write_snapshot()
+            self._pending_changes = {}
+            self.data_changed = False
+            print(Fore.GREEN + " 🗃️ Journal compacted into a fresh snapshot.")
+        except Exception as e:
+            print(Fore.RED + f"❌ Error compacting journal: {e}")
+
+    def request_save(self, attendance=False):
+        """Save now, or hand it to the autosave worker when one is running."""
+        if self.autosaver is not None and self.autosaver.running:
+            self.autosaver.notify()
+        elif attendance:
+            self.save_attendance()
+        else:
+            self.save_data()
+
+    def save_data(self, verbose=True):
+        if not self.data_changed:
+            # nothing changed since the last save
+            return
+        try:
+            if self.storage is not None:
+                if self._load_failed:
+                    self._set_aside_unreadable()
+                # changes that weren't recorded per record mean every row gets rewritten
+                self.storage.save_data(self, full=self._rewrite_all)
+            else:
+                if self._load_failed:
+                    self._set_aside_unreadable()
+                if self._journal is not None and os.path.exists(self.data_file) and not self._rewrite_all:
+                    self._journal.append(self._journal_records())
+                    if self._journal.count >= self.journal_compact_threshold:
+                        self._write_snapshot()
+                else:
+                    self._write_snapshot()
+            if verbose:
+                print(Fore.GREEN + " 🗃️ Data saved successfully!")
             self.data_changed = False
         except Exception as e:
             print( Fore.RED + f"❌ Error saving data: {e}")
         
             
-    def load_data(self):
-        
-        default_admin = {
+    def _default_admin(self):
+        return {
             'name': 'Default-Admin',
             'username': 'admin',
             'password': sha256('1234'.encode()).hexdigest(),
@@ -405,66 +1124,181 @@ class SchoolManager:
             'admin_id': 'ADM001'
             
         }
-        if not os.path.exists(self.data_file) or os.path.getsize(self.data_file) == 0:
-            self.last_student_id = 0
-            self.last_teacher_id = 0
-            self.students = []
-            self.teachers = []
-            self.attendance = {}
-            self.admins = [default_admin]
-            self.exams = []
+
+    def _start_fresh(self):
+        self.last_student_id = 0
+        self.last_teacher_id = 0
+        self.students = []
+        self.teachers = []
+        self.attendance = AttendanceStore()
+        self.admins = [self._default_admin()]
+        self.exams = []
+        self._rebuild_registry()
+        self._rebuild_exam_index()
+
+    def _set_aside_unreadable(self):
+        # keep the file that failed to load instead of writing over it
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if self.storage is not None:
+            kept = self.storage.set_aside(f".unreadable-{stamp}")
+            print(Fore.YELLOW + f"⚠️ {self.storage.path} could not be loaded earlier; kept it as {kept}.")
+            # the new database starts empty, so everything in memory is written to it
+            self.data_changed = True
+            self.attendance_changed = True
+            self._load_failed = False
+            return
+        for path in (self.data_file, self.data_file + '.journal'):
+            if os.path.exists(path):
+                kept = f"{path}.unreadable-{stamp}"
+                os.replace(path, kept)
+                print(Fore.YELLOW + f"⚠️ {path} could not be loaded earlier; kept it as {kept}.")
+        if self._journal is not None:
+            self._journal.truncate()
+        self._load_failed = False
+
+    def load_data(self):
+        self._load_failed = False
+        if self.storage is not None:
+            try:
+                with self._timed('read_data'):
+                    data = self.storage.load_data()
+            except Exception as e:
+                # nothing is marked changed, and the first real save moves the database aside
+                self._start_fresh()
+                self._load_failed = True
+                print(Fore.RED + f"❌ Error loading data: {e}. Starting with fresh state.")
+                return
+            if data is None:
+                self._start_fresh()
+                print(Fore.YELLOW + f"⚠️ No existing data in {self.storage.path}. starting fresh!")
+                self.data_changed = True
+                self.save_data()
+                return
+            with self._timed('apply_data'):
+                self._apply_data(data)
+            return
+
+        no_snapshot = not os.path.exists(self.data_file) or os.path.getsize(self.data_file) == 0
+        if no_snapshot and (self._journal is None or not self._journal.has_records()):
+            self._start_fresh()
             print(Fore.YELLOW + f"⚠️ No existing datafile found. starting fresh!")
-            self.save_data()
+            if not os.path.exists(self.data_file):
+                # only a missing file gets written straight away
+                self.data_changed = True
+                self.save_data()
             return 
+        binary = self.data_file.endswith('.bin') and not no_snapshot
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
+            if binary:
+                with self._timed('read_data'):
+                    payload = snapshot.load(self.data_file)
+                if self._journal is None or not self._journal.has_records():
+                    with self._timed('apply_data'):
+                        self._apply_snapshot(payload)
+                    return
+                # journal records are raw dicts, so replay them on the JSON shape
+                data = self._snapshot_payload_data(payload)
+            elif no_snapshot:
+                data = {}
+            else:
+                with self._timed('read_data'), open(self.data_file, 'r') as f:
+                    data = json.load(f)
+            if self._journal is not None:
+                with self._timed('replay_journal'):
+                    replayed = self._journal.replay(data)
+                if replayed:
+                    print(Fore.CYAN + f"🗃️ Replayed {replayed} journal records.")
+                if self._journal.torn_at is not None:
+                    print(Fore.YELLOW + f"⚠️ Skipped unreadable journal lines; they move to "
+                                        f"{self._journal.torn_path} on the next save.")
         except Exception as e:
-            # If file is corrupted or unreadable, start fresh but keep default admin
-            self.last_student_id = 0
-            self.last_teacher_id = 0
-            self.students = []
-            self.teachers = []
-            self.attendance = {}
-            self.admins = [default_admin]
-            self.exams = []
+            # If file is corrupted or unreadable, start fresh but keep default admin.
+            # Nothing is marked changed, and the first real save moves the file aside.
+            self._start_fresh()
+            self._load_failed = True
             print(Fore.RED + f"❌ Error loading data: {e}. Starting with fresh state.")
             return
-    
+        with self._timed('apply_data'):
+            self._apply_data(data)
+
+    def _build_student(self, s):
+        student_id = s.get('student_id') or self.generate_student_id()
+        contact = s.get('contact', {'Phone': '', 'Email': ''})
+        stu = Student(s.get('name', f'Student {student_id}'), contact, student_id)
+        stu.marks = s.get('marks', {}) or {}
+        # fixed float conversion bug
+        try:
+            stu.paid_amount = float(s.get('paid_amount', 0.0) or 0.0)
+        except (TypeError, ValueError):
+            stu.paid_amount = 0.0
+        stu.fee_status = s.get('fee_status', stu.fee_status) or stu.fee_status
+        stu.class_section = s.get('class_section', 'N/A') or 'N/A'
+        stu.password = s.get('password') or sha256('4321'.encode()).hexdigest()
+        return stu
+
+    def _build_teacher(self, t_data):
+        teacher_id = t_data.get('teacher_id') or self.generate_teacher_id()
+        contact = t_data.get('contact', {'Phone': '', 'Email': ''})
+        teacher = Teacher(t_data.get('name', f'Teacher {teacher_id}'), contact, teacher_id, t_data.get('subjects', []))
+        teacher.role_description = t_data.get('role-description', 'Teacher') or 'Teacher'
+        teacher.password = t_data.get('password') or sha256('1234'.encode()).hexdigest()
+        return teacher
+
+    def _normalize_exam(self, ex):
+        # Ensure exams have minimum canonical fields (subject singular, max_marks, allow_bonus, results, exam_id)
+        exam_id = ex.get('exam_id') or ex.get('examId') or None
+        if not exam_id:
+            exam_id = self.generate_exam_id()
+        subject = ex.get('subject')
+        # if only 'subjects' provided (list or comma-str), choose first
+        if not subject and 'subjects' in ex:
+            subjects_field = ex.get('subjects') or []
+            if isinstance(subjects_field, list) and subjects_field:
+                subject = subjects_field[0]
+            elif isinstance(subjects_field, str) and subjects_field.strip():
+                # take first comma-separated
+                subject = subjects_field.split(',')[0].strip()
+        # fallback to empty string
+        subject = subject or ''
+        max_marks = ex.get('max_marks', ex.get('maxMark', 100) )
+        try:
+            max_marks = float(max_marks or 100)
+        except (TypeError, ValueError):
+            max_marks = 100.0
+        allow_bonus = bool(ex.get('allow_bonus') or ex.get('allowBonus') or False)
+        results = ex.get('results') or {}
+        exam_name = ex.get('exam_name') or ex.get('examName') or ex.get('name') or ''
+        date = ex.get('date') or ''
+        return {
+            'exam_id': exam_id,
+            'exam_name': exam_name,
+            'class': ex.get('class',''),
+            'subject': subject,
+            'date': date,
+            'max_marks': max_marks,
+            'allow_bonus': allow_bonus,
+            'results': results
+        }
+
+    def _apply_data(self, data):
+        """Build objects and normalized records from a raw school_data dict."""
+        default_admin = self._default_admin()
         self.last_student_id = data.get('last_student_id', 0) or 0
         self.last_teacher_id = data.get('last_teacher_id', 0) or 0
         self.last_admin_id = data.get('last_admin_id', 0) or 0
         self.last_exam_id = data.get('last_exam_id', 0) or 0
+        raw_students = data.get('students', []) or []
+        raw_teachers = data.get('teachers', []) or []
+        raw_exams = data.get('exams', []) or []
+        if not self.lazy:
+            # know every stored id up front so ids generated for incomplete records can't collide
+            self._id_allocators['student'].reset(s.get('student_id') for s in raw_students)
+            self._id_allocators['teacher'].reset(t.get('teacher_id') for t in raw_teachers)
+            self._id_allocators['exam'].reset(ex.get('exam_id') for ex in raw_exams)
         
-        self.exams = data.get('exams', []) or []
-        self.admins = data.get('admins', []) or [default_admin]
         self.fee_structure = data.get('fee_structure', {}) or {}
         self.fee_transactions = data.get('fee_transactions', []) or []
-        
-        self.students = []
-        for s in data.get('students', []) or []:
-            student_id = s.get('student_id') or self.generate_student_id()
-            contact = s.get('contact', {'Phone': '', 'Email': ''})
-            stu = Student(s.get('name', f'Student {student_id}'), contact, student_id)
-            stu.marks = s.get('marks', {}) or {}
-            # fixed float conversion bug
-            try:
-                stu.paid_amount = float(s.get('paid_amount', 0.0) or 0.0)
-            except (TypeError, ValueError):
-                stu.paid_amount = 0.0
-            stu.fee_status = s.get('fee_status', stu.fee_status) or stu.fee_status
-            stu.class_section = s.get('class_section', 'N/A') or 'N/A'
-            stu.password = s.get('password') or sha256('4321'.encode()).hexdigest()
-            self.students.append(stu)
-
-        self.teachers = []
-        for t_data in data.get('teachers', []) or []:
-            teacher_id = t_data.get('teacher_id') or self.generate_teacher_id()
-            contact = t_data.get('contact', {'Phone': '', 'Email': ''})
-            teacher = Teacher(t_data.get('name', f'Teacher {teacher_id}'), contact, teacher_id, t_data.get('subjects', []))
-            teacher.role_description = t_data.get('role-description', 'Teacher') or 'Teacher'
-            teacher.password = t_data.get('password') or sha256('1234'.encode()).hexdigest()
-            self.teachers.append(teacher)
+        self._rebuild_fee_index()
         
         # normalize admins to use 'admin_id' key
         raw_admins = data.get('admins', [default_admin]) or [default_admin]
@@ -479,50 +1313,63 @@ class SchoolManager:
                 'admin_id': a.get('admin_id') or a.get('admin-id') or f'ADM{idx:03d}'
             })
         self.admins = normalized_admin
-        
-        # Ensure exams have minimum canonical fields (subject singular, max_marks, allow_bonus, results, exam_id)
-        loaded_exams = []
-        for ex in self.exams:
-            # ex may already be the dict stored; ensure canonical shape
-            exam_id = ex.get('exam_id') or ex.get('examId') or None
-            if not exam_id:
-                exam_id = self.generate_exam_id()
-            subject = ex.get('subject')
-            # if only 'subjects' provided (list or comma-str), choose first
-            if not subject and 'subjects' in ex:
-                subjects_field = ex.get('subjects') or []
-                if isinstance(subjects_field, list) and subjects_field:
-                    subject = subjects_field[0]
-                elif isinstance(subjects_field, str) and subjects_field.strip():
-                    # take first comma-separated
-                    subject = subjects_field.split(',')[0].strip()
-            # fallback to empty string
-            subject = subject or ''
-            max_marks = ex.get('max_marks', ex.get('maxMark', 100) )
-            try:
-                max_marks = float(max_marks or 100)
-            except (TypeError, ValueError):
-                max_marks = 100.0
-            allow_bonus = bool(ex.get('allow_bonus') or ex.get('allowBonus') or False)
-            results = ex.get('results') or {}
-            exam_name = ex.get('exam_name') or ex.get('examName') or ex.get('name') or ''
-            date = ex.get('date') or ''
-            loaded_exams.append({
-                'exam_id': exam_id,
-                'exam_name': exam_name,
-                'class': ex.get('class',''),
-                'subject': subject,
-                'date': date,
-                'max_marks': max_marks,
-                'allow_bonus': allow_bonus,
-                'results': results
-            })
-        self.exams = loaded_exams
+        self._rebuild_admin_registry()
+
+        if self.lazy:
+            # objects are built on first access (or one at a time by the find_* lookups)
+            self.students, self.teachers, self.exams = [], [], []
+            self._rebuild_student_registry()
+            self._rebuild_teacher_registry()
+            self._rebuild_exam_index()
+            self._raw_students, self._raw_teachers, self._raw_exams = raw_students, raw_teachers, raw_exams
+        else:
+            self.students = [self._build_student(s) for s in raw_students]
+            self.teachers = [self._build_teacher(t_data) for t_data in raw_teachers]
+            self.exams = [self._normalize_exam(ex) for ex in raw_exams]
+            self._rebuild_student_registry()
+            self._rebuild_teacher_registry()
+            self._rebuild_exam_index()
         
         # Finalize counters
         self._update_last_ids()
         print(Fore.GREEN + "🗃️ Data loaded successfully (admins included.)")
         
+    def _apply_snapshot(self, payload):
+        """Like _apply_data, for a binary snapshot whose records are already normalized."""
+        for key in snapshot.META_KEYS:
+            setattr(self, key, payload[key])
+        self.fee_structure = payload['fee_structure']
+        self.fee_transactions = payload['fee_transactions']
+        self._rebuild_fee_index()
+        self.admins = payload['admins']
+        self._rebuild_admin_registry()
+        self.students = snapshot.build_students(payload['students'], Student)
+        self.teachers = snapshot.build_teachers(payload['teachers'], Teacher)
+        self._rebuild_student_registry()
+        self._rebuild_teacher_registry()
+        if self.lazy:
+            # the results index is still built on first use
+            self.exams = []
+            self._rebuild_exam_index()
+            self._raw_exams = payload['exams']
+        else:
+            self.exams = payload['exams']
+            self._rebuild_exam_index()
+        self._update_last_ids()
+        print(Fore.GREEN + "🗃️ Data loaded successfully (admins included.)")
+
+    def _snapshot_payload_data(self, payload):
+        data = {key: payload[key] for key in snapshot.META_KEYS}
+        data.update({
+            'students': [stu.to_dict() for stu in snapshot.build_students(payload['students'], Student)],
+            'teachers': [t.to_dict() for t in snapshot.build_teachers(payload['teachers'], Teacher)],
+            'admins': payload['admins'],
+            'exams': payload['exams'],
+            'fee_structure': payload['fee_structure'],
+            'fee_transactions': payload['fee_transactions'],
+        })
+        return data
+
     def add_student(self):
         print_section("Add Student", Fore.CYAN)
         name = input("Enter student name: ")
@@ -544,48 +1391,114 @@ class SchoolManager:
                 break
             print(Fore.RED +"❌ Invalid class-section! Format: 10-A, 12-B.")
         
-        student_id = self.generate_student_id()
-        
-        contact_info = {'Phone': phone, 'Email': email}
-        
-        new_student = Student(name, contact_info, student_id)
-        new_student.class_section = class_section
-        self.students.append(new_student)
-        self.data_changed = True
-        print(Fore.GREEN + f"✅ Student {name} ({student_id}) added successfully.\n ")
-        
-    def list_students(self):
+        try:
+            new_student = self.service.add_student(name, phone, email, class_section)
+        except ValueError as e:
+            print(Fore.RED + f"❌ {e}")
+            return
+        print(Fore.GREEN + f"✅ Student {name} ({new_student.get_student_id()}) added successfully.\n ")
+        
+    def gradebook(self):
+        """Averages, grades and class statistics for all students (see analytics.py)."""
+        if self._gradebook is None:
+            self._gradebook = GradeBook(self.students)
+        return self._gradebook
+
+    def section_index(self):
+        """Students grouped by normalized class (see sections.py)."""
+        if self._sections is None:
+            index = SectionIndex()
+            for stu in self.students:
+                if self._students_by_id.get(stu.get_student_id()) is stu:
+                    index.add(stu)
+            self._sections = index
+        return self._sections
+
+    def students_in_class(self, class_section):
+        """Students whose class_section matches, ignoring case and surrounding spaces."""
+        return self.section_index().students(class_section)
+
+    def leaderboards(self):
+        """Overall, per-class and per-subject student leaderboards (see leaderboard.py)."""
+        if self._leaderboards is None:
+            boards = StudentBoards()
+            for stu in self.students:
+                if self._students_by_id.get(stu.get_student_id()) is stu:
+                    boards.update(stu)
+            self._leaderboards = boards
+        return self._leaderboards
+
+    def exam_leaderboard(self, exam_id):
+        """Leaderboard of marks + bonus for one exam, or None for an unknown exam."""
+        board = self._exam_boards.get(exam_id)
+        if board is None:
+            exam = self.find_exam_by_id(exam_id)
+            if exam is None:
+                return None
+            board = Leaderboard()
+            max_marks = self._parse_max_marks(exam)
+            for sid, res in (exam.get('results') or {}).items():
+                marks, bonus, _ = self._parse_result(res or {}, max_marks)
+                board.set(sid, marks + bonus)
+            self._exam_boards[exam_id] = board
+        return board
+
+    def top_students(self, n=5, class_name=None, subject=None, exam_id=None):
+        """
+        [(student_id, score)] best first: average marks overall or within
+        class_name, the mark in one subject, or marks + bonus in one exam.
+        """
+        if exam_id:
+            board = self.exam_leaderboard(exam_id)
+        else:
+            boards = self.leaderboards()
+            if subject:
+                board = boards.subjects.get(subject)
+            elif class_name:
+                board = boards.classes.get(class_key(class_name))
+            else:
+                board = boards.overall
+        return board.top(n) if board is not None else []
+
+    def _page(self, records, columns, sort=None, query=None):
+        """Show records through a Pager; sort is a column header, '-' in front for descending."""
+        pager = Pager(records, columns, self.page_size, TABLE_FMT)
+        try:
+            if query:
+                pager.filter(query)
+            if sort:
+                pager.sort(sort.lstrip('-'), reverse=sort.startswith('-'))
+        except ValueError as e:
+            print(Fore.RED + f"❌ {e}")
+        pager.show()
+
+    def list_students(self, sort=None, query=None):
         print_section("All Students",Fore.GREEN)
         if not self.students:
             print(Fore.RED + "❌ No students found.\n")
             return
 
-        table = []
-            
-        for stu in self.students:
-            grade = stu.calculate_grade() or 'N/A'
-            marks_display = Fore.RED + "N/A" + Style.RESET_ALL if not stu.marks else Fore.GREEN + str(stu.marks) + Style.RESET_ALL
-            fee_color = Fore.RED if str(stu.fee_status).lower() == 'pending' else Fore.GREEN
-            grade_color = Fore.RED if grade in ('F', 'N/A') else Fore.GREEN
-            
-            table.append([
-                stu.get_student_id(),
-                stu.name,
-                stu.class_section,
-                stu.contact_info.get('Phone', 'N/A'),
-                fee_color + stu.fee_status + Style.RESET_ALL,
-                marks_display,
-                grade_color + grade + Style.RESET_ALL
-            ])
-        headers = ['ID', 'Name', 'Class_Section', 'Phone', 'Fee', 'Marks', 'Grade' ]
-        print(tabulate(table, headers, tablefmt=TABLE_FMT, stralign='center'))
+        # cells are only formatted for the rows on screen
+        book = self.gradebook()
+        columns = [
+            Column('ID', Student.get_student_id),
+            Column('Name', lambda stu: stu.name),
+            Column('Class_Section', lambda stu: stu.class_section),
+            Column('Phone', lambda stu: stu.contact_info.get('Phone', 'N/A')),
+            Column('Fee', lambda stu: stu.fee_status,
+                   lambda fee: Fore.RED if str(fee).lower() == 'pending' else Fore.GREEN),
+            Column('Marks', lambda stu: str(stu.marks) if stu.marks else 'N/A',
+                   lambda marks: Fore.RED if marks == 'N/A' else Fore.GREEN),
+            Column('Grade', lambda stu: book.grade(stu.get_student_id()) or 'N/A',
+                   lambda grade: Fore.RED if grade in ('F', 'N/A') else Fore.GREEN),
+        ]
+        self._page(self.students, columns, sort, query)
         print()
 
     def find_student_by_id(self, student_id):
-        for stu in self.students:
-            if stu.get_student_id() == student_id:
-                return stu
-        return None
+        if self._raw_students is not None:
+            return self._peek_student(student_id)
+        return self._students_by_id.get(student_id)
 
     def update_student(self):
         print_section("Update Student",Fore.GREEN)
@@ -597,31 +1510,22 @@ class SchoolManager:
             return
         
         new_name = input(f"Current Name: {stu.name}\nEnter new name (Press enter to keep current): ")
-        if new_name.strip():
-            stu.name = new_name
             
         while True:    
             current_phone = stu.contact_info.get('Phone', 'N/A')
             new_phone = input(f"Current Phone: {current_phone}\n Enter new phone (press enter to keep current): ")
-            if not new_phone.strip():
-                break
-            if is_valid_phone(new_phone):
-                stu.contact_info['Phone'] = new_phone
+            if not new_phone.strip() or is_valid_phone(new_phone):
                 break
             print(Fore.RED + f"❌ Invalid Phone, must be 10 digits, e.g, 9846288338")
             
         while True:
             current_class = getattr(stu, 'class_section',"N/A")
             new_class = input(f"Current Class/Section: {current_class}\nEnter new Class Section (press enter to keep current): ")
-            if not new_class.strip():
+            if not new_class.strip() or is_valid_class_section(new_class):
                 break
-            if is_valid_class_section(new_class):
-                stu.class_section = new_class
-            else:
-                print(Fore.RED + "❌ Invalid class-section format.")
-                continue
-            break
-        self.data_changed = True
+            print(Fore.RED + "❌ Invalid class-section format.")
+        self.service.update_student(student_id, name=new_name if new_name.strip() else None,
+                                    phone=new_phone.strip() or None, class_section=new_class.strip() or None)
         print(Fore.GREEN+ f"✅ Student {stu.get_student_id()} updated successfully!\n")
 
     def delete_student(self):
@@ -636,13 +1540,12 @@ class SchoolManager:
         confirm = input(f"Are you sure want to delete {stu.name} ({stu.get_student_id()})? (y/n) ").strip().lower()
         if confirm in ['y', 'yes']:
             try:
-                self.students.remove(stu)
+                self.service.delete_student(student_id)
                 print(Fore.GREEN + f"Student {student_id} deleted successfully\n")
             except ValueError:
                 print(Fore.RED + "❌ Error: Student not in list.")
         else:
             print(Fore.RED + "❌ Deletion cancelled\n")
-        self.data_changed = True
     
     def add_teachers(self):
         print_section("Add Teacher",Fore.GREEN)
@@ -659,8 +1562,6 @@ class SchoolManager:
             print(Fore.RED + "❌ Invalid email format.")
             
         role = input("Enter role (Teacher/Librarian/Accountant/etc) ") or "Teacher"
-        teacher_id =  self.generate_teacher_id()
-        contact_info = {'Phone': phone, 'Email': email}
         
         subjects = []
         add_subjects = input("Do you want to assign subject now? (y/n): ")
@@ -671,33 +1572,34 @@ class SchoolManager:
                     break
                 subjects.append(sub)
                 
-        new_teacher = Teacher(name , contact_info, teacher_id, subjects)  
-        new_teacher.role_description = role   
-        self.teachers.append(new_teacher)
-        self.data_changed = True
-        print(Fore.GREEN + f"✅ Teacher {name} ({teacher_id}) added successfully.\n")
+        try:
+            new_teacher = self.service.add_teacher(name, phone, email, role, subjects)
+        except ValueError as e:
+            print(Fore.RED + f"❌ {e}")
+            return
+        print(Fore.GREEN + f"✅ Teacher {name} ({new_teacher.get_teacher_id()}) added successfully.\n")
         
     
-    def list_teachers(self):
+    def list_teachers(self, sort=None, query=None):
         print_section("All Teachers",Fore.GREEN)
         if not self.teachers:
             print( Fore.RED + "❌ No teachers found.\n")
             return
         
-       
-        table = []
-        
-        for t in self.teachers:
-            table.append([t.get_teacher_id(), t.name, t.role_description, t.contact_info.get('Phone', 'N/A'), ', '.join(t.subject_assigned) if t.subject_assigned else "N/A" ])
-        headers = ['ID','Name','Role','Phone','Subjects']
-        print(tabulate(table, headers, tablefmt=TABLE_FMT, stralign='center'))
+        columns = [
+            Column('ID', Teacher.get_teacher_id),
+            Column('Name', lambda t: t.name),
+            Column('Role', lambda t: t.role_description),
+            Column('Phone', lambda t: t.contact_info.get('Phone', 'N/A')),
+            Column('Subjects', lambda t: ', '.join(t.subject_assigned) if t.subject_assigned else "N/A"),
+        ]
+        self._page(self.teachers, columns, sort, query)
         print()
     
     def find_teacher_id(self, teacher_id):
-        for t in self.teachers:
-            if t.get_teacher_id() == teacher_id:
-                return t
-        return None
+        if self._raw_teachers is not None:
+            return self._peek_teacher(teacher_id)
+        return self._teachers_by_id.get(teacher_id)
     
     def update_teachers(self):
         print_section("Update Teacher",Fore.GREEN)
@@ -709,20 +1611,10 @@ class SchoolManager:
             return
         
         new_name = input(f"Current name: {t.name}\nEnter new name(Press enter to keep current.\n)").strip()
-        if new_name:
-            t.name = new_name
-        
         new_phone = input(f"Current phone: {t.contact_info.get('Phone','N/A')}\nEnter new Phone (Press enter to keep current,)")
-        if new_phone.strip() and is_valid_phone(new_phone):
-            t.contact_info['Phone'] = new_phone
-            
         new_email = input(f"Current email: {t.contact_info.get('Email','N/A')}\nEnter new Email (Press enter to keep current,)")
-        if new_email.strip() and is_valid_email(new_email):
-            t.contact_info['Email'] = new_email
-            
         new_role = input(f"Current role: {t.role_description}\nEnter new role (Press enter to keep current.)")
-        if new_role.strip():
-            t.role_description = new_role
+        subjects = list(t.subject_assigned)
         
         print_section("Update Subject",Fore.GREEN)
         while True:
@@ -733,23 +1625,35 @@ class SchoolManager:
                 break
             elif choice == 'a':
                 sub = input("Enter subject to add: ").strip()
-                if sub:
-                    t.add_subject(sub)
+                if sub and sub not in subjects:
+                    subjects.append(intern_str(sub))
             elif choice == 'r':
                 sub = input("Enter subject to remove: ").strip()
-                if sub:
-                    t.remove_subject(sub)
+                if sub in subjects:
+                    subjects.remove(sub)
             elif choice == 'u':
                 old_subject = input("Enter old subject to update: ").strip()
-                if old_subject in t.subject_assigned:
+                if old_subject in subjects:
                     new_sub = input(f"Enter new name for subject: {old_subject}: ").strip()
                     if new_sub:
-                        index = t.subject_assigned.index(old_subject)
-                        t.subject_assigned[index] = new_sub
+                        index = subjects.index(old_subject)
+                        subjects[index] = intern_str(new_sub)
                         print( (Fore.GREEN )+(f"✅ Subject {old_subject} updated to {new_sub}"))
                 else:
                     print((Fore.RED )+ f"❌ Subject {old_subject} not found in teacher's assigned subjects.")
-        self.data_changed = True
+        # prompts are done; apply everything at once so an autosave never sees half an edit
+        with self.lock:
+            if new_name:
+                t.name = new_name
+            if new_phone.strip() and is_valid_phone(new_phone):
+                t.contact_info['Phone'] = new_phone
+            if new_email.strip() and is_valid_email(new_email):
+                t.contact_info['Email'] = new_email
+            if new_role.strip():
+                t.role_description = new_role
+            t.subject_assigned = subjects
+            self._refresh_teacher(t)
+            self.mark_changed('teacher', t.get_teacher_id())
         print(Fore.GREEN + f"✅ Teacher {t.get_teacher_id()} updated successfully!\n")
 
          
@@ -764,11 +1668,13 @@ class SchoolManager:
         
         confirm = input(f"Are you sure want to delete {t.name} ({t.get_teacher_id()})? (y/n): ").strip().lower()
         if confirm in ['yes','y']:
-            self.teachers.remove(t)
+            with self.lock:
+                self.teachers.remove(t)
+                self._unregister_teacher(t)
+                self.mark_changed('teacher', teacher_id)
             print(Fore.GREEN + f"✅ Teacher {t.get_teacher_id()} deleted Successfully!\n")
         else:
             print(Fore.RED + "❌ Deletion cancelled.\n")
-        self.data_changed = True
         
     
     def manage_student_marks(self):
@@ -779,6 +1685,7 @@ class SchoolManager:
         if not stu:
             print(f"❌ Student {student_id} not found.")
             return
+        entered = {}
         while True:
             subject = input("Enter subject name or(Press enter to finish): ").strip()
             if not subject:
@@ -791,9 +1698,10 @@ class SchoolManager:
             except ValueError:
                 print(Fore.RED +"❌ Invalid input. Enter a number")
                 continue
-            stu.add_update_marks(subject ,  marks)
+            entered[subject] = marks
+            print(f"Marks updated for {stu.name} - {subject}: {marks}")
             print(Fore.GREEN + f"✅ Marks entry completed for {stu.name}")
-        self.data_changed = True
+        self.service.set_marks(student_id, entered)
     
     def manage_fee(self):
         # Note: Phase 1 keeps existing manage_fee behavior (mark paid)
@@ -810,10 +1718,10 @@ class SchoolManager:
         confirm = input("Mark fee as paid (y/n): ")
         
         if  confirm.lower() in ['yes','y']:
-            stu.pay_fee()
+            self.service.pay_fee(student_id)
+            print((Fore.GREEN)+ f"✅ {stu.name} fee status updated to paid.")
         else:
             print(Fore.RED + "❌ Fee update cancelled.")
-        self.data_changed = True
         
     def view_student_report(self, student):
         grade = student.calculate_grade() or 'N/A'
@@ -834,51 +1742,51 @@ class SchoolManager:
         print(f"Grade: {grade_color}{grade}{Style.RESET_ALL}")
 
             
-    def student_report(self):
+    def student_report(self, sort=None, query=None):
         print_section("Student Report", Fore.GREEN)
         if not self.students:
             print(Fore.RED + "❌ No student found.")
             return
 
-        table = []
-        for stu in self.students:
-            grade = stu.calculate_grade() or "N/A"
-            fee_color = Fore.GREEN if stu.fee_status.lower() == "paid" else Fore.RED
-            grade_color = Fore.RED if grade in ('F', 'N/A') else Fore.GREEN
-            marks_str = ', '.join(f"{sub}: {mark}" for sub, mark in stu.marks.items()) or "N/A"
-
-            table.append([
-                stu.get_student_id(),
-                stu.name,
-                stu.class_section,
-                fee_color + stu.fee_status + Style.RESET_ALL,
-                marks_str,
-                grade_color + grade + Style.RESET_ALL
-            ])
-
-        headers = ['ID', 'Name', 'Class', 'Fee', 'Marks', 'Grade']
-        print(tabulate(table, headers=headers, tablefmt=TABLE_FMT, stralign='center'))
+        book = self.gradebook()
+        columns = [
+            Column('ID', Student.get_student_id),
+            Column('Name', lambda stu: stu.name),
+            Column('Class', lambda stu: stu.class_section),
+            Column('Fee', lambda stu: stu.fee_status,
+                   lambda fee: Fore.GREEN if fee.lower() == "paid" else Fore.RED),
+            Column('Marks', lambda stu: ', '.join(f"{sub}: {mark}" for sub, mark in stu.marks.items()) or "N/A"),
+            Column('Grade', lambda stu: book.grade(stu.get_student_id()) or "N/A",
+                   lambda grade: Fore.RED if grade in ('F', 'N/A') else Fore.GREEN),
+        ]
+        self._page(self.students, columns, sort, query)
         print()
+        return True
 
     
-    def report_by_class(self):
+    def report_by_class(self, class_name=None):
         print_section("📘 CLASS-WISE STUDENT REPORT 📘", Fore.CYAN)
 
         if not self.students:
             print(Fore.RED + "❌ No students found.\n")
             return 
 
-        class_name = input("Enter class/section to view (e.g. 10-A): ").strip().lower()
+        if class_name is None:
+            class_name = input("Enter class/section to view (e.g. 10-A, or 'all' for every class): ")
+        class_name = class_name.strip().lower()
+        if class_name == 'all':
+            return self.report_all_classes()
 
-        filtered_students = [stu for stu in self.students if stu.class_section.strip().lower() == class_name]
+        filtered_students = self.students_in_class(class_name)
 
         if not filtered_students:
             print(Fore.RED + f"❌ No students found in class {class_name.upper()}.\n")
             return
 
+        book = self.gradebook()
         table = []
         for stu in filtered_students:
-            grade = stu.calculate_grade() or 'N/A'
+            grade = book.grade(stu.get_student_id()) or 'N/A'
             fee_color = Fore.GREEN if stu.fee_status.lower() == "paid" else Fore.RED
             grade_color = Fore.RED if grade == 'F' else Fore.GREEN
 
@@ -891,8 +1799,88 @@ class SchoolManager:
             ])
         
         print("\n" + tabulate(table, headers=['ID', 'Name', 'Class', 'Fee', 'Grade'], tablefmt=TABLE_FMT, stralign='center'))
+        return True
 
-    def report_by_fee(self):
+    def class_groups(self):
+        """
+        {class_key: {'class', 'students', 'fee_due', 'paid', 'outstanding', 'pending',
+        'grades': {label: count}, 'present', 'recorded', 'attendance'}} for every
+        class, in one pass over the class index. 'class' is the class_section as
+        first written; 'attendance' is present / recorded days in percent, or None.
+        """
+        book = self.gradebook()
+        groups = {}
+        for key, members in self.section_index().groups():
+            due = paid = outstanding = 0.0
+            pending = present = recorded = 0
+            grades = {}
+            for stu in members:
+                sid = stu.get_student_id()
+                try:
+                    amount = float(stu.paid_amount or 0.0)
+                except (TypeError, ValueError):
+                    amount = 0.0
+                paid += amount
+                try:
+                    fee = float(self.fee_structure.get(stu.class_section) or 0.0)
+                except (TypeError, ValueError):
+                    fee = 0.0
+                due += fee
+                outstanding += max(fee - amount, 0.0)
+                if self._fee_pending(stu):
+                    pending += 1
+                grade = book.grade(sid)
+                if grade is not None:
+                    grades[grade] = grades.get(grade, 0) + 1
+                p, r = self.attendance_counts(sid)
+                present += p
+                recorded += r
+            groups[key] = {
+                'class': members[0].class_section.strip(),
+                'students': len(members),
+                'fee_due': due,
+                'paid': paid,
+                'outstanding': outstanding,
+                'pending': pending,
+                'grades': {label: grades[label] for label in book.labels if label in grades},
+                'present': present,
+                'recorded': recorded,
+                'attendance': present / recorded * 100 if recorded else None,
+            }
+        return groups
+
+    def report_all_classes(self):
+        print_section("🏫 ALL CLASSES SUMMARY 🏫", Fore.CYAN)
+
+        if not self.students:
+            print(Fore.RED + "❌ No students found.\n")
+            return
+
+        groups = self.class_groups()
+        table = []
+        totals = {}
+        for g in groups.values():
+            for label, count in g['grades'].items():
+                totals[label] = totals.get(label, 0) + count
+            grades = ', '.join(f"{label}: {count}" for label, count in g['grades'].items()) or '-'
+            attendance = '-' if g['attendance'] is None else f"{g['attendance']:.2f}%"
+            table.append([g['class'], g['students'], round(g['fee_due'], 2), round(g['paid'], 2),
+                          round(g['outstanding'], 2), g['pending'], grades, attendance])
+        present = sum(g['present'] for g in groups.values())
+        recorded = sum(g['recorded'] for g in groups.values())
+        table.append(['ALL', sum(g['students'] for g in groups.values()),
+                      round(sum(g['fee_due'] for g in groups.values()), 2),
+                      round(sum(g['paid'] for g in groups.values()), 2),
+                      round(sum(g['outstanding'] for g in groups.values()), 2),
+                      sum(g['pending'] for g in groups.values()),
+                      ', '.join(f"{label}: {totals[label]}" for label in GRADE_LABELS if label in totals) or '-',
+                      f"{present / recorded * 100:.2f}%" if recorded else '-'])
+        headers = ['Class', 'Students', 'Fee Due', 'Paid', 'Outstanding', 'Pending', 'Grades', 'Attendance %']
+        print(tabulate(table, headers, tablefmt=TABLE_FMT, stralign='center'))
+        print()
+        return True
+
+    def report_by_fee(self, sort=None, query=None):
         print_section('💰 FEE-WISE STUDENT REPORT 💰', Fore.CYAN)
 
         if not self.students:
@@ -902,102 +1890,120 @@ class SchoolManager:
         paid_students = [stu for stu in self.students if stu.fee_status.lower() == 'paid']
         pending_students = [stu for stu in self.students if stu.fee_status.lower() == 'pending']
 
+        def columns(fee_color):
+            return [
+                Column('ID', Student.get_student_id),
+                Column('Name', lambda stu: stu.name),
+                Column('Class', lambda stu: stu.class_section),
+                Column('Fee', lambda stu: stu.fee_status, lambda fee: fee_color),
+            ]
+
         if paid_students:
-            print(Fore.GREEN + '\n✅ Paid Students:')
-            table = []
-            for stu in paid_students:
-                fee_color = Fore.GREEN
-                table.append([
-                    stu.get_student_id(),
-                    stu.name,
-                    stu.class_section,
-                    fee_color + stu.fee_status + Style.RESET_ALL
-                ])
-            print("\n" + tabulate(table, headers=['ID','Name','Class','Fee'], tablefmt=TABLE_FMT, stralign='center'))
+            print(Fore.GREEN + '\n✅ Paid Students:\n')
+            self._page(paid_students, columns(Fore.GREEN), sort, query)
         else:
             print(Fore.RED + "\n❌ No students have paid their fees yet.")   
 
         if pending_students:
-            print(Fore.RED + '\n❌ Pending Students:')
-            table = []
-            for stu in pending_students:
-                fee_color = Fore.RED
-                table.append([
-                    stu.get_student_id(),
-                    stu.name,
-                    stu.class_section,
-                    fee_color + stu.fee_status + Style.RESET_ALL
-                ])
-            print("\n" + tabulate(table, headers=['ID','Name','Class','Fee'], tablefmt=TABLE_FMT, stralign='center'))
+            print(Fore.RED + '\n❌ Pending Students:\n')
+            self._page(pending_students, columns(Fore.RED), sort, query)
         else:
             print(Fore.GREEN + "\n✅ All students have paid their fees.")  
+        return True
 
-    def report_top_students(self, Top_n=5):
+    def report_top_students(self, Top_n=5, class_name=None, subject=None, exam_id=None):
         print_section("🏆 TOP STUDENTS REPORT 🏆", Fore.CYAN)
         
         if not self.students:
             print(Fore.RED + "❌ No students found.\n")
             return
 
-        student_with_avg = []
-        for stu in self.students:
-            if stu.marks:
-                avg_marks = sum(stu.marks.values()) / len(stu.marks)
-                student_with_avg.append((stu, avg_marks))
+        max_marks = None
+        if exam_id:
+            exam = self.find_exam_by_id(exam_id)
+            if exam is None:
+                print(Fore.RED + f"❌ Exam {exam_id} not found.\n")
+                return
+            max_marks = self._parse_max_marks(exam)
+            print(Fore.CYAN + f"Exam: {exam.get('exam_name', '')} ({exam_id})")
+        elif subject:
+            print(Fore.CYAN + f"Subject: {subject}")
+        elif class_name:
+            print(Fore.CYAN + f"Class: {class_name}")
 
-        if not student_with_avg:
+        top_students = self.top_students(Top_n, class_name, subject, exam_id)
+
+        if not top_students:
             print(Fore.RED + "❌ No marks found for any student.\n")
             return  
 
-        student_with_avg.sort(key=lambda x: x[1], reverse=True)
-        top_students = student_with_avg[:Top_n]
-
         table = []
-        for stu, avg in top_students:
-            grade = stu.calculate_grade() or 'N/A'
+        for sid, score in top_students:
+            stu = self.find_student_by_id(sid)
+            if max_marks is not None:
+                # exam scores are graded on their percentage of max marks
+                grade = grade_for(score / max_marks * 100) if max_marks else 'N/A'
+            else:
+                grade = grade_for(score)
             grade_color = Fore.RED if grade == 'F' else Fore.GREEN
 
             table.append([
-                stu.get_student_id(),
-                stu.name,
-                stu.class_section,
-                round(avg, 2),
+                sid,
+                stu.name if stu else 'Unknown',
+                stu.class_section if stu else 'N/A',
+                round(score, 2),
                 grade_color + grade + Style.RESET_ALL
             ])
 
-        print('\n' + tabulate(table, headers=['ID', 'Name', 'Class', 'Avg_Marks', 'Grade'], tablefmt=TABLE_FMT, stralign='center'))
+        header = 'Marks' if exam_id or subject else 'Avg_Marks'
+        print('\n' + tabulate(table, headers=['ID', 'Name', 'Class', header, 'Grade'], tablefmt=TABLE_FMT, stralign='center'))
+        return True
+
+    def report_class_statistics(self):
+        print_section("📈 CLASS STATISTICS 📈", Fore.CYAN)
 
-    def search_students(self):
+        if not self.students:
+            print(Fore.RED + "❌ No students found.\n")
+            return
+
+        book = self.gradebook()
+        table = []
+        for cls, st in book.class_stats().items():
+            if not st['graded']:
+                table.append([cls, st['students'], 0, '-', '-', '-', '-', '-', '-', '-'])
+                continue
+            grades = ', '.join(f"{label}: {count}" for label, count in st['grades'].items())
+            table.append([cls, st['students'], st['graded']] +
+                         [round(st[key], 2) for key in ('mean', 'median', 'std', 'p25', 'p75', 'p90')] + [grades])
+        headers = ['Class', 'Students', 'Graded', 'Mean', 'Median', 'Std', 'P25', 'P75', 'P90', 'Grades']
+        print(tabulate(table, headers, tablefmt=TABLE_FMT, stralign='center'))
+        print()
+        return True
+
+    def search_students(self, limit=None, keywords=None):
         print_section('🔍 Search Students', Fore.CYAN)
         
         if not self.students:
             print(Fore.RED + '❌ No students found.\n')
             return 
         
-        keywords = input("Enter keywords to search (Name, ID, Class, Phone etc.): ").strip().lower()
+        if keywords is None:
+            keywords = input("Enter keywords to search (Name, ID, Class, Phone etc.): ")
+        keywords = keywords.strip().lower()
         if not keywords:
             print(Fore.RED + "❌ No keywords entered.\n")
             return
         
-        results = []
-        for stu in self.students:
-            if (
-                keywords in (stu.name or '').lower()
-                or keywords in (stu.get_student_id() or '').lower()
-                or keywords in getattr(stu, 'class_section', 'N/A').lower()
-                or keywords in (stu.contact_info.get('Phone','') or '').lower()
-                or keywords in (stu.contact_info.get('Email','') or '').lower()
-                or keywords in str(stu.fee_status).lower()
-            ):
-                results.append(stu)
+        results = self.find_students(keywords, limit)
 
         if not results:
             print(Fore.RED + "❌ No matching student found.\n")   
             return 
 
+        book = self.gradebook()
         table = []
         for rstu in results:
-            grade = rstu.calculate_grade() or 'N/A'
+            grade = book.grade(rstu.get_student_id()) or 'N/A'
             table.append([
                 rstu.get_student_id(),
                 rstu.name,
@@ -1012,29 +2018,21 @@ class SchoolManager:
             
             
     
-    def search_teachers(self):
+    def search_teachers(self, limit=None, keywords=None):
         print_section('🔍 Search Teachers', Fore.CYAN)
         
         if not self.teachers:
             print(Fore.RED + '❌ No teachers found.\n')
             return 
         
-        keywords = input("Enter keywords to search (Name, ID, Phone, subjects etc.): ").strip().lower()
+        if keywords is None:
+            keywords = input("Enter keywords to search (Name, ID, Phone, subjects etc.): ")
+        keywords = keywords.strip().lower()
         if not keywords:
             print(Fore.RED + "❌ No keywords entered.\n")
             return
         
-        results = []
-        for t in self.teachers:
-            if(
-                keywords in (t.name or '').lower()
-                or keywords in (t.get_teacher_id() or '').lower()
-                or keywords in (t.contact_info.get('Phone','') or '').lower()
-                or keywords in (t.contact_info.get('Email', '') or '').lower()
-                or keywords in (t.role_description or '').lower()
-                or any(keywords in sub.lower() for sub in t.subject_assigned)
-            ):
-                results.append(t)
+        results = self.find_teachers(keywords, limit)
         if not results:
             print(Fore.RED + "❌ No matching teachers found.\n")   
             return 
@@ -1069,61 +2067,116 @@ class SchoolManager:
                 print(Fore.RED + "❌ Invalid date format! Using today instead." + Style.RESET_ALL)
                 date_str = datetime.now().strftime("%Y-%m-%d")
 
-        if date_str not in self.attendance:
-            self.attendance[date_str] = {}
-            
+        statuses = {}
         for stu in self.students:
             status = input(f'{stu.get_student_id()} - {stu.name} (P/A) ').strip().upper()
             while status not in ['P', 'A']:
                 print(Fore.RED + "❌ Invalid input! Enter 'P' for Present and 'A' for Absent." + Style.RESET_ALL)
                 status = input(f'{stu.get_student_id()} - {stu.name} (P/A) ').strip().upper()        
                 
-            self.attendance[date_str][stu.get_student_id()] = 'Present' if status == 'P' else 'Absent'
+            statuses[stu.get_student_id()] = status
+        self.service.record_attendance(date_str, statuses)
         
         print(Fore.GREEN + f"✅ Attendance marked for {date_str}!" + Style.RESET_ALL)
-        self.save_attendance()
+        self.request_save(attendance=True)
 
         #---- AUTOMATIC LOW ATTENDANCE ALERT -----#
         print(Fore.CYAN + "\n ⚠️ Checking for students with low attendance... " + Style.RESET_ALL)
         self.low_attendance_report()
-        self.data_changed = True
         
-    def save_attendance(self, filename='attendance.json'):
+    def save_attendance(self, filename=None, verbose=True):
+        if filename is None and not self._pending_attendance:
+            # nothing changed since the last save
+            return
+        filename = filename or self.attendance_file
+        if self.storage is not None:
+            try:
+                if self._load_failed:
+                    self._set_aside_unreadable()
+                self.storage.save_attendance(self)
+                self._pending_attendance = set()
+                if verbose:
+                    print(Fore.GREEN + f"🗃️ Attendance saved successfully to {self.storage.path}!" + Style.RESET_ALL)
+            except Exception as e:
+                print(Fore.RED + f"❌ Error saving attendance: {e}" + Style.RESET_ALL)
+            return
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.attendance, f, indent=4)
-            print(Fore.GREEN + f"🗃️ Attendance saved successfully to {filename}!" + Style.RESET_ALL)
+            if filename.endswith('.bin'):
+                self.attendance.save(filename)
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(self.attendance.to_dict(), f, indent=4)
+            if filename == self.attendance_file:
+                self._pending_attendance = set()
+            if verbose:
+                print(Fore.GREEN + f"🗃️ Attendance saved successfully to {filename}!" + Style.RESET_ALL)
         except Exception as e:
             print(Fore.RED + f"❌ Error saving attendance: {e}" + Style.RESET_ALL)
 
-    def load_attendance(self, filename='attendance.json'):
+    def set_attendance(self, date_str, student_id, status):
+        """Record one attendance cell; the store keeps the per-student counters in step."""
+        self.attendance.set(date_str, student_id, status)
+        if self._alerts is not None and student_id in self._students_by_id:
+            self._alerts.update_attendance(student_id, *self.attendance.counts(student_id))
+
+    def check_attendance_counters(self, repair=True):
+        """Recount from the raw cells; returns True when the counters were consistent."""
+        return self.attendance.check_counters(repair)
+
+    def attendance_counts(self, student_id):
+        """Return (present_days, recorded_days) for a student."""
+        return self.attendance.counts(student_id)
+
+    def load_attendance(self, filename=None):
+        filename = filename or self.attendance_file
+        if self.storage is not None:
+            try:
+                self.attendance = AttendanceStore.from_dict(self.storage.load_attendance())
+                print(Fore.GREEN + f"🗃️ Attendance loaded successfully from {self.storage.path}!" + Style.RESET_ALL)
+            except Exception as e:
+                self.attendance = AttendanceStore()
+                print(Fore.RED + f"❌ Error loading attendance: {e}" + Style.RESET_ALL)
+            return
         if not os.path.exists(filename) or os.path.getsize(filename) == 0:
             print(Fore.YELLOW + "⚠️ No existing attendance file found. Starting fresh!" + Style.RESET_ALL)
-            self.attendance = {}
+            self.attendance = AttendanceStore()
             return
         try:
-            with open(filename, 'r') as f:
-                self.attendance = json.load(f)
-            if not isinstance(self.attendance, dict):
-                self.attendance = {}
+            if filename.endswith('.bin'):
+                self.attendance = AttendanceStore.load(filename)
+            else:
+                with open(filename, 'r') as f:
+                    raw = json.load(f)
+                self.attendance = AttendanceStore.from_dict(raw if isinstance(raw, dict) else {})
             print(Fore.GREEN + f"🗃️ Attendance loaded successfully from {filename}!" + Style.RESET_ALL)
         except Exception as e:
-            self.attendance = {}
+            self.attendance = AttendanceStore()
             print(Fore.RED + f"❌ Error loading attendance: {e}" + Style.RESET_ALL)
-            
-    def view_attendance(self):
+            fallback = filename[:-len('.bin')] + '.json'
+            if filename.endswith('.bin') and os.path.exists(fallback):
+                # a damaged binary file falls back to the JSON it was converted from
+                self.load_attendance(fallback)
+
+    def view_attendance(self, date_str=None, student_id=None, start=None, end=None):
         print_section("📅 VIEW ATTENDANCE", Fore.CYAN)
         if not self.attendance:
             print(Fore.RED + "❌ No attendance record found.\n" + Style.RESET_ALL)
             return 
         
-        print("1. View by Date")
-        print("2. View by Student ID")
-        
-        choice = input("Enter your choice (1/2): ").strip()
+        if date_str is not None:
+            choice = '1'
+        elif student_id is not None:
+            choice = '2'
+        else:
+            print("1. View by Date")
+            print("2. View by Student ID")
+            print("3. Monthly/weekly summary")
+            choice = input("Enter your choice (1/2/3): ").strip()
         
         if choice == '1':
-            date_str = input("Enter date (YYYY-MM-DD): ").strip()
+            if date_str is None:
+                date_str = input("Enter date (YYYY-MM-DD): ")
+            date_str = date_str.strip()
             try:
                 datetime.strptime(date_str, "%Y-%m-%d")
             except ValueError:
@@ -1134,29 +2187,91 @@ class SchoolManager:
                 print(Fore.RED + f"❌ No attendance found for {date_str}\n" + Style.RESET_ALL)
                 return 
             
-            table = []
-            for sid, status in self.attendance[date_str].items():
-                stu = self.find_student_by_id(sid)
-                name = stu.name if stu else 'Unknown'
-                table.append([sid, name, status])
-            print("\n" + tabulate(table, headers=['ID', 'Name', 'Status'], tablefmt=TABLE_FMT, stralign='center'))
+            def name(cell):
+                stu = self.find_student_by_id(cell[0])
+                return stu.name if stu else 'Unknown'
+
+            # names are looked up only for the rows that get shown
+            columns = [Column('ID', lambda cell: cell[0]), Column('Name', name), Column('Status', lambda cell: cell[1])]
+            print()
+            self._page(list(self.attendance[date_str].items()), columns)
         
         elif choice == '2':
-            sid = input("Enter student ID: ").strip()
-            table = []
-            for date, records in self.attendance.items():
-                if sid in records:
-                    table.append([date, records[sid]])
+            sid = (student_id if student_id is not None else input("Enter student ID: ")).strip()
+            try:
+                table = [[date, status] for date, status in self.attendance.student_history(sid, start, end)]
+            except ValueError as e:
+                print(Fore.RED + f"❌ {e}\n" + Style.RESET_ALL)
+                return
             
             if not table:
                 print(Fore.RED + f"❌ No attendance found for {sid}.\n" + Style.RESET_ALL)
                 return
             
-            print("\n" + tabulate(table, headers=['Date', 'Status'], tablefmt=TABLE_FMT, stralign='center'))
+            print()
+            self._page(table, [Column('Date', lambda row: row[0]), Column('Status', lambda row: row[1])])
+
+        elif choice == '3':
+            period = input("Group by month or week [month]: ").strip().lower() or 'month'
+            start = input("From date (YYYY-MM-DD, Enter for the first): ").strip() or None
+            end = input("To date (YYYY-MM-DD, Enter for the last): ").strip() or None
+            class_section = input("Class (e.g. 10-A, Enter for the whole school): ").strip() or None
+            self.attendance_summary_report(period, start, end, class_section)
         
         else:
             print(Fore.RED + "❌ Invalid choice.\n" + Style.RESET_ALL)
             
+    def _attendance_scope(self, class_section=None, student_id=None):
+        # student ids for a range query, None for the whole school
+        if student_id:
+            return [student_id]
+        if class_section:
+            return [stu.get_student_id() for stu in self.students_in_class(class_section)]
+        return None
+
+    def attendance_between(self, start=None, end=None, class_section=None, student_id=None):
+        """(present, recorded) over the dates in [start, end] for the school, one class or one student."""
+        return self.attendance.counts_between(start, end, self._attendance_scope(class_section, student_id))
+
+    def attendance_summary_report(self, period='month', start=None, end=None, class_section=None,
+                                  student_id=None, days=None):
+        """Attendance per month or ISO week; days=N covers the last N days up to today."""
+        print_section("📅 ATTENDANCE SUMMARY 📅", Fore.CYAN)
+
+        if days:
+            end = datetime.now().date()
+            start = end - timedelta(days=days - 1)
+        if class_section and not self.students_in_class(class_section):
+            print(Fore.RED + f"❌ No students found in class {class_section.strip().upper()}.\n")
+            return
+        try:
+            rows = self.attendance.rollup(period, start, end, self._attendance_scope(class_section, student_id))
+        except ValueError as e:
+            print(Fore.RED + f"❌ {e}\n" + Style.RESET_ALL)
+            return
+
+        scope = f"Student {student_id}" if student_id else f"Class {class_section.strip()}" if class_section else "Whole school"
+        print(Fore.CYAN + f"{scope}, {start or 'first date'} to {end or 'last date'}")
+        if not rows:
+            print(Fore.RED + "❌ No attendance recorded in this range.\n" + Style.RESET_ALL)
+            return
+
+        def percent(present, recorded):
+            if not recorded:
+                return Fore.YELLOW + "N/A" + Style.RESET_ALL
+            value = present / recorded * 100
+            color = Fore.GREEN if value >= LOW_ATTENDANCE_ALERT else Fore.RED
+            return f"{color}{value:.2f}%{Style.RESET_ALL}"
+
+        table = [[key, dates, present, recorded, percent(present, recorded)] for key, present, recorded, dates in rows]
+        present = sum(row[1] for row in rows)
+        recorded = sum(row[2] for row in rows)
+        table.append(['TOTAL', sum(row[3] for row in rows), present, recorded, percent(present, recorded)])
+        headers = [period.capitalize(), 'Dates', 'Present', 'Recorded', 'Attendance %']
+        print('\n' + tabulate(table, headers, tablefmt=TABLE_FMT, stralign='center'))
+        print()
+        return True
+
     def school_attendance_percentage(self):
         print_section("📅 STUDENT ATTENDANCE PERCENTAGE ", Fore.CYAN)
         
@@ -1165,14 +2280,7 @@ class SchoolManager:
             return 
         table = []
         for stu in self.students:
-            total_days = 0
-            present_days = 0
-            
-            for _, records in self.attendance.items():
-                if stu.get_student_id() in records:
-                    total_days += 1
-                    if records.get(stu.get_student_id()) == 'Present':
-                        present_days += 1
+            present_days, total_days = self.attendance_counts(stu.get_student_id())
             if total_days > 0:
                 percentage = (present_days / total_days) * 100
                 color = Fore.GREEN if percentage >= 75 else Fore.RED
@@ -1182,12 +2290,12 @@ class SchoolManager:
             
         headers = ['ID', 'Name', 'Attendance %', 'Days Present', 'Total Days']
         print('\n'+tabulate(table,headers,tablefmt=TABLE_FMT, stralign='center'))
+        return True
     def calculate_attendance_percentage(self, student_id):
         # Count only the days where the student has a recorded status
-        total_days = sum(1 for day in self.attendance.values() if student_id in day)
+        present_count, total_days = self.attendance_counts(student_id)
         if total_days == 0:
             return 0.0
-        present_count = sum(1 for day in self.attendance.values() if day.get(student_id) == 'Present')
         return (present_count / total_days) * 100
     
     def low_attendance_report(self,threshold = 75):
@@ -1210,24 +2318,28 @@ class SchoolManager:
                 ])
         if not table:
             print(Fore.GREEN + f"✅ All students have attendance above {threshold}%.\n")
-            return     
+            return True
         headers = ['ID', 'Name', 'Class', 'Percentage']
         print("\n"+ tabulate(table, headers, tablefmt=TABLE_FMT, stralign='center'))
+        return True
             
     def add_admin(self,name,username,password,role='admin'):
         if not username or not password:
             print(Fore.RED + "❌ username and Password are required.")
             return False
         
-        if any(a['username'] == username for a in self.admins):
+        if self.find_admin_by_username(username):
             print(Fore.RED + f"Admin with username {username} already exists.")
             return False
         
-        new_id = self.generate_admin_id()
         hashed = sha256(password.encode()).hexdigest()
-        self.admins.append({'name': name, 'username': username, 'password': hashed, 'role': role, 'admin_id': new_id})
-        self.data_changed = True
-        self.save_data()
+        with self.lock:
+            new_id = self.generate_admin_id()
+            admin = {'name': name, 'username': username, 'password': hashed, 'role': role, 'admin_id': new_id}
+            self.admins.append(admin)
+            self._register_admin(admin)
+            self.mark_changed('admin', new_id)
+            self.request_save()
         print(Fore.GREEN + f"Admin {username} added successfully with the role {role}.")
         return True
 
@@ -1251,7 +2363,7 @@ class SchoolManager:
         print()
         
     def delete_admin(self, username):
-        admin = next((a for a in self.admins if a['username'] == username), None)
+        admin = self.find_admin_by_username(username)
         if not admin:
             print(Fore.RED + f"❌ No admin found with the username {username}." + Style.RESET_ALL)
             return
@@ -1267,9 +2379,11 @@ class SchoolManager:
             print(Fore.RED + "❌ Deletion Cancelled." + Style.RESET_ALL)
             return
         
-        self.admins.remove(admin)
-        self.data_changed = True
-        self.save_data()
+        with self.lock:
+            self.admins.remove(admin)
+            self._unregister_admin(admin)
+            self.mark_changed('admin', admin.get('admin_id'))
+            self.request_save()
         print(Fore.GREEN + f"✅ Admin {username} deleted successfully." + Style.RESET_ALL)
 
     
@@ -1280,7 +2394,7 @@ class SchoolManager:
                 print(Fore.RED + f"❌ Invalid role '{new_role}'. Valid roles: {', '.join(valid_roles)}." + Style.RESET_ALL)
                 return False
 
-            admin = next((a for a in self.admins if a['username'] == username_to_change), None)
+            admin = self.find_admin_by_username(username_to_change)
             if not admin:
                 print(Fore.RED + f"❌ No admin found with the username {username_to_change}." + Style.RESET_ALL)
                 return False
@@ -1298,9 +2412,10 @@ class SchoolManager:
                     print(Fore.RED + "❌ Cannot change role of the last superadmin." + Style.RESET_ALL)
                     return False
 
-            admin['role'] = new_role
-            self.data_changed = True
-            self.save_data()
+            with self.lock:
+                admin['role'] = new_role
+                self.mark_changed('admin', admin.get('admin_id'))
+                self.request_save()
             print(Fore.GREEN + f"✅ Admin {username_to_change} role changed: {old_role} -> {new_role}" + Style.RESET_ALL)
             return True
 
@@ -1313,41 +2428,44 @@ class SchoolManager:
             else:
                 print(f"❌ Invalid input! Please enter one of {choices_str}.")
     
-    def get_dash_board_alerts(self):
-        alerts = []
-
-        # Low attendance: calculate with existing method
-        low_attendance_students = []
-        for student in self.students:
-            pct = self.calculate_attendance_percentage(student.get_student_id())
-            if pct < 75:
-                low_attendance_students.append(student)
-        if low_attendance_students:
-            alerts.append(Fore.RED + f"⚠️ {len(low_attendance_students)} students have low attendance (<75%)")
-        
+    def _fee_pending(self, stu):
         # Pending fees: consider fee_structure when available, else fall back to fee_status
-        pending_fees_students = []
-        for student in self.students:
-            cls = student.class_section
-            class_fee = self.fee_structure.get(cls)
+        class_fee = self.fee_structure.get(stu.class_section)
+        try:
+            paid = float(stu.paid_amount or 0.0)
+        except (TypeError, ValueError):
+            paid = 0.0
+        if class_fee is not None:
             try:
-                paid = float(student.paid_amount or 0.0)
+                class_fee_val = float(class_fee or 0.0)
             except (TypeError, ValueError):
-                paid = 0.0
-            if class_fee is not None:
-                try:
-                    class_fee_val = float(class_fee or 0.0)
-                except (TypeError, ValueError):
-                    class_fee_val = 0.0
-                if paid < class_fee_val:
-                    pending_fees_students.append(student)
-            else:
-                # If no class fee defined, rely on fee_status
-                if str(student.fee_status).lower() != 'paid':
-                    pending_fees_students.append(student)
+                class_fee_val = 0.0
+            return paid < class_fee_val
+        # If no class fee defined, rely on fee_status
+        return str(stu.fee_status).lower() != 'paid'
+
+    def _track_alerts(self, stu, view):
+        sid = stu.get_student_id()
+        view.update_attendance(sid, *self.attendance_counts(sid))
+        view.update_fee(sid, self._fee_pending(stu))
+
+    def alert_view(self):
+        """The materialized alert sets; counted in full once, then updated as students, attendance and fees change."""
+        if self._alerts is None:
+            view = AlertView(LOW_ATTENDANCE_ALERT)
+            for stu in self.students:
+                self._track_alerts(stu, view)
+            self._alerts = view
+        return self._alerts
 
-        if pending_fees_students:
-            alerts.append(Fore.RED + f"⚠️ {len(pending_fees_students)} students have pending fees")
+    def get_dash_board_alerts(self):
+        alerts = []
+        view = self.alert_view()
+
+        if view.low_attendance:
+            alerts.append(Fore.RED + f"⚠️ {len(view.low_attendance)} students have low attendance (<{LOW_ATTENDANCE_ALERT}%)")
+        if view.pending_fees:
+            alerts.append(Fore.RED + f"⚠️ {len(view.pending_fees)} students have pending fees")
         
         return alerts
     
@@ -1357,7 +2475,7 @@ class SchoolManager:
         
         if not alerts:
             print(Fore.GREEN + "✅ No alerts. All students are fine!" + Style.RESET_ALL)
-            return
+            return True
 
         table = []
         for idx, alert in enumerate(alerts, start=1):
@@ -1365,6 +2483,7 @@ class SchoolManager:
         
         print(tabulate(table, headers=['No.', 'Alert'], tablefmt=TABLE_FMT, stralign='center'))
         print()
+        return True
 
     
     def create_exam(self):
@@ -1384,23 +2503,12 @@ class SchoolManager:
             max_marks = 100.0
         allow_bonus = input("Allow bonus marks for this exam (y/n): ").strip().lower() in ('yes', 'y')
         
-        if not exam_id:
-            exam_id = self.generate_exam_id()
-            
-        exam = {
-            'exam_id': exam_id,
-            'exam_name': exam_name,
-            'class': class_name,
-            'subject': subject,
-            'date': date,
-            'max_marks': max_marks,
-            'allow_bonus': allow_bonus,
-            'results': {} 
-        }
-        self.exams.append(exam)
-        self.data_changed = True
-        self._update_last_ids()
-        self.save_data()
+        try:
+            self.service.create_exam(class_name, subject, exam_name, date, max_marks, allow_bonus, exam_id or None)
+        except ValueError as e:
+            print(Fore.RED + f"❌ {e}" + Style.RESET_ALL)
+            return
+        self.request_save()
         print(Fore.GREEN + f"✅ Exam '{exam_name}' for {class_name} - {subject} created successfully!" + Style.RESET_ALL)
     
     def list_exams(self):
@@ -1410,8 +2518,10 @@ class SchoolManager:
             print(Fore.RED + "❌ No exams found.\n")
             return 
         
+        stats = self.exam_stats()
         table = []
         for idx , exam in enumerate(self.exams, start=1):
+            st = stats.get(exam.get('exam_id'), {})
             table.append([
                 idx,
                 exam.get('exam_id',''),
@@ -1419,10 +2529,13 @@ class SchoolManager:
                 exam.get('subject',''),
                 exam.get('exam_name',''),
                 exam.get('date',''),
-                exam.get('max_marks','')
+                exam.get('max_marks',''),
+                st.get('count', 0),
+                f"{st['mean_percent']:.1f}%" if st.get('count') else '-',
+                f"{st['pass_rate'] * 100:.1f}%" if st.get('count') else '-'
             ])
         
-        header = ['#', 'Exam Id', 'Class', 'Subject', 'Exam Name', 'Date', 'Max_Marks']
+        header = ['#', 'Exam Id', 'Class', 'Subject', 'Exam Name', 'Date', 'Max_Marks', 'Results', 'Mean %', 'Pass %']
         print(tabulate(table, header, tablefmt=TABLE_FMT, stralign='center'))
         print()
     
@@ -1447,10 +2560,7 @@ class SchoolManager:
         max_marks = float(exam.get('max_marks', 100) or 100)
         allow_bonus = bool(exam.get('allow_bonus', False))
 
-        if 'results' not in exam or not isinstance(exam.get('results'), dict):
-            exam['results'] = {}
-
-        students_in_class = [s for s in self.students if s.class_section.strip().lower() == exam_class]
+        students_in_class = self.students_in_class(exam_class)
         if not students_in_class:
             print(Fore.RED + f"❌ No students found in class {exam.get('class')} ")
             return
@@ -1489,43 +2599,107 @@ class SchoolManager:
                             print(Fore.RED + "❌ Invalid bonus input. Using 0.")
                             bonus = 0.0
 
-                exam['results'][sid] = {'marks': marks, 'bonus': bonus}
+                # recorded one at a time, so a Ctrl-C or bad input later keeps what was typed so far
+                self.service.record_exam_results(exam.get('exam_id'), {sid: (marks, bonus)})
+                self.request_save()
                 print(Fore.GREEN + f"✅ Marks saved for {stu.name}: {marks} (+{bonus})\n")
                 break  
 
-        self._update_last_ids()
-        self.save_data()
         print(Fore.GREEN + "✅ All marks entry complete and saved.\n")
 
+    def exam_stats(self, exam_ids=None):
+        """{exam_id: statistics} for the given exams (all by default); only uncached exams are computed."""
+        self.exams  # normalize in lazy mode
+        exam_ids = list(self._exams_by_id) if exam_ids is None else [e for e in exam_ids if e in self._exams_by_id]
+        missing = [exam_id for exam_id in exam_ids if exam_id not in self._exam_stats]
+        if missing:
+            batch = []
+            for exam_id in missing:
+                exam = self._exams_by_id[exam_id]
+                max_marks = self._parse_max_marks(exam)
+                parsed = [self._parse_result(res or {}, max_marks) for res in (exam.get('results') or {}).values()]
+                batch.append((exam_id, max_marks, [p[0] for p in parsed], [p[1] for p in parsed]))
+            self._exam_stats.update(exam_statistics(batch))
+        return {exam_id: self._exam_stats[exam_id] for exam_id in exam_ids}
+
+    def exam_statistics_report(self, exam_id=None, term=None):
+        print_section("📊 EXAM STATISTICS 📊", Fore.CYAN)
+        self.exams  # normalize in lazy mode
+        if exam_id is not None:
+            exam = self.find_exam_by_id(exam_id)
+            if exam is None:
+                print(Fore.RED + f"❌ Exam {exam_id} not found.\n")
+                return
+            st = self.exam_stats([exam_id])[exam_id]
+            print(Fore.CYAN + f"{exam.get('exam_name', '')} - {exam.get('class', '')} - {exam.get('subject', '')}"
+                  f" ({exam.get('date', '')}), max marks {exam.get('max_marks', '')}")
+            if not st['count']:
+                print(Fore.YELLOW + "⚠️ No results entered for this exam yet.\n")
+                return True
+            bonus = st['bonus']
+            table = [
+                ['Results', st['count']],
+                ['Mean', round(st['mean'], 2)],
+                ['Median', round(st['median'], 2)],
+                ['Min', round(st['min'], 2)],
+                ['Max', round(st['max'], 2)],
+                ['Std-dev', round(st['std'], 2)],
+                ['Mean %', f"{st['mean_percent']:.2f}%"],
+                ['Pass rate', f"{st['pass_rate'] * 100:.1f}%"],
+                ['Students with bonus', bonus['students']],
+                ['Mean bonus', round(bonus['mean'], 2)],
+                ['Bonus uplift', f"{bonus['uplift_percent']:.2f} pts"],
+                ['Passed thanks to bonus', bonus['passed_by_bonus']],
+            ]
+            print(tabulate(table, headers=['Statistic', 'Value'], tablefmt=TABLE_FMT, stralign='center'))
+            hist = [[band, st['histogram'].get(band, 0), '█' * round(st['histogram'].get(band, 0) * 40 / st['count'])]
+                    for band in BANDS]
+            print(tabulate(hist, headers=['Score %', 'Students', ''], tablefmt=TABLE_FMT, stralign='left'))
+            print()
+            return True
+
+        exams = self.exams
+        if term:
+            term = term.strip().lower()
+            exams = [ex for ex in exams if term in str(ex.get('exam_name', '')).lower()]
+        if not exams:
+            print(Fore.RED + "❌ No exams found.\n")
+            return
+        stats = self.exam_stats([ex.get('exam_id') for ex in exams])
+        table = []
+        for ex in exams:
+            st = stats[ex.get('exam_id')]
+            row = [ex.get('exam_id', ''), ex.get('exam_name', ''), ex.get('class', ''), ex.get('subject', ''),
+                   st['count']]
+            if st['count']:
+                row += [round(st[key], 2) for key in ('mean', 'median', 'min', 'max', 'std')]
+                row += [f"{st['pass_rate'] * 100:.1f}%", f"+{st['bonus']['uplift_percent']:.2f}"]
+            else:
+                row += ['-'] * 7
+            table.append(row)
+        headers = ['Exam Id', 'Exam Name', 'Class', 'Subject', 'Results', 'Mean', 'Median', 'Min', 'Max', 'Std',
+                   'Pass %', 'Bonus pts']
+        self._page(table, [Column(h, lambda row, i=i: row[i]) for i, h in enumerate(headers)])
+        print()
+        return True
+
     def calculate_student_percentage(self, student_id):
         total_max = 0.0
         total_obtained = 0.0
         details = []
 
-        for ex in self.exams:
-            results = ex.get('results', {}) or {}
-            if student_id not in results:
-                continue
-
-            res = results.get(student_id, {})
-            try:
-                marks = float(res.get('marks', 0) or 0)
-            except (ValueError, TypeError):
-                marks = 0.0
-            try:
-                bonus = float(res.get('bonus', 0) or 0)
-            except (ValueError, TypeError):
-                bonus = 0.0
-            try:
-                max_marks = float(ex.get('max_marks', 0) or 0)
-            except (ValueError, TypeError):
-                max_marks = 0.0
+        # only this student's own results, in exam order
+        self.exams  # normalize in lazy mode
+        entries = self._results_by_student.get(student_id) or {}
+        for exam_id in sorted(entries, key=self._exam_order.__getitem__):
+            marks, bonus, max_marks = entries[exam_id]
+            ex = self._exams_by_id[exam_id]
 
             obtained = marks + bonus
             pct = (obtained / max_marks * 100) if max_marks > 0 else 0.0
 
             details.append({
-                'exam_id': ex.get('exam_id', ''),
+                'exam_id': exam_id,
                 'exam_name': ex.get('exam_name', ''),
                 'subject': ex.get('subject', ''),
                 'marks': marks,
@@ -1558,7 +2732,7 @@ class SchoolManager:
         if not details:
             print(Fore.YELLOW + "ℹ️ No exam results found for this student.\n")
             print(Fore.CYAN + f"Overall Percentage: {avg_percent:.2f}%\n")
-            return
+            return True
 
         table = []
         for d in details:
@@ -1579,35 +2753,20 @@ class SchoolManager:
         print(Fore.CYAN + f"📊 Overall Percentage (weighted): {avg_percent:.2f}%")
 
         # Map overall percentage to grade
-        if avg_percent >= 90:
-            grade = 'A+'
-        elif avg_percent >= 80:
-            grade = 'A'
-        elif avg_percent >= 70:
-            grade = 'B+'
-        elif avg_percent >= 60:
-            grade = 'B'
-        elif avg_percent >= 50:
-            grade = 'C'
-        else:
-            grade = 'F'
+        grade = grade_for(avg_percent)
 
         print(Fore.GREEN + f"Grade: {grade}\n")
+        return True
         
     def quick_dashboard_stats(self):
         print_section("📊 DASHBOARD SUMMARY", Fore.MAGENTA)
         total_days = len(self.attendance)
         total_students = len(self.students)
         # Use actual recorded cells as denominator to avoid inaccuracies when some entries are missing
-        total_possible = sum(len(records) for records in self.attendance.values()) if self.attendance else 0
+        total_possible = self.attendance.total_recorded()
 
         # Count actual present entries across all recorded days
-        total_present = sum(
-            1
-            for records in self.attendance.values()
-            for status in records.values()
-            if status == 'Present'
-        )
+        total_present = self.attendance.total_present()
 
         attendance_percent = (total_present / total_possible * 100 ) if total_possible else 0
         
@@ -1637,8 +2796,20 @@ class SchoolManager:
                 print(f"  - {ex.get('exam_name','untitled')} on {ex.get('date')}")
         else:
             print(Fore.BLUE + "📚 No upcoming exams in the next 7 days.")
+        return True
             
     
+    def _read_records(self, filename, parse, stats, workers=1):
+        """Records parsed from a CSV file by parse(chunk, stats); workers > 1 parses a file path in parallel."""
+        if workers > 1 and isinstance(filename, str) and filename != '-':
+            return parallel_records(filename, parse, stats, workers)
+        records = []
+        with open_input(filename) as f:
+            for chunk in read_chunks(f):
+                stats.read(len(chunk))
+                records.extend(parse(chunk, stats))
+        return records
+
     def export_students_csv(self, filename = 'student_export.csv'):
         unique_subject = set()
         for stu in self.students:
@@ -1646,10 +2817,11 @@ class SchoolManager:
         subject_list = sorted(unique_subject)
         
         headers = ['Student ID', 'Name', 'Class', 'Phone', 'Email', 'Fee_status', 'Paid Amount'] + subject_list + ['Grade']
+        book = self.gradebook()
 
         
         try:
-            with open(filename, 'w', newline='') as f:
+            with open_output(filename) as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
                 
@@ -1662,75 +2834,95 @@ class SchoolManager:
                             'Email': stu.contact_info.get('Email', ''),
                             'Fee_status': stu.fee_status,
                             'Paid Amount': stu.paid_amount,
-                            'Grade': stu.calculate_grade() or 'N/A'
+                            'Grade': book.grade(stu.get_student_id()) or 'N/A'
                     }
                     
                     for subject in subject_list:
                         row[subject] = stu.marks.get(subject, '')
                     writer.writerow(row)
-            print(Fore.GREEN + f'✅ Exported {len(self.students)} students to {filename} ')
+            print(Fore.GREEN + f'✅ Exported {len(self.students)} students to {target_name(filename)} ')
+            return True
         except Exception as e:
             print(Fore.RED + f"❌ Export Failed {e}")
     
     def import_students_csv(self, filename='students_export.csv'):
+        columns = {'Student ID', 'Name', 'Class', 'Phone', 'Email', 'Fee_status', 'Paid Amount', 'Grade'}
         try:
-            with open(filename, 'r') as f:
-                Reader = csv.DictReader(f)
-                required = ['Name']
-                # flexible regarding Student ID: if provided use it, otherwise generate
-                imported = 0
-                skipped = 0
-                for row in Reader:
-                    if not row:
-                        continue
-                    student_id = (row.get('Student ID') or '').strip()
-                    name = (row.get('Name') or '').strip()
-                    if not name:
-                        skipped += 1
-                        continue
-                    class_section = (row.get('Class') or 'N/A').strip()
-                    phone = (row.get('Phone') or '').strip()
-                    email = (row.get('Email') or '').strip()
-                    fee_status = (row.get('Fee_status') or 'Pending').strip()
-                    try:
-                        paid_amount = float(row.get('Paid Amount') or 0.0)
-                    except Exception:
-                        paid_amount = 0.0
-
-                    if student_id:
-                        # if a student with same id exists, skip to avoid duplicates
-                        if self.find_student_by_id(student_id):
-                            skipped += 1
+            stats = ImportStats('student')
+            students = self.students
+            known_classes = set(self.fee_structure) | {'N/A'}
+            # flexible regarding Student ID: if provided use it, otherwise generate
+            given_ids = set()
+            records = []
+            with open_input(filename) as f:
+                for chunk in read_chunks(f):
+                    stats.read(len(chunk))
+                    ids = chunk.column('Student ID')
+                    names = chunk.column('Name')
+                    classes = chunk.column('Class', 'N/A')
+                    phones = chunk.column('Phone')
+                    emails = chunk.column('Email')
+                    bad_phones = invalid_values(phones, is_valid_phone)
+                    bad_emails = invalid_values(emails, is_valid_email)
+                    # classes the school already has are fine even if they predate the format check
+                    bad_classes = invalid_values(classes, is_valid_class_section) - known_classes
+                    amounts = parse_floats(chunk.column('Paid Amount'))
+                    fee_statuses = chunk.column('Fee_status', 'Pending')
+                    # any other column holds marks for the subject it is named after
+                    subjects = [key for key in chunk.positions if key not in columns]
+                    marks_rows = zip(*[chunk.cells(key) for key in subjects]) if subjects else repeat(())
+                    for student_id, name, class_section, phone, email, paid_amount, fee_status, mark_cells in zip(
+                            ids, names, classes, phones, emails, amounts, fee_statuses, marks_rows):
+                        if not name:
+                            stats.skip('without a name')
                             continue
-                    else:
-                        student_id = self.generate_student_id()
-
-                    contact_info = {'Phone': phone, 'Email': email}   
-                    stu = Student(name , contact_info, student_id)
-                    stu.class_section = class_section
-                    stu.fee_status = fee_status
-                    stu.paid_amount = paid_amount
-                    
-                    marks = {}
-                    for key in row:
-                        if key not in ['Student ID', 'Name', 'Class', 'Phone', 'Email', 'Fee_status', 'Paid Amount', 'Grade']:
-                            val = row.get(key)
-                            if val is None or val == '':
+                        if phone in bad_phones:
+                            stats.skip('invalid phone')
+                            continue
+                        if email in bad_emails:
+                            stats.skip('invalid email')
+                            continue
+                        if class_section in bad_classes:
+                            stats.skip('invalid class')
+                            continue
+                        if paid_amount is None:
+                            stats.warn('invalid paid amount, imported as 0')
+                            paid_amount = 0.0
+                        if student_id:
+                            # a student with the same id already exists or came earlier in the file
+                            if student_id in given_ids or student_id in self._students_by_id:
+                                stats.skip('duplicate id')
+                                continue
+                            given_ids.add(student_id)
+                        marks = {}
+                        for subject, val in zip(subjects, mark_cells):
+                            if not val:
                                 continue
                             try:
-                                marks[key] = float(val)
-                            except Exception:
+                                marks[subject] = float(val)
+                            except ValueError:
                                 # skip non-numeric mark fields
                                 continue
-                    stu.marks = marks
-                    self.students.append(stu)
-                    imported += 1
-            # refresh counters and mark dirty
-            self.data_changed = True
-            self._update_last_ids()
-            print(Fore.GREEN + f"✅ Imported {imported} students from {filename} (skipped {skipped} rows).")
+                        records.append((student_id, name, class_section, phone, email, fee_status, paid_amount, marks))
+            # ids given in the file are claimed first, then one block is reserved for the rest
+            allocator = self._id_allocators['student']
+            for student_id in given_ids:
+                allocator.observe(student_id)
+            new_ids = iter(self.reserve_ids('student', len(records) - len(given_ids)))
+            for student_id, name, class_section, phone, email, fee_status, paid_amount, marks in records:
+                stu = Student(name, {'Phone': phone, 'Email': email}, student_id or next(new_ids))
+                stu.class_section = class_section
+                stu.fee_status = fee_status
+                stu.paid_amount = paid_amount
+                stu.marks = marks
+                students.append(stu)
+                self._register_student(stu)
+                self.mark_changed('student', stu.get_student_id())
+            stats.imported = len(records)
+            print(Fore.GREEN + f"✅ Imported {stats.imported} students from {target_name(filename)} ({stats.summary()}).")
+            return stats.imported
         except FileNotFoundError:
-            print(Fore.RED + f"❌ Import failed: File not found ({filename})")
+            print(Fore.RED + f"❌ Import failed: File not found ({target_name(filename)})")
         except Exception as e:
             print(Fore.RED + f"❌ Import failed: {e}")
             
@@ -1740,7 +2932,7 @@ class SchoolManager:
         headers = ['Teacher ID', 'Name', 'Role_Description', 'Phone', 'Email', 'Subjects']
         
         try:
-            with open(filename, 'w', newline='') as f:
+            with open_output(filename) as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
                 
@@ -1754,48 +2946,59 @@ class SchoolManager:
                             'Subjects': ", ".join(t.subject_assigned) if t.subject_assigned else 'N/A'
                     }
                     writer.writerow(row)
-            print(Fore.GREEN + f'✅ Exported {len(self.teachers)} teachers to {filename} ')
+            print(Fore.GREEN + f'✅ Exported {len(self.teachers)} teachers to {target_name(filename)} ')
+            return True
         except Exception as e:
             print(Fore.RED + f"❌ Export Failed {e}")
             
     def import_teachers_csv(self, filename='teachers_import.csv'):
         try:
-            with open(filename, 'r') as f:
-                Reader = csv.DictReader(f)
-                imported = 0
-                skipped = 0
-                for row in Reader:
-                    if not row:
-                        continue
-                    teacher_id = (row.get('Teacher ID') or '').strip()
-                    name = (row.get('Name') or '').strip()
-                    if not name:
-                        skipped += 1
-                        continue
-                    role_desc = row.get('Role_Description') or row.get('Role Description') or ''
-                    phone = (row.get('Phone') or '').strip()
-                    email = (row.get('Email') or '').strip()
-                    subjects = row.get('Subjects') or ''
-
-                    if teacher_id:
-                        if self.find_teacher_id(teacher_id):
-                            skipped += 1
+            stats = ImportStats('teacher')
+            teachers = self.teachers
+            given_ids = set()
+            records = []
+            with open_input(filename) as f:
+                for chunk in read_chunks(f):
+                    stats.read(len(chunk))
+                    phones = chunk.column('Phone')
+                    emails = chunk.column('Email')
+                    bad_phones = invalid_values(phones, is_valid_phone)
+                    bad_emails = invalid_values(emails, is_valid_email)
+                    roles = [a or b for a, b in zip(chunk.column('Role_Description'), chunk.column('Role Description'))]
+                    for teacher_id, name, phone, email, role_desc, subjects in zip(
+                            chunk.column('Teacher ID'), chunk.column('Name'), phones, emails, roles,
+                            chunk.column('Subjects')):
+                        if not name:
+                            stats.skip('without a name')
                             continue
-                    else:
-                        teacher_id = self.generate_teacher_id()
-
-                    contact_info = {'Phone': phone, 'Email': email}   
-                    subjects_list = [s.strip() for s in subjects.split(',')] if subjects else []
-                    
-                    teacher = Teacher(name , contact_info, teacher_id, subjects_list )
-                    teacher.role_description = role_desc or 'Teacher'
-                    self.teachers.append(teacher)
-                    imported += 1
-                self.data_changed = True
-                self._update_last_ids()
-                print(Fore.GREEN + f"✅ Imported {imported} teachers from {filename} (skipped {skipped} rows).")
+                        if phone in bad_phones:
+                            stats.skip('invalid phone')
+                            continue
+                        if email in bad_emails:
+                            stats.skip('invalid email')
+                            continue
+                        if teacher_id:
+                            if teacher_id in given_ids or self.find_teacher_id(teacher_id):
+                                stats.skip('duplicate id')
+                                continue
+                            given_ids.add(teacher_id)
+                        subjects_list = [s.strip() for s in subjects.split(',')] if subjects else []
+                        records.append((teacher_id, name, phone, email, role_desc, subjects_list))
+            allocator = self._id_allocators['teacher']
+            for teacher_id in given_ids:
+                allocator.observe(teacher_id)
+            new_ids = iter(self.reserve_ids('teacher', len(records) - len(given_ids)))
+            for teacher_id, name, phone, email, role_desc, subjects_list in records:
+                teacher = Teacher(name, {'Phone': phone, 'Email': email}, teacher_id or next(new_ids), subjects_list)
+                teacher.role_description = role_desc or 'Teacher'
+                teachers.append(teacher)
+                self._register_teacher(teacher)
+                self.mark_changed('teacher', teacher.get_teacher_id())
+            stats.imported = len(records)
+            print(Fore.GREEN + f"✅ Imported {stats.imported} teachers from {target_name(filename)} ({stats.summary()}).")
+            return stats.imported
         except FileNotFoundError:
-            print(Fore.RED + f"❌ Import failed: File not found ({filename})")
+            print(Fore.RED + f"❌ Import failed: File not found ({target_name(filename)})")
         except Exception as e:
                 print(Fore.RED + f"❌ Import failed: {e}")
     
@@ -1804,7 +3007,7 @@ class SchoolManager:
         headers = ['Date', 'Student ID', 'Name', 'Status']
 
         try:
-            with open(filename, 'w', newline='') as f:
+            with open_output(filename) as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
 
@@ -1820,35 +3023,28 @@ class SchoolManager:
                         }
                         writer.writerow(row)
 
-            print(Fore.GREEN + f"✅ Exported attendance records to {filename}")
+            print(Fore.GREEN + f"✅ Exported attendance records to {target_name(filename)}")
+
+            return True
         except Exception as e:
             print(Fore.RED + f"❌ Export failed: {e}")
             
-    def import_attendance_csv(self, filename='attendance_import.csv'):
+    def import_attendance_csv(self, filename='attendance_import.csv', workers=1):
         try:
-            with open(filename, 'r') as f:
-                reader = csv.DictReader(f)
-                imported = 0
-                for row in reader:
-                    if not row:
-                        continue
-                    date = (row.get('Date') or '').strip()
-                    student_id = (row.get('Student ID') or '').strip()
-                    status = (row.get('Status') or '').strip()
-
-                    if not date or not student_id or not status:
-                        continue
-
-                    # normalize status
-                    status_norm = 'Present' if status.lower().startswith('p') else 'Absent'
-                    if date not in self.attendance:
-                        self.attendance[date] = {}
-                    self.attendance[date][student_id] = status_norm
-                    imported += 1
-            self.data_changed = True
-            print(Fore.GREEN + f"✅ Imported {imported} attendance records from {filename}")
+            stats = ImportStats('attendance')
+            records = self._read_records(filename, attendance_records, stats, workers)
+            self.attendance.set_many(records)
+            if self._alerts is not None:
+                for student_id in {rec[1] for rec in records}:
+                    if student_id in self._students_by_id:
+                        self._alerts.update_attendance(student_id, *self.attendance.counts(student_id))
+            for date in {rec[0] for rec in records}:
+                self.mark_changed('attendance', date)
+            stats.imported = len(records)
+            print(Fore.GREEN + f"✅ Imported {stats.imported} attendance records from {target_name(filename)} ({stats.summary()}).")
+            return stats.imported
         except FileNotFoundError:
-            print(Fore.RED + f"❌ Import failed: File not found ({filename})")
+            print(Fore.RED + f"❌ Import failed: File not found ({target_name(filename)})")
         except Exception as e:
             print(Fore.RED + f"❌ Import failed: {e}")
 
@@ -1856,7 +3052,7 @@ class SchoolManager:
         headers = ['Exam ID', 'Exam Name', 'Class', 'Subject', 'Date', 'Max Marks', 'Allow Bonus']
 
         try:
-            with open(filename, 'w', newline='') as f:
+            with open_output(filename) as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
 
@@ -1872,55 +3068,65 @@ class SchoolManager:
                     }
                     writer.writerow(row)
 
-            print(Fore.GREEN + f"✅ Exported {len(self.exams)} exams to {filename}")
+            print(Fore.GREEN + f"✅ Exported {len(self.exams)} exams to {target_name(filename)}")
+
+            return True
         except Exception as e:
             print(Fore.RED + f"❌ Export failed: {e}")
     
     
     def import_exams_csv(self, filename='exams_import.csv'):
         try:
-            with open(filename, 'r') as f:
-                reader = csv.DictReader(f)
-                imported = 0
-                for row in reader:
-                    if not row:
-                        continue
-                    exam_id = (row.get('Exam ID') or '').strip()
-                    exam_name = (row.get('Exam Name') or '').strip()
-                    class_name = (row.get('Class') or '').strip()
-                    subject_raw = (row.get('Subject') or '').strip()
-                    date = (row.get('Date') or '').strip()
-                    max_marks_raw = row.get('Max Marks') or row.get('Max Marks', 100)
-                    allow_bonus_raw = (row.get('Allow Bonus') or 'n').strip().lower()
-
-                    if not exam_id:
-                        exam_id = self.generate_exam_id()
-                    try:
-                        max_marks = float(max_marks_raw or 100)
-                    except Exception:
-                        max_marks = 100.0
-                    allow_bonus = allow_bonus_raw in ('y', 'yes', 'true', '1')
-
-                    # if subject contains commas, take first as canonical subject, but store original if needed
-                    subject = subject_raw.split(',')[0].strip() if subject_raw else ''
-
-                    exam = {
-                        'exam_id': exam_id,
-                        'exam_name': exam_name or '',
-                        'class': class_name or '',
-                        'subject': subject,
-                        'date': date,
-                        'max_marks': max_marks,
-                        'allow_bonus': allow_bonus,
-                        'results': {}
-                    }
-                    self.exams.append(exam)
-                    imported += 1
-                self.data_changed = True
-                self._update_last_ids()
-                print(Fore.GREEN + f"✅ Imported {imported} exams from {filename}")
+            stats = ImportStats('exam')
+            given_ids = set()
+            records = []
+            with open_input(filename) as f:
+                for chunk in read_chunks(f):
+                    stats.read(len(chunk))
+                    dates = chunk.column('Date')
+                    bad_dates = invalid_values(dates, is_valid_date)
+                    max_marks_col = parse_floats(chunk.column('Max Marks'), default=100.0)
+                    for exam_id, exam_name, class_name, subject_raw, date, max_marks, allow_bonus_raw in zip(
+                            chunk.column('Exam ID'), chunk.column('Exam Name'), chunk.column('Class'),
+                            chunk.column('Subject'), dates, max_marks_col, chunk.column('Allow Bonus', 'n')):
+                        if date in bad_dates:
+                            stats.skip('invalid date')
+                            continue
+                        if max_marks is None:
+                            stats.warn('invalid max marks, imported as 100')
+                            max_marks = 100.0
+                        if exam_id:
+                            # same exam already known; skip to avoid duplicates
+                            if exam_id in given_ids or self.find_exam_by_id(exam_id):
+                                stats.skip('duplicate id')
+                                continue
+                            given_ids.add(exam_id)
+                        # if subject contains commas, take first as canonical subject
+                        subject = subject_raw.split(',')[0].strip() if subject_raw else ''
+                        records.append({
+                            'exam_id': exam_id,
+                            'exam_name': exam_name,
+                            'class': class_name,
+                            'subject': subject,
+                            'date': date,
+                            'max_marks': max_marks,
+                            'allow_bonus': allow_bonus_raw.lower() in ('y', 'yes', 'true', '1'),
+                            'results': {}
+                        })
+            allocator = self._id_allocators['exam']
+            for exam_id in given_ids:
+                allocator.observe(exam_id)
+            new_ids = iter(self.reserve_ids('exam', len(records) - len(given_ids)))
+            for exam in records:
+                exam['exam_id'] = exam['exam_id'] or next(new_ids)
+                self.exams.append(exam)
+                self._register_exam(exam)
+                self.mark_changed('exam', exam['exam_id'])
+            stats.imported = len(records)
+            print(Fore.GREEN + f"✅ Imported {stats.imported} exams from {target_name(filename)} ({stats.summary()}).")
+            return stats.imported
         except FileNotFoundError:
-            print(Fore.RED + f"❌ Import failed: File not found ({filename})")
+            print(Fore.RED + f"❌ Import failed: File not found ({target_name(filename)})")
         except Exception as e:
             print(Fore.RED + f"❌ Import failed: {e}")
     
@@ -1928,7 +3134,7 @@ class SchoolManager:
         headers = ['Student ID', 'Name', 'Amount', 'Date', 'Method']
 
         try:
-            with open(filename, 'w', newline='') as f:
+            with open_output(filename) as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
 
@@ -1944,37 +3150,22 @@ class SchoolManager:
                     }
                     writer.writerow(row)
 
-            print(Fore.GREEN + f"✅ Exported {len(self.fee_transactions)} fee transactions to {filename}")
+            print(Fore.GREEN + f"✅ Exported {len(self.fee_transactions)} fee transactions to {target_name(filename)}")
+
+            return True
         except Exception as e:
             print(Fore.RED + f"❌ Export failed: {e}")
     
-    def import_fee_transactions_csv(self, filename='fee_transactions_import.csv'):
+    def import_fee_transactions_csv(self, filename='fee_transactions_import.csv', workers=1):
         try:
-            with open(filename, 'r') as f:
-                reader = csv.DictReader(f)
-                imported = 0
-                for row in reader:
-                    if not row:
-                        continue
-                    student_id = (row.get('Student ID') or '').strip()
-                    try:
-                        amount = float(row.get('Amount') or 0.0)
-                    except Exception:
-                        amount = 0.0
-                    date = (row.get('Date') or 'N/A').strip()
-                    method = (row.get('Method') or 'N/A').strip()
-
-                    txn = {
-                        'student_id': student_id,
-                        'amount': amount,
-                        'date': date,
-                        'method': method
-                    }
-                    self.fee_transactions.append(txn)
-                    imported += 1
-                self.data_changed = True
-                print(Fore.GREEN + f"✅ Imported {imported} fee transactions from {filename}")
+            stats = ImportStats('fee transaction')
+            records = self._read_records(filename, fee_transaction_records, stats, workers)
+            for txn in records:
+                self.add_fee_transaction(txn)
+            stats.imported = len(records)
+            print(Fore.GREEN + f"✅ Imported {stats.imported} fee transactions from {target_name(filename)} ({stats.summary()}).")
+            return stats.imported
         except FileNotFoundError:
-            print(Fore.RED + f"❌ Import failed: File not found ({filename})")
+            print(Fore.RED + f"❌ Import failed: File not found ({target_name(filename)})")
         except Exception as e:
             print(Fore.RED + f"❌ Import failed: {e}")
\ No newline at end of file
@@ -0,0 +1,191 @@
+# cli.py
+# Non-interactive subcommands for scripts and cron jobs. main.py hands over
+# here whenever it is started with arguments:
+#
+#   python main.py export students -o students.csv
+#   python main.py import attendance attendance.csv
+#   python main.py import fees fees.csv --workers 8
+#   python main.py report low-attendance --threshold 75
+#   python main.py report top --n 50 -o top.txt
+#   python main.py report top --n 10 --class 10-A
+#   python main.py report attendance-summary --period week --days 30
+#
+# Data goes to stdout (or -o FILE); status messages go to stderr so output can
+# be piped. Exit codes: 0 success, 1 the operation failed (a report error such
+# as an unknown exam or class, or a data file that doesn't exist), 2 bad arguments.
+
+import argparse
+import os
+import sys
+from contextlib import contextmanager, redirect_stdout
+
+from colorama import AnsiToWin32, Fore
+
+from classes import SchoolManager, open_output
+
+EXPORTS = {
+    'students': 'export_students_csv',
+    'teachers': 'export_teachers_csv',
+    'attendance': 'export_attendance_csv',
+    'exams': 'export_exams_csv',
+    'fees': 'export_fee_transactions_csv',
+}
+IMPORTS = {
+    'students': 'import_students_csv',
+    'teachers': 'import_teachers_csv',
+    'attendance': 'import_attendance_csv',
+    'exams': 'import_exams_csv',
+    'fees': 'import_fee_transactions_csv',
+}
+# imports that can split their file across worker processes
+PARALLEL_IMPORTS = {'attendance', 'fees'}
+# each returns True when the report was printed, falsy after an error (unknown exam, class, ...)
+REPORTS = {
+    'students': lambda m, args: m.student_report(),
+    'class': lambda m, args: m.report_by_class(args.class_name),
+    'fee': lambda m, args: m.report_by_fee(),
+    'top': lambda m, args: m.report_top_students(args.n, args.class_name, args.subject, args.exam),
+    'class-stats': lambda m, args: m.report_class_statistics(),
+    'classes': lambda m, args: m.report_all_classes(),
+    'exam-stats': lambda m, args: m.exam_statistics_report(args.exam, args.term),
+    'low-attendance': lambda m, args: m.low_attendance_report(args.threshold),
+    'attendance': lambda m, args: m.school_attendance_percentage(),
+    'attendance-summary': lambda m, args: m.attendance_summary_report(args.period, args.start, args.end,
+                                                                      args.class_name, args.student, args.days),
+    'student-exams': lambda m, args: m.student_exam_report(args.student_id),
+    'dashboard': lambda m, args: m.quick_dashboard_stats(),
+    'alerts': lambda m, args: m.show_dashboard_alerts(),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description="School Management System batch commands.")
+    parser.add_argument('--data', default='school_data.json', help="school data file (default: %(default)s)")
+    parser.add_argument('--attendance', default='attendance.json', help="attendance file (default: %(default)s)")
+    parser.add_argument('--db', help="use this SQLite database instead of the JSON files")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('-o', '--output', default='-', help="write to FILE instead of stdout")
+
+    export = commands.add_parser('export', parents=[output], help="export records as CSV")
+    export.add_argument('kind', choices=EXPORTS)
+
+    imp = commands.add_parser('import', help="import records from a CSV file ('-' reads stdin)")
+    imp.add_argument('kind', choices=IMPORTS)
+    imp.add_argument('file')
+    imp.add_argument('--workers', type=int, default=1,
+                     help="parse attendance/fees files in this many processes (default: %(default)s)")
+
+    report = commands.add_parser('report', help="print a report")
+    reports = report.add_subparsers(dest='report', required=True)
+    for name in ('students', 'fee', 'attendance', 'dashboard', 'alerts', 'class-stats', 'classes'):
+        reports.add_parser(name, parents=[output])
+    reports.add_parser('class', parents=[output]).add_argument('class_name')
+    top = reports.add_parser('top', parents=[output])
+    top.add_argument('--n', type=int, default=5)
+    top.add_argument('--class', dest='class_name', help="rank within one class")
+    top.add_argument('--subject', help="rank by the mark in one subject")
+    top.add_argument('--exam', help="rank by marks + bonus in one exam")
+    reports.add_parser('low-attendance', parents=[output]).add_argument('--threshold', type=float, default=75.0)
+    reports.add_parser('student-exams', parents=[output]).add_argument('student_id')
+    summary = reports.add_parser('attendance-summary', parents=[output])
+    summary.add_argument('--period', choices=['month', 'week'], default='month')
+    summary.add_argument('--from', dest='start', help="first date, YYYY-MM-DD")
+    summary.add_argument('--to', dest='end', help="last date, YYYY-MM-DD")
+    summary.add_argument('--days', type=int, help="the last N days up to today (overrides --from/--to)")
+    summary.add_argument('--class', dest='class_name', help="only one class")
+    summary.add_argument('--student', help="only one student")
+    exam_stats = reports.add_parser('exam-stats', parents=[output])
+    exam_stats.add_argument('--exam', help="one exam in detail, with its score histogram")
+    exam_stats.add_argument('--term', help="only exams whose name contains this text")
+
+    search = commands.add_parser('search', parents=[output], help="search students or teachers")
+    search.add_argument('kind', choices=['students', 'teachers'])
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=None)
+    return parser
+
+
+def _open_manager(args):
+    storage = None
+    if args.db:
+        from storage import SQLiteStorage
+        storage = SQLiteStorage(args.db)
+    manager = SchoolManager(args.data, storage=storage, attendance_file=args.attendance, lazy=True)
+    # batch output is never paged
+    manager.page_size = None
+    return manager
+
+
+@contextmanager
+def _report_output(target):
+    # tables go to the chosen stream; colour codes are stripped unless it is a terminal
+    with open_output(target) as out:
+        stream = out if out.isatty() else AnsiToWin32(out, strip=True).stream
+        with redirect_stdout(stream):
+            yield
+
+
+def cmd_export(manager, args):
+    with open_output(args.output) as out, redirect_stdout(sys.stderr):
+        ok = getattr(manager, EXPORTS[args.kind])(out)
+    return 0 if ok else 1
+
+
+def cmd_import(manager, args):
+    with redirect_stdout(sys.stderr):
+        if args.kind in PARALLEL_IMPORTS:
+            imported = getattr(manager, IMPORTS[args.kind])(args.file, workers=args.workers)
+        else:
+            imported = getattr(manager, IMPORTS[args.kind])(args.file)
+        if imported is None:
+            return 1
+        if args.kind == 'attendance':
+            manager.save_attendance()
+        manager.save_data()
+    return 0
+
+
+def cmd_report(manager, args):
+    if args.report == 'student-exams' and not manager.find_student_by_id(args.student_id):
+        print(Fore.RED + f"❌ Student {args.student_id} not found.", file=sys.stderr)
+        return 1
+    with redirect_stdout(sys.stderr):
+        manager.attendance  # loaded lazily; keep its status line out of the report
+    with _report_output(args.output):
+        ok = REPORTS[args.report](manager, args)
+    return 0 if ok else 1
+
+
+def cmd_search(manager, args):
+    with _report_output(args.output):
+        if args.kind == 'students':
+            manager.search_students(args.limit, keywords=args.query)
+        else:
+            manager.search_teachers(args.limit, keywords=args.query)
+    return 0
+
+
+COMMANDS = {'export': cmd_export, 'import': cmd_import, 'report': cmd_report, 'search': cmd_search}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # only import may start a new school; anything else on a mistyped path would create an empty one
+    path = args.db or args.data
+    if args.command != 'import' and not os.path.exists(path):
+        print(Fore.RED + f"❌ {path} not found.", file=sys.stderr)
+        return 1
+    # load messages are status, not output
+    with redirect_stdout(sys.stderr):
+        manager = _open_manager(args)
+    try:
+        return COMMANDS[args.command](manager, args)
+    except OSError as e:
+        print(Fore.RED + f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# compact.py
+# Memory-lean building blocks for the Person classes: slot-backed views for
+# contact_info and marks, plus interning of the strings and subject lists that
+# repeat across thousands of records.
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+# contact keys that get their own slot on Person; anything else goes to a side dict
+CONTACT_SLOTS = {'Phone': '_phone', 'Email': '_email'}
+
+# one shared tuple per distinct subject list, e.g. ('English', 'Math', 'Science')
+_subject_tuples = {}
+
+
+def intern_str(value):
+    """sys.intern for strings, anything else passes through unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def subject_tuple(subjects):
+    key = tuple(intern_str(s) for s in subjects)
+    return _subject_tuples.setdefault(key, key)
+
+
+def hex_to_digest(value):
+    """Store a hex sha256 as its 32 raw bytes; anything else is kept as given."""
+    if isinstance(value, str) and len(value) == 64:
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return value
+
+
+def digest_to_hex(value):
+    return value.hex() if isinstance(value, bytes) else value
+
+
+class ContactView(MutableMapping):
+    """contact_info mapping backed by the _phone/_email slots of a Person."""
+
+    __slots__ = ('_person',)
+
+    def __init__(self, person):
+        self._person = person
+
+    def __getitem__(self, key):
+        person = self._person
+        attr = CONTACT_SLOTS.get(key)
+        if attr is not None:
+            value = getattr(person, attr)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if person._contact_extra is None:
+            raise KeyError(key)
+        return person._contact_extra[key]
+
+    def __setitem__(self, key, value):
+        person = self._person
+        attr = CONTACT_SLOTS.get(key)
+        if attr is not None:
+            setattr(person, attr, value)
+        else:
+            if person._contact_extra is None:
+                person._contact_extra = {}
+            person._contact_extra[key] = value
+
+    def __delitem__(self, key):
+        person = self._person
+        attr = CONTACT_SLOTS.get(key)
+        if attr is not None:
+            if getattr(person, attr) is None:
+                raise KeyError(key)
+            setattr(person, attr, None)
+        else:
+            if person._contact_extra is None:
+                raise KeyError(key)
+            del person._contact_extra[key]
+            if not person._contact_extra:
+                person._contact_extra = None
+
+    def __iter__(self):
+        person = self._person
+        for key, attr in CONTACT_SLOTS.items():
+            if getattr(person, attr) is not None:
+                yield key
+        if person._contact_extra:
+            yield from person._contact_extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def _mark_number(mark):
+    # a mark's numeric value, or None when it has none
+    if type(mark) is float:
+        return mark
+    try:
+        return float(mark)
+    except (TypeError, ValueError):
+        return None
+
+
+class MarksView(MutableMapping):
+    """
+    subject -> mark mapping backed by a Student's shared subject tuple and
+    array('d') of the numeric values. Marks that aren't plain floats (an int
+    85, a '85' string, or a non-numeric 'absent') also keep their original
+    value in the student's _mark_extra dict and are returned as given, so a
+    load/save round trip doesn't change them. Non-numeric marks stay out of
+    the subject tuple and array, so averages only see numbers.
+    """
+
+    __slots__ = ('_student',)
+
+    def __init__(self, student):
+        self._student = student
+
+    def __getitem__(self, subject):
+        stu = self._student
+        extra = stu._mark_extra
+        if extra and subject in extra:
+            return extra[subject]
+        try:
+            return stu._mark_values[stu._mark_subjects.index(subject)]
+        except ValueError:
+            raise KeyError(subject) from None
+
+    def __setitem__(self, subject, mark):
+        stu = self._student
+        value = _mark_number(mark)
+        subjects = stu._mark_subjects
+        if value is None:
+            if subject in subjects:
+                self._drop_value(subject)
+        elif subject in subjects:
+            stu._mark_values[subjects.index(subject)] = value
+        else:
+            stu._mark_subjects = subject_tuple(subjects + (subject,))
+            stu._mark_values.append(value)
+        extra = dict(stu._mark_extra or ())
+        extra.pop(subject, None)
+        if type(mark) is not float:
+            extra[subject] = mark
+        stu._mark_extra = extra or None
+
+    def _drop_value(self, subject):
+        stu = self._student
+        subjects = stu._mark_subjects
+        idx = subjects.index(subject)
+        stu._mark_subjects = subject_tuple(subjects[:idx] + subjects[idx + 1:])
+        del stu._mark_values[idx]
+
+    def __delitem__(self, subject):
+        stu = self._student
+        extra = stu._mark_extra
+        if subject not in stu._mark_subjects and not (extra and subject in extra):
+            raise KeyError(subject)
+        if subject in stu._mark_subjects:
+            self._drop_value(subject)
+        if extra and subject in extra:
+            extra = dict(extra)
+            del extra[subject]
+            stu._mark_extra = extra or None
+
+    def __iter__(self):
+        stu = self._student
+        if not stu._mark_extra:
+            return iter(stu._mark_subjects)
+        return iter([subject for subject, _ in self.items()])
+
+    def __len__(self):
+        stu = self._student
+        if not stu._mark_extra:
+            return len(stu._mark_subjects)
+        return len(self.items())
+
+    def __contains__(self, subject):
+        stu = self._student
+        return subject in stu._mark_subjects or bool(stu._mark_extra and subject in stu._mark_extra)
+
+    def values(self):
+        return [mark for _, mark in self.items()]
+
+    def items(self):
+        stu = self._student
+        extra = stu._mark_extra
+        if not extra:
+            return list(zip(stu._mark_subjects, stu._mark_values))
+        subjects = stu._mark_subjects
+        return ([(subject, extra.get(subject, value)) for subject, value in zip(subjects, stu._mark_values)] +
+                [(subject, mark) for subject, mark in extra.items() if subject not in subjects])
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def pack_marks(marks):
+    """
+    (subject tuple, array('d'), extra) from a mapping; extra is None or the
+    original value of every mark that isn't a plain float (see MarksView).
+    """
+    subjects = []
+    values = array('d')
+    extra = {}
+    for subject, mark in (marks or {}).items():
+        value = _mark_number(mark)
+        if value is not None:
+            values.append(value)
+            subjects.append(subject)
+        if type(mark) is not float:
+            extra[subject] = mark
+    return subject_tuple(subjects), values, extra or None
@@ -0,0 +1,206 @@
+# importer.py
+# Streaming CSV import helpers. Rows are read in fixed-size chunks, each chunk
+# is validated column by column (every distinct value is checked once, so a
+# class or date repeated on thousands of rows costs one check), and the clean
+# records are collected so SchoolManager can apply them in a single pass once
+# the whole file has been read.
+#
+# Very large files can also be parsed in parallel: the body is cut into byte
+# ranges on line boundaries and each range is parsed and validated in a worker
+# process. This assumes no quoted field spans lines, which holds for the
+# attendance and fee files the app writes.
+
+import csv
+import io
+import os
+import signal
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+CHUNK_SIZE = 10_000
+# a progress line every this many rows, so big files don't look stuck
+PROGRESS_EVERY = 100_000
+
+
+class Chunk:
+    """Up to CHUNK_SIZE rows of a CSV file, read as lists and accessed a column at a time."""
+
+    def __init__(self, header, rows):
+        self.rows = rows
+        # like csv.DictReader, a repeated header name refers to its last column
+        self.positions = dict(zip(header, range(len(header))))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def cells(self, key):
+        """Raw values of one column, '' where the column or the cell is missing."""
+        i = self.positions.get(key)
+        if i is None:
+            return [''] * len(self.rows)
+        try:
+            return [row[i] for row in self.rows]
+        except IndexError:
+            return [row[i] if i < len(row) else '' for row in self.rows]
+
+    def column(self, key, default=''):
+        """Stripped values of one column; empty cells become default."""
+        return [v.strip() or default for v in self.cells(key)]
+
+
+def read_chunks(f, chunk_size=CHUNK_SIZE, header=None):
+    """
+    Yield Chunks of up to chunk_size non-empty rows from an open CSV file.
+    The first non-empty row is the header unless one is passed in.
+    """
+    reader = csv.reader(f)
+    if header is None:
+        header = next((row for row in reader if row), None)
+        if header is None:
+            return
+    while True:
+        batch = list(islice(reader, chunk_size))
+        if not batch:
+            return
+        rows = [row for row in batch if row]
+        if rows:
+            yield Chunk(header, rows)
+
+
+def _read_header(f):
+    """(header, offset of the first body byte) for a CSV file opened in binary mode."""
+    while True:
+        line = f.readline()
+        if not line:
+            return None, f.tell()
+        row = next(csv.reader(io.TextIOWrapper(io.BytesIO(line), newline='')), [])
+        if row:
+            return row, f.tell()
+
+
+def byte_ranges(filename, parts):
+    """
+    (header, [(start, end), ...]) splitting the body of a CSV file into about
+    `parts` byte ranges, each starting at the beginning of a line.
+    """
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        header, body = _read_header(f)
+        if header is None:
+            return None, []
+        bounds = [body]
+        step = max(1, (size - body) // parts)
+        for i in range(1, parts):
+            f.seek(max(body + i * step, bounds[-1]))
+            f.readline()
+            if f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+    return header, [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _init_worker():
+    # runs first in each worker process; it lives here rather than in main.py so a
+    # spawned worker only needs this module. Ctrl-C is left to the parent, which
+    # shuts the pool down, instead of every worker printing its own traceback.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _parse_range(filename, start, end, header, parse, label):
+    # runs in a worker process: parse one byte range the way the serial path parses the file
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    stats = ImportStats(label)
+    records = []
+    rows = 0
+    with io.TextIOWrapper(io.BytesIO(data), newline='') as text:
+        for chunk in read_chunks(text, header=header):
+            rows += len(chunk)
+            records.extend(parse(chunk, stats))
+    return records, rows, stats.skipped, stats.warnings
+
+
+def parallel_records(filename, parse, stats, workers):
+    """
+    Records of a CSV file, parsed by parse(chunk, stats) in `workers` processes.
+    Ranges are merged in file order, so the result matches parsing serially.
+    parse must be a module-level function so it can be sent to the workers.
+    """
+    # a few ranges per worker keeps them busy when some ranges validate slower
+    header, ranges = byte_ranges(filename, workers * 4)
+    records = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_parse_range, filename, start, end, header, parse, stats.label)
+                   for start, end in ranges]
+        for future in futures:
+            part, rows, skipped, warnings = future.result()
+            stats.read(rows)
+            stats.skipped.update(skipped)
+            stats.warnings.update(warnings)
+            records.extend(part)
+    return records
+
+
+def invalid_values(values, check):
+    """The distinct non-empty values that fail check."""
+    return {v for v in set(values) if v and not check(v)}
+
+
+def parse_floats(values, default=0.0):
+    """Column of floats; empty cells become default, unparseable ones None."""
+    parsed = {}
+    for v in set(values):
+        if not v:
+            parsed[v] = default
+            continue
+        try:
+            parsed[v] = float(v)
+        except ValueError:
+            parsed[v] = None
+    return [parsed[v] for v in values]
+
+
+class ImportStats:
+    """Row counts, skip and warning reasons and throughput for one import."""
+
+    def __init__(self, label):
+        self.label = label
+        self.rows = 0
+        self.imported = 0
+        self.skipped = Counter()
+        # rows imported with a value replaced by its default
+        self.warnings = Counter()
+        self._start = time.perf_counter()
+        self._next_progress = PROGRESS_EVERY
+
+    def skip(self, reason, count=1):
+        self.skipped[reason] += count
+
+    def warn(self, reason, count=1):
+        self.warnings[reason] += count
+
+    def read(self, count):
+        self.rows += count
+        if self.rows >= self._next_progress:
+            print(f"   ... {self.rows:,} {self.label} rows read ({self.rate():,.0f} rows/s)")
+            self._next_progress += PROGRESS_EVERY
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def rate(self):
+        elapsed = self.elapsed()
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        text = f"{self.rows:,} rows in {self.elapsed():.2f}s, {self.rate():,.0f} rows/s"
+        if self.skipped:
+            reasons = ', '.join(f"{count} {reason}" for reason, count in self.skipped.most_common())
+            text += f"; skipped {sum(self.skipped.values())} ({reasons})"
+        if self.warnings:
+            reasons = ', '.join(f"{count} {reason}" for reason, count in self.warnings.most_common())
+            text += f"; warnings: {reasons}"
+        return text
@@ -0,0 +1,109 @@
+# leaderboard.py
+# Score-ordered boards for top-N queries. Each board is a sorted list searched
+# with bisect, so changing one score is a binary search plus a list insert
+# (a memmove) instead of re-sorting everything, and top(n) is a slice for any n.
+
+from bisect import bisect_left, insort
+
+from sections import class_key
+
+
+class Leaderboard:
+    """
+    key -> score, kept in descending score order. Ties go by order, which
+    defaults to the order keys were first added (like a stable sort of the
+    original list).
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._by_key = {}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def set(self, key, score, order=None):
+        """Add or move key; score None removes it."""
+        if score is None:
+            self.remove(key)
+            return
+        old = self._by_key.get(key)
+        if old is not None:
+            if old[0] == -score:
+                return
+            if order is None:
+                order = old[1]
+            del self._entries[bisect_left(self._entries, old)]
+        elif order is None:
+            order = self._seq
+            self._seq += 1
+        entry = (-score, order, key)
+        self._by_key[key] = entry
+        insort(self._entries, entry)
+
+    def remove(self, key):
+        old = self._by_key.pop(key, None)
+        if old is not None:
+            del self._entries[bisect_left(self._entries, old)]
+
+    def score(self, key):
+        entry = self._by_key.get(key)
+        return None if entry is None else -entry[0]
+
+    def top(self, n=None):
+        """[(key, score)] best first."""
+        return [(key, -neg) for neg, _, key in self._entries[:n]]
+
+
+class StudentBoards:
+    """
+    Student leaderboards: overall average, average within each class_section
+    and mark per subject. update() re-scores one student after any change;
+    ties rank students in the order they were first updated, which is list
+    order when the boards are built from manager.students.
+    """
+
+    def __init__(self):
+        self.overall = Leaderboard()
+        self.classes = {}
+        self.subjects = {}
+        # student_id -> (order, class, subjects): where each student currently
+        # sits, so a change of class or subjects moves them
+        self._placed = {}
+        self._seq = 0
+
+    def update(self, stu):
+        sid = stu.get_student_id()
+        marks = dict(zip(stu._mark_subjects, stu._mark_values))
+        avg = sum(marks.values()) / len(marks) if marks else None
+        cls = class_key(stu.class_section)
+        placed = self._placed.get(sid)
+        if placed is None:
+            order, old_cls, old_subjects = self._seq, None, ()
+            self._seq += 1
+        else:
+            order, old_cls, old_subjects = placed
+        if old_cls is not None and old_cls != cls:
+            self.classes[old_cls].remove(sid)
+        for subject in old_subjects:
+            if subject not in marks:
+                self.subjects[subject].remove(sid)
+        self.overall.set(sid, avg, order)
+        self.classes.setdefault(cls, Leaderboard()).set(sid, avg, order)
+        for subject, mark in marks.items():
+            self.subjects.setdefault(subject, Leaderboard()).set(sid, mark, order)
+        self._placed[sid] = (order, cls, tuple(marks))
+
+    def remove(self, student_id):
+        placed = self._placed.pop(student_id, None)
+        if placed is None:
+            return
+        _, cls, subjects = placed
+        self.overall.remove(student_id)
+        self.classes[cls].remove(student_id)
+        for subject in subjects:
+            self.subjects[subject].remove(student_id)
@@ -5,7 +5,9 @@
 # - Consistent saves after data changes
 # - Slight input validation hardening
 
+from autosave import AutoSaver
 from classes import SchoolManager
+import os
 import sys
 from hashlib import sha256
 from colorama import Fore, Style, init
@@ -13,12 +15,10 @@ from getpass import getpass
 
 init(autoreset=True)
 
-# Initialize manager
-manager = SchoolManager()
-print(Fore.GREEN + " 🗂️ School Data Loaded Successfully!" + Style.RESET_ALL)
-
-# Show initial alerts once
-manager.show_dashboard_alerts()
+# set up by main(); nothing is loaded at import time, so worker processes that
+# re-import this module (spawn start method) don't load data or start threads
+manager = None
+autosaver = None
 
 
 # ------------------------ Helpers ------------------------
@@ -55,9 +55,10 @@ def admin_change_password(logged_admin):
         print(Fore.RED + "❌ Passwords do not match.")
         return
 
-    logged_admin['password'] = sha256(new_pass.encode()).hexdigest()
-    manager.data_changed = True
-    manager.save_data()
+    with manager.lock:
+        logged_admin['password'] = sha256(new_pass.encode()).hexdigest()
+        manager.mark_changed('admin', logged_admin.get('admin_id'))
+        manager.request_save()
     print(Fore.GREEN + "✅ Password Updated Successfully!")
 
 
@@ -112,44 +113,44 @@ def admin_menu(logged_admin):
             # Student related
             if choice == 1:
                 manager.add_student()
-                manager.save_data()
+                manager.request_save()
             elif choice == 2:
                 manager.list_students()
             elif choice == 3:
                 manager.update_student()
-                manager.save_data()
+                manager.request_save()
             elif choice == 4:
                 manager.delete_student()
-                manager.save_data()
+                manager.request_save()
             elif choice == 5:
                 manager.search_students()
 
             # Teacher related
             elif choice == 6:
                 manager.add_teachers()
-                manager.save_data()
+                manager.request_save()
             elif choice == 7:
                 manager.list_teachers()
             elif choice == 8:
                 manager.update_teachers()
-                manager.save_data()
+                manager.request_save()
             elif choice == 9:
                 manager.delete_teacher()
-                manager.save_data()
+                manager.request_save()
             elif choice == 10:
                 manager.search_teachers()
 
             # Fees, reports, attendance
             elif choice == 11:
                 manager.manage_fee()
-                manager.save_data()
+                manager.request_save()
             elif choice == 12:
                 manager.student_report()
             elif choice == 13:
                 admin_change_password(logged_admin)
             elif choice == 14:
                 manager.mark_attendance()
-                manager.save_data()
+                manager.request_save()
             elif choice == 15:
                 manager.school_attendance_percentage()
             elif choice == 16:
@@ -198,18 +199,18 @@ def admin_menu(logged_admin):
                 if username:
                     manager.delete_admin(username)
                     # delete_admin already saves, but call save to be extra safe
-                    manager.save_data()
+                    manager.request_save()
             elif choice == 24:
                 username = input("Enter username of admin to change role: ").strip()
                 new_role = input("Enter new role (admin/superadmin): ").strip()
                 if username and new_role:
                     manager.change_admin_role(username, new_role)
-                    manager.save_data()
+                    manager.request_save()
 
             # Exams
             elif choice == 25:
                 manager.create_exam()
-                manager.save_data()
+                manager.request_save()
             elif choice == 26:
                 manager.list_exams()
 
@@ -219,18 +220,24 @@ def admin_menu(logged_admin):
             elif choice == 28:
                 manager.export_students_csv()
             elif choice == 29:
-                manager.import_students_csv()
-                manager.save_data()
+                # no prompts inside, so the whole import runs under the lock
+                with manager.lock:
+                    manager.import_students_csv()
+                    manager.request_save()
             elif choice == 30:
                 manager.export_teachers_csv()
             elif choice == 31:
-                manager.import_teachers_csv()
-                manager.save_data()
+                # no prompts inside, so the whole import runs under the lock
+                with manager.lock:
+                    manager.import_teachers_csv()
+                    manager.request_save()
             elif choice == 32:
                 manager.export_attendance_csv()
             elif choice == 33:
-                manager.import_attendance_csv()
-                manager.save_data()
+                # no prompts inside, so the whole import runs under the lock
+                with manager.lock:
+                    manager.import_attendance_csv()
+                    manager.request_save()
             elif choice == 34:
                 print("Logging out...")
                 break
@@ -261,7 +268,7 @@ def teacher_menu(teacher):
                 manager.list_students()
             elif choice == 2:
                 manager.manage_student_marks()
-                manager.save_data()
+                manager.request_save()
             elif choice == 3:
                 teacher.change_password(manager)
             elif choice == 4:
@@ -319,7 +326,7 @@ def Login():
                 except (KeyboardInterrupt, EOFError):
                     print("\n" + Fore.YELLOW + "Cancelled.")
                     continue
-                admin_entry = next((a for a in manager.admins if a.get('username') == username), None)
+                admin_entry = manager.find_admin_by_username(username)
                 if admin_entry and sha256(password.encode()).hexdigest() == admin_entry.get('password'):
                     print("✅ Login Successful! Welcome, Admin.")
                     admin_menu(admin_entry)
@@ -333,7 +340,7 @@ def Login():
                 except (KeyboardInterrupt, EOFError):
                     print("\n" + Fore.YELLOW + "Cancelled.")
                     continue
-                teacher = next((t for t in manager.teachers if t.get_teacher_id() == tid), None)
+                teacher = manager.find_teacher_id(tid)
                 if teacher and hash_password(password) == teacher.password:
                     teacher_menu(teacher)
                 else:
@@ -346,7 +353,7 @@ def Login():
                 except (KeyboardInterrupt, EOFError):
                     print("\n" + Fore.YELLOW + "Cancelled.")
                     continue
-                student = next((s for s in manager.students if s.get_student_id() == sid), None)
+                student = manager.find_student_by_id(sid)
                 if student and hash_password(password) == student.password:
                     student_menu(student)
                 else:
@@ -363,7 +370,29 @@ def Login():
 
 
 # ------------------------ Main Loop ------------------------
-if __name__ == '__main__':
+def main(argv=None):
+    global manager, autosaver
+    argv = sys.argv[1:] if argv is None else argv
+    # with arguments, run a batch subcommand (see cli.py) instead of the interactive menus
+    if argv:
+        import cli
+        return cli.main(argv)
+
+    # Initialize manager; records are hydrated on first use so the login prompt appears quickly
+    manager = SchoolManager(lazy=True)
+    print(Fore.GREEN + " 🗂️ School Data Loaded Successfully!" + Style.RESET_ALL)
+
+    # menus only request saves; this worker writes them out in the background,
+    # backing up the data file once before its first write
+    autosaver = AutoSaver(manager, backup=True).start()
+
+    # set SMS_STARTUP_REPORT=1 to see where load time goes
+    if os.environ.get('SMS_STARTUP_REPORT'):
+        manager.startup_report()
+
+    # the startup alerts need every student and the attendance loaded, so they
+    # wait until someone goes to log in rather than slowing down the first menu
+    alerts_shown = False
     try:
         while True:
             print("\n--- SCHOOL MANAGEMENT SYSTEM ---\n")
@@ -378,15 +407,14 @@ if __name__ == '__main__':
                 continue
 
             if choice == 1:
+                if not alerts_shown:
+                    manager.show_dashboard_alerts()
+                    alerts_shown = True
                 Login()
             elif choice == 2:
                 print("Exiting program. Goodbye!")
-                if manager.data_changed:
-                    try:
-                        manager.backup_data()
-                    except Exception:
-                        pass
-                    manager.save_data()
+                # flushes anything still pending
+                autosaver.stop()
                 break
             else:
                 print(Fore.RED + "❌ Invalid choice. Please enter 1 or 2." + Style.RESET_ALL)
@@ -394,12 +422,12 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         print("\n" + Fore.YELLOW + "Keyboard interrupt received. Saving data (if changed) and exiting..." + Style.RESET_ALL)
         try:
-            if manager.data_changed:
-                try:
-                    manager.backup_data()
-                except Exception:
-                    pass
-                manager.save_data()
+            autosaver.stop()
         except Exception as e:
             print(Fore.RED + f"❌ Error while saving on exit: {e}")
-        sys.exit(0)
\ No newline at end of file
+        return 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
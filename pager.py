@@ -0,0 +1,178 @@
+# pager.py
+# Paged rendering for the long list views. Records stay raw until they are
+# shown: only the rows of the visible page are formatted (colours, tabulate
+# grid), while sorting and filtering work on the plain column values. Output
+# that isn't a terminal gets a plain tab-separated dump instead of a grid,
+# which is much faster for big schools and easy to pipe.
+
+import sys
+
+from colorama import Fore, Style
+from tabulate import tabulate
+
+PAGE_SIZE = 20
+HELP = "[Enter/n] next  [p] prev  [g N] page  [s COL] sort  [f TEXT | f COL=TEXT] filter  [q] quit"
+
+
+class Column:
+    """A table column: header, value(record) for display/sort/filter, optional color(value) for terminals."""
+
+    __slots__ = ('header', 'value', 'color')
+
+    def __init__(self, header, value, color=None):
+        self.header = header
+        self.value = value
+        self.color = color
+
+
+def _sort_key(value):
+    # numbers sort numerically and before text; text sorts case-insensitively
+    if isinstance(value, (int, float)):
+        return (0, value, '')
+    return (1, 0, str(value).lower())
+
+
+class Pager:
+    """
+    A sortable, filterable view over records that renders one page at a time.
+    sort() and filter() take a column header (case-insensitive).
+    """
+
+    def __init__(self, records, columns, page_size=PAGE_SIZE, tablefmt='fancy_grid'):
+        self.records = records
+        self.columns = columns
+        self.page_size = page_size
+        self.tablefmt = tablefmt
+        self.view = records
+        self.page = 0
+        self.sort_column = None
+        self.reverse = False
+        self.query = ''
+
+    def _column(self, header):
+        header = header.strip().lower()
+        for col in self.columns:
+            if col.header.lower() == header:
+                return col
+        # otherwise a unique prefix will do ('class' for 'Class_Section')
+        matches = [col for col in self.columns if col.header.lower().startswith(header)]
+        if header and len(matches) == 1:
+            return matches[0]
+        raise ValueError(f"Unknown column {header!r}; columns: {', '.join(c.header for c in self.columns)}")
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self.view) // self.page_size)) if self.page_size else 1
+
+    def go(self, page):
+        self.page = min(max(page, 0), self.pages - 1)
+
+    def sort(self, header, reverse=None):
+        """Sort by a column; sorting again by the same column flips the order."""
+        col = self._column(header)
+        if reverse is None:
+            reverse = not self.reverse if col is self.sort_column else False
+        self.sort_column = col
+        self.reverse = reverse
+        self.view = sorted(self.view, key=lambda rec: _sort_key(col.value(rec)), reverse=reverse)
+        self.page = 0
+
+    def filter(self, query):
+        """Keep records with TEXT in any column, or in one column with COL=TEXT; '' clears the filter."""
+        query = query.strip()
+        if not query:
+            self.view = self.records
+        else:
+            if '=' in query:
+                header, text = query.split('=', 1)
+                cols = [self._column(header)]
+            else:
+                text, cols = query, self.columns
+            text = text.strip().lower()
+            self.view = [rec for rec in self.records if any(text in str(c.value(rec)).lower() for c in cols)]
+        self.query = query
+        if self.sort_column is not None:
+            self.sort(self.sort_column.header, self.reverse)
+        self.page = 0
+
+    def window(self):
+        if not self.page_size:
+            return self.view
+        start = self.page * self.page_size
+        return self.view[start:start + self.page_size]
+
+    def format_page(self):
+        table = []
+        for rec in self.window():
+            row = []
+            for col in self.columns:
+                value = col.value(rec)
+                row.append(col.color(value) + str(value) + Style.RESET_ALL if col.color else value)
+            table.append(row)
+        return tabulate(table, [c.header for c in self.columns], tablefmt=self.tablefmt, stralign='center')
+
+    def format_plain(self):
+        """Every record in the view as tab-separated lines, without colours or a grid."""
+        lines = ['\t'.join(c.header for c in self.columns)]
+        values = [c.value for c in self.columns]
+        lines.extend('\t'.join([str(v(rec)) for v in values]) for rec in self.view)
+        return '\n'.join(lines)
+
+    def status(self):
+        text = f"Page {self.page + 1}/{self.pages} · {len(self.view)} of {len(self.records)} rows"
+        if self.sort_column is not None:
+            text += f" · sorted by {self.sort_column.header}{' (desc)' if self.reverse else ''}"
+        if self.query:
+            text += f" · filter: {self.query}"
+        return text
+
+    def command(self, line):
+        """Apply one pager command; returns False when the user quits."""
+        cmd, _, arg = line.strip().partition(' ')
+        cmd = cmd.lower()
+        if cmd in ('', 'n'):
+            if self.page + 1 >= self.pages:
+                return False
+            self.go(self.page + 1)
+        elif cmd == 'p':
+            self.go(self.page - 1)
+        elif cmd == 'g':
+            try:
+                self.go(int(arg) - 1)
+            except ValueError:
+                print(Fore.RED + "❌ Page must be a number.")
+        elif cmd == 's':
+            self.sort(arg)
+        elif cmd == 'f':
+            self.filter(arg)
+        elif cmd == 'q':
+            return False
+        else:
+            print(Fore.RED + f"❌ Unknown command. {HELP}")
+        return True
+
+    def show(self):
+        """
+        Print the view: a plain dump when stdout isn't a terminal, the whole
+        grid when it fits one page, and otherwise one page at a time with
+        commands read from input().
+        """
+        if not sys.stdout.isatty():
+            print(self.format_plain())
+            return
+        if not self.page_size or len(self.view) <= self.page_size or not sys.stdin.isatty():
+            # no paging: the whole view as one grid
+            size, self.page_size = self.page_size, None
+            try:
+                print(self.format_page())
+            finally:
+                self.page_size = size
+            return
+        while True:
+            print(self.format_page())
+            print(Fore.CYAN + self.status())
+            try:
+                if not self.command(input(HELP + "\n> ")):
+                    return
+            except ValueError as e:
+                print(Fore.RED + f"❌ {e}")
@@ -0,0 +1,114 @@
+# search.py
+# N-gram (trigram by default) inverted index for substring search over a few
+# text fields per document, with simple field-weighted ranking.
+
+import heapq
+
+
+class NGramIndex:
+    """
+    doc_id -> lowercased field values, plus gram -> {doc_id} postings.
+    Queries of at least n characters intersect the postings of their grams and
+    then confirm the substring; shorter queries fall back to a scan.
+    """
+
+    def __init__(self, weights, n=3):
+        # one weight per indexed field, in the order fields are passed to add()
+        self.weights = tuple(weights)
+        self.n = n
+        self._docs = {}
+        self._order = {}
+        self._postings = {}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _grams(self, text):
+        n = self.n
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def add(self, doc_id, fields):
+        """Index (or re-index) a document; fields are strings in weight order."""
+        values = tuple((str(v) if v is not None else '').lower() for v in fields)
+        old = self._docs.get(doc_id)
+        if old == values:
+            return
+        if old is not None:
+            self._drop_postings(doc_id, old)
+        else:
+            self._order[doc_id] = self._seq
+            self._seq += 1
+        self._docs[doc_id] = values
+        postings = self._postings
+        for value in values:
+            for gram in self._grams(value):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    postings[gram] = {doc_id}
+                else:
+                    bucket.add(doc_id)
+
+    def remove(self, doc_id):
+        old = self._docs.pop(doc_id, None)
+        if old is not None:
+            self._drop_postings(doc_id, old)
+            del self._order[doc_id]
+
+    def _drop_postings(self, doc_id, values):
+        postings = self._postings
+        for value in values:
+            for gram in self._grams(value):
+                bucket = postings.get(gram)
+                if bucket is not None:
+                    bucket.discard(doc_id)
+                    if not bucket:
+                        del postings[gram]
+
+    def _candidates(self, query):
+        if len(query) < self.n:
+            return self._docs.keys()
+        buckets = []
+        for gram in self._grams(query):
+            bucket = self._postings.get(gram)
+            if not bucket:
+                return ()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        result = set(buckets[0])
+        for bucket in buckets[1:]:
+            result &= bucket
+            if not result:
+                break
+        return result
+
+    def _score(self, query, values):
+        best = 0
+        for weight, value in zip(self.weights, values):
+            if query not in value:
+                continue
+            if value == query:
+                score = 3 * weight
+            elif value.startswith(query):
+                score = 2 * weight
+            else:
+                score = weight
+            if score > best:
+                best = score
+        return best
+
+    def search(self, query, limit=None):
+        """Return doc ids containing query in any field, best matches first."""
+        query = (query or '').strip().lower()
+        if not query:
+            return []
+        scored = []
+        for doc_id in self._candidates(query):
+            score = self._score(query, self._docs[doc_id])
+            if score:
+                scored.append((-score, self._order[doc_id], doc_id))
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored)
+        else:
+            scored.sort()
+        return [doc_id for _, _, doc_id in scored]
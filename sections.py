@@ -0,0 +1,79 @@
+# sections.py
+# Class-section index: normalized class name -> the students in it, so that
+# per-class views and reports look up one group instead of filtering every
+# student and normalizing every class_section on every query.
+
+
+def class_key(class_section):
+    """'10-A ', '10-a' -> '10-a'."""
+    return str(class_section or '').strip().lower()
+
+
+class SectionIndex:
+    """
+    class_key -> {student_id: student}. Members come back in the order the
+    students were first added, which is list order when the index is built
+    from manager.students.
+    """
+
+    def __init__(self):
+        self._groups = {}
+        # student_id -> (order, class_key)
+        self._placed = {}
+        self._seq = 0
+        # groups a student moved into; re-sorted into order on their next read
+        self._unsorted = set()
+
+    def __len__(self):
+        return len(self._groups)
+
+    def __contains__(self, key):
+        return bool(self._groups.get(class_key(key)))
+
+    def add(self, stu):
+        """Add a student, or move them after their class_section changed."""
+        sid = stu.get_student_id()
+        key = class_key(stu.class_section)
+        placed = self._placed.get(sid)
+        if placed is None:
+            order = self._seq
+            self._seq += 1
+        else:
+            order, old_key = placed
+            if old_key != key:
+                self._discard(old_key, sid)
+                self._unsorted.add(key)
+        self._groups.setdefault(key, {})[sid] = stu
+        self._placed[sid] = (order, key)
+
+    def remove(self, student_id):
+        placed = self._placed.pop(student_id, None)
+        if placed is not None:
+            self._discard(placed[1], student_id)
+
+    def _discard(self, key, student_id):
+        group = self._groups[key]
+        del group[student_id]
+        if not group:
+            del self._groups[key]
+            self._unsorted.discard(key)
+
+    def _group(self, key):
+        group = self._groups.get(key)
+        if group is not None and key in self._unsorted:
+            placed = self._placed
+            group = dict(sorted(group.items(), key=lambda item: placed[item[0]][0]))
+            self._groups[key] = group
+            self._unsorted.discard(key)
+        return group or {}
+
+    def students(self, class_section):
+        """Students in a class, matched case- and whitespace-insensitively."""
+        return list(self._group(class_key(class_section)).values())
+
+    def count(self, class_section):
+        return len(self._groups.get(class_key(class_section), ()))
+
+    def groups(self):
+        """[(class_key, [students])] sorted by class."""
+        return [(key, list(self._group(key).values())) for key in sorted(self._groups)]
@@ -0,0 +1,414 @@
+# service.py
+# Non-interactive service layer over SchoolManager: typed operations that take
+# plain values instead of prompting, validate everything up front, and save
+# once per call (or once per batch() block). The CLI menus in classes.py are
+# thin wrappers over these methods.
+
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+from classes import SchoolManager, Student, Teacher, is_valid_class_section, is_valid_email, is_valid_phone
+
+STATUS_ALIASES = {'p': 'Present', 'present': 'Present', 'a': 'Absent', 'absent': 'Absent'}
+
+
+def locked(method):
+    """Run a mutating operation under manager.lock so an autosave never sees it half done."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.manager.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SchoolService:
+    """
+    Scriptable operations on a SchoolManager.
+
+    Invalid input (unknown ids, bad phone/email/class, out-of-range marks)
+    raises ValueError before anything is modified, so a failed batch leaves
+    the school untouched. With autosave=True each call saves once at the end;
+    inside ``with service.batch():`` the save happens when the block exits.
+    """
+
+    def __init__(self, manager=None, autosave=True):
+        self.manager = manager if manager is not None else SchoolManager()
+        self.autosave = autosave
+        self._batch_depth = 0
+        self._data_dirty = False
+        self._attendance_dirty = False
+
+    # ---- saving ----
+    @contextmanager
+    def batch(self):
+        """Group several calls into a single save."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit()
+
+    def _touched(self, data=True, attendance=False):
+        self._data_dirty = self._data_dirty or data
+        self._attendance_dirty = self._attendance_dirty or attendance
+        if self._batch_depth == 0:
+            self._commit()
+
+    def _commit(self):
+        if not self.autosave:
+            return
+        if self._attendance_dirty:
+            self.manager.save_attendance()
+        if self._data_dirty:
+            self.manager.save_data()
+        self._data_dirty = self._attendance_dirty = False
+
+    # ---- validation helpers ----
+    def _student(self, student_id):
+        stu = self.manager.find_student_by_id(student_id)
+        if stu is None:
+            raise ValueError(f"Student {student_id} not found.")
+        return stu
+
+    def _exam(self, exam_id):
+        exam = self.manager.find_exam_by_id(exam_id)
+        if exam is None:
+            raise ValueError(f"Exam {exam_id} not found.")
+        return exam
+
+    @staticmethod
+    def _check_contact(phone, email):
+        if phone and not is_valid_phone(phone):
+            raise ValueError(f"Invalid phone {phone!r}, must be 10 digits.")
+        if email and not is_valid_email(email):
+            raise ValueError(f"Invalid email {email!r}.")
+
+    @staticmethod
+    def _check_date(date_str):
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid date {date_str!r}, expected YYYY-MM-DD.") from None
+
+    @staticmethod
+    def _check_marks(subject, mark, max_marks=100.0):
+        try:
+            mark = float(mark)
+        except (TypeError, ValueError):
+            raise ValueError(f"Marks for {subject} must be a number.") from None
+        if mark < 0 or mark > max_marks:
+            raise ValueError(f"Marks for {subject} must be between 0 and {max_marks}.")
+        return mark
+
+    def _claim_ids(self, kind, records):
+        """Ids for a batch: given ids are checked and claimed, the rest come from one reserved block."""
+        allocator = self.manager._id_allocators[kind]
+        find = self.manager.find_student_by_id if kind == 'student' else self.manager.find_teacher_id
+        seen = set()
+        for rec in records:
+            given = rec[f'{kind}_id']
+            if given:
+                if given in seen or find(given) is not None:
+                    raise ValueError(f"{kind.capitalize()} {given} already exists.")
+                seen.add(given)
+        for given in seen:
+            allocator.observe(given)
+        new_ids = iter(self.manager.reserve_ids(kind, sum(1 for rec in records if not rec[f'{kind}_id'])))
+        return [rec[f'{kind}_id'] or next(new_ids) for rec in records]
+
+    # ---- students ----
+    def _student_record(self, rec):
+        name = (rec.get('name') or '').strip()
+        if not name:
+            raise ValueError("Student name is required.")
+        phone = (rec.get('phone') or '').strip()
+        email = (rec.get('email') or '').strip()
+        self._check_contact(phone, email)
+        class_section = (rec.get('class_section') or 'N/A').strip()
+        if class_section != 'N/A' and not is_valid_class_section(class_section):
+            raise ValueError(f"Invalid class-section {class_section!r}, format: 10-A.")
+        marks = {subject: self._check_marks(subject, mark) for subject, mark in (rec.get('marks') or {}).items()}
+        try:
+            paid_amount = float(rec.get('paid_amount') or 0.0)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid paid amount for {name}.") from None
+        return {
+            'student_id': (rec.get('student_id') or '').strip(),
+            'name': name,
+            'contact': {'Phone': phone, 'Email': email},
+            'class_section': class_section,
+            'marks': marks,
+            'fee_status': rec.get('fee_status') or 'Pending',
+            'paid_amount': paid_amount,
+        }
+
+    @locked
+    def add_students(self, records):
+        """
+        Add many students with one save. Each record is a dict with 'name' and
+        optionally 'student_id', 'phone', 'email', 'class_section', 'marks',
+        'fee_status' and 'paid_amount'. Returns the new Student objects.
+        """
+        records = [self._student_record(rec) for rec in records]
+        ids = self._claim_ids('student', records)
+        m = self.manager
+        added = []
+        for rec, student_id in zip(records, ids):
+            stu = Student(rec['name'], rec['contact'], student_id)
+            stu.class_section = rec['class_section']
+            stu.marks = rec['marks']
+            stu.fee_status = rec['fee_status']
+            stu.paid_amount = rec['paid_amount']
+            m.students.append(stu)
+            m._register_student(stu)
+            m.mark_changed('student', student_id)
+            added.append(stu)
+        if added:
+            self._touched()
+        return added
+
+    def add_student(self, name, phone='', email='', class_section='N/A', student_id=None, marks=None):
+        return self.add_students([{'name': name, 'phone': phone, 'email': email, 'class_section': class_section,
+                                   'student_id': student_id, 'marks': marks}])[0]
+
+    @locked
+    def update_student(self, student_id, name=None, phone=None, email=None, class_section=None):
+        """Change the given fields of a student; None leaves a field as it is."""
+        stu = self._student(student_id)
+        self._check_contact(phone, email)
+        if class_section and not is_valid_class_section(class_section):
+            raise ValueError(f"Invalid class-section {class_section!r}, format: 10-A.")
+        if name:
+            stu.name = name
+        if phone:
+            stu.contact_info['Phone'] = phone
+        if email:
+            stu.contact_info['Email'] = email
+        if class_section:
+            stu.class_section = class_section
+        self.manager._refresh_student(stu)
+        self.manager.mark_changed('student', student_id)
+        self._touched()
+        return stu
+
+    @locked
+    def delete_student(self, student_id):
+        stu = self._student(student_id)
+        m = self.manager
+        m.students.remove(stu)
+        m._unregister_student(stu)
+        m.mark_changed('student', student_id)
+        # their attendance goes too, so school-wide counters and rollups stop counting them
+        dates = m.attendance.clear_student(student_id)
+        for date_str in dates:
+            m.mark_changed('attendance', date_str)
+        self._touched(attendance=bool(dates))
+        return stu
+
+    @locked
+    def set_marks(self, student_id, marks):
+        """Add or update subject -> mark (0-100) entries for one student."""
+        stu = self._student(student_id)
+        marks = {subject: self._check_marks(subject, mark) for subject, mark in marks.items()}
+        for subject, mark in marks.items():
+            stu.marks[subject] = mark
+        self.manager.mark_changed('student', student_id)
+        self._touched()
+        return stu
+
+    # ---- teachers ----
+    def _teacher_record(self, rec):
+        name = (rec.get('name') or '').strip()
+        if not name:
+            raise ValueError("Teacher name is required.")
+        phone = (rec.get('phone') or '').strip()
+        email = (rec.get('email') or '').strip()
+        self._check_contact(phone, email)
+        return {
+            'teacher_id': (rec.get('teacher_id') or '').strip(),
+            'name': name,
+            'contact': {'Phone': phone, 'Email': email},
+            'role': (rec.get('role') or 'Teacher').strip() or 'Teacher',
+            'subjects': [s.strip() for s in rec.get('subjects') or [] if s and s.strip()],
+        }
+
+    @locked
+    def add_teachers(self, records):
+        """
+        Add many teachers with one save. Each record is a dict with 'name' and
+        optionally 'teacher_id', 'phone', 'email', 'role' and 'subjects'.
+        """
+        records = [self._teacher_record(rec) for rec in records]
+        ids = self._claim_ids('teacher', records)
+        m = self.manager
+        added = []
+        for rec, teacher_id in zip(records, ids):
+            teacher = Teacher(rec['name'], rec['contact'], teacher_id, rec['subjects'])
+            teacher.role_description = rec['role']
+            m.teachers.append(teacher)
+            m._register_teacher(teacher)
+            m.mark_changed('teacher', teacher_id)
+            added.append(teacher)
+        if added:
+            self._touched()
+        return added
+
+    def add_teacher(self, name, phone='', email='', role='Teacher', subjects=None, teacher_id=None):
+        return self.add_teachers([{'name': name, 'phone': phone, 'email': email, 'role': role,
+                                   'subjects': subjects, 'teacher_id': teacher_id}])[0]
+
+    # ---- attendance ----
+    @locked
+    def record_attendance(self, date_str, statuses):
+        """
+        Record student_id -> status for one date. Status may be 'Present'/'Absent'
+        or 'P'/'A' (any case). Returns the number of records written.
+        """
+        self._check_date(date_str)
+        normalized = {}
+        for sid, status in statuses.items():
+            self._student(sid)
+            norm = STATUS_ALIASES.get(str(status).strip().lower())
+            if norm is None:
+                raise ValueError(f"Invalid status {status!r} for {sid}, use Present/Absent.")
+            normalized[sid] = norm
+        m = self.manager
+        for sid, status in normalized.items():
+            m.set_attendance(date_str, sid, status)
+        if normalized:
+            m.mark_changed('attendance', date_str)
+            self._touched(data=False, attendance=True)
+        return len(normalized)
+
+    # ---- exams ----
+    @locked
+    def create_exam(self, class_name, subject, exam_name='', date='', max_marks=100.0, allow_bonus=False,
+                    exam_id=None):
+        """
+        Add an exam. Unlike the old menu, max_marks must be a positive number
+        and a given exam_id must be new; an exam that breaks either rule could
+        not be graded or looked up. Exams already in the data file are loaded
+        as they are.
+        """
+        m = self.manager
+        try:
+            max_marks = float(max_marks)
+        except (TypeError, ValueError):
+            raise ValueError("Maximum marks must be a number.") from None
+        if max_marks <= 0:
+            raise ValueError("Maximum marks must be positive.")
+        if exam_id and m.find_exam_by_id(exam_id):
+            raise ValueError(f"Exam {exam_id} already exists.")
+        exam = {
+            'exam_id': exam_id or m.generate_exam_id(),
+            'exam_name': exam_name,
+            'class': class_name,
+            'subject': subject,
+            'date': date,
+            'max_marks': max_marks,
+            'allow_bonus': bool(allow_bonus),
+            'results': {}
+        }
+        m.exams.append(exam)
+        m._register_exam(exam)
+        m.mark_changed('exam', exam['exam_id'])
+        self._touched()
+        return exam
+
+    @locked
+    def record_exam_results(self, exam_id, results):
+        """
+        Record student_id -> marks for one exam. A value is the marks, a
+        (marks, bonus) pair, or a {'marks': .., 'bonus': ..} dict. Students
+        must belong to the exam's class. Returns the number of results written.
+        """
+        exam = self._exam(exam_id)
+        max_marks = float(exam.get('max_marks', 100) or 100)
+        allow_bonus = bool(exam.get('allow_bonus', False))
+        exam_class = (exam.get('class') or '').strip().lower()
+        entries = {}
+        for sid, value in results.items():
+            stu = self._student(sid)
+            if exam_class and stu.class_section.strip().lower() != exam_class:
+                raise ValueError(f"Student {sid} is not in class {exam.get('class')}.")
+            if isinstance(value, dict):
+                marks, bonus = value.get('marks'), value.get('bonus') or 0.0
+            elif isinstance(value, (tuple, list)):
+                marks, bonus = value
+            else:
+                marks, bonus = value, 0.0
+            marks = self._check_marks(exam.get('subject') or exam_id, marks, max_marks)
+            try:
+                bonus = float(bonus or 0.0)
+            except (TypeError, ValueError):
+                raise ValueError(f"Bonus for {sid} must be a number.") from None
+            if bonus < 0:
+                raise ValueError(f"Bonus for {sid} cannot be negative.")
+            if bonus and not allow_bonus:
+                raise ValueError(f"Exam {exam_id} does not allow bonus marks.")
+            entries[sid] = {'marks': marks, 'bonus': bonus}
+        if not isinstance(exam.get('results'), dict):
+            exam['results'] = {}
+        m = self.manager
+        for sid, entry in entries.items():
+            exam['results'][sid] = entry
+            m._index_result(exam, sid)
+        if entries:
+            m.mark_changed('exam', exam_id)
+            self._touched()
+        return len(entries)
+
+    # ---- fees ----
+    def _apply_payment(self, stu, amount, date, method):
+        m = self.manager
+        if amount is None:
+            stu.fee_status = 'Paid'
+        else:
+            stu.paid_amount = float(stu.paid_amount or 0.0) + amount
+            m.add_fee_transaction({'student_id': stu.get_student_id(), 'amount': amount,
+                                   'date': date or datetime.now().strftime("%Y-%m-%d"), 'method': method})
+            class_fee = m.fee_structure.get(stu.class_section)
+            try:
+                settled = class_fee is None or stu.paid_amount >= float(class_fee or 0.0)
+            except (TypeError, ValueError):
+                settled = True
+            if settled:
+                stu.fee_status = 'Paid'
+        m._refresh_student(stu)
+        m.mark_changed('student', stu.get_student_id())
+
+    @locked
+    def pay_fees(self, payments):
+        """
+        Record many payments with one save. Each payment is a dict with
+        'student_id' and optionally 'amount', 'date' and 'method'.
+        """
+        checked = []
+        for p in payments:
+            stu = self._student(p.get('student_id'))
+            amount = p.get('amount')
+            if amount is not None:
+                try:
+                    amount = float(amount)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid amount for {p.get('student_id')}.") from None
+                if amount <= 0:
+                    raise ValueError(f"Amount for {p.get('student_id')} must be positive.")
+            checked.append((stu, amount, p.get('date'), p.get('method') or 'Cash'))
+        for stu, amount, date, method in checked:
+            self._apply_payment(stu, amount, date, method)
+        if checked:
+            self._touched()
+        return len(checked)
+
+    def pay_fee(self, student_id, amount=None, date=None, method='Cash'):
+        """
+        Record a payment. Without an amount the fee is simply marked paid;
+        with one it is added to paid_amount, logged as a fee transaction, and
+        the status becomes Paid once the class fee (if any) is covered.
+        """
+        self.pay_fees([{'student_id': student_id, 'amount': amount, 'date': date, 'method': method}])
+        return self._student(student_id)
@@ -0,0 +1,226 @@
+# snapshot.py
+# Binary snapshot of school_data: the same content as school_data.json, stored
+# column by column (one list or array per field) and pickled with protocol 5.
+# Numeric columns travel as out-of-band buffers, repeated strings (class
+# sections, fee statuses, subject lists) as small tables plus index arrays, and
+# records are already normalized, so loading skips the per-record clean-up that
+# the JSON path does. JSON stays the interchange format:
+#
+#   python snapshot.py school_data.json school_data.bin     # JSON -> snapshot
+#   python snapshot.py school_data.bin school_data.json     # snapshot -> JSON
+#
+# SchoolManager reads and writes this format when its data file ends in .bin.
+
+import json
+import os
+import pickle
+import struct
+from array import array
+
+from compact import intern_str, subject_tuple
+
+MAGIC = b'SMSSNAP'
+VERSION = 1
+# MAGIC, version byte, then <IQ: buffer count, pickle length; one <Q length per
+# buffer; the pickle stream; and finally the raw buffers back to back.
+HEADER = struct.Struct('<IQ')
+
+META_KEYS = ('last_student_id', 'last_teacher_id', 'last_admin_id', 'last_exam_id')
+
+
+def _table(values):
+    """(distinct values, array of indexes into them) for a column with few distinct values."""
+    index = {}
+    codes = array('I', [index.setdefault(v, len(index)) for v in values])
+    return list(index), codes
+
+
+def _buffer(arr):
+    return pickle.PickleBuffer(arr)
+
+
+def _array(typecode, buf):
+    arr = array(typecode)
+    arr.frombytes(buf)
+    return arr
+
+
+def _student_columns(students):
+    marks = array('d')
+    for stu in students:
+        marks.extend(stu._mark_values)
+    subjects, subject_codes = _table(stu._mark_subjects for stu in students)
+    classes, class_codes = _table(stu._class_section for stu in students)
+    statuses, status_codes = _table(stu._fee_status for stu in students)
+    return {
+        'ids': [stu.get_student_id() for stu in students],
+        'names': [stu.name for stu in students],
+        'phones': [stu._phone for stu in students],
+        'emails': [stu._email for stu in students],
+        # only the few records with extra contact keys
+        'contact_extra': {i: stu._contact_extra for i, stu in enumerate(students) if stu._contact_extra},
+        # marks kept as given (ints, strings), see compact.MarksView
+        'mark_extra': {i: stu._mark_extra for i, stu in enumerate(students) if stu._mark_extra},
+        'passwords': [stu._password for stu in students],
+        'paid': _buffer(array('d', [stu.paid_amount for stu in students])),
+        'subjects': subjects,
+        'subject_codes': _buffer(subject_codes),
+        'marks': _buffer(marks),
+        'classes': classes,
+        'class_codes': _buffer(class_codes),
+        'statuses': statuses,
+        'status_codes': _buffer(status_codes),
+    }
+
+
+def _teacher_columns(teachers):
+    subjects, subject_codes = _table(tuple(t.subject_assigned) for t in teachers)
+    roles, role_codes = _table(t._role_description for t in teachers)
+    return {
+        'ids': [t.get_teacher_id() for t in teachers],
+        'names': [t.name for t in teachers],
+        'phones': [t._phone for t in teachers],
+        'emails': [t._email for t in teachers],
+        'contact_extra': {i: t._contact_extra for i, t in enumerate(teachers) if t._contact_extra},
+        'passwords': [t._password for t in teachers],
+        'subjects': subjects,
+        'subject_codes': _buffer(subject_codes),
+        'roles': roles,
+        'role_codes': _buffer(role_codes),
+    }
+
+
+def dump(manager, filename):
+    """Write manager's data (everything school_data.json holds) as a snapshot."""
+    payload = {meta: getattr(manager, meta) for meta in META_KEYS}
+    payload.update({
+        'students': _student_columns(manager.students),
+        'teachers': _teacher_columns(manager.teachers),
+        'admins': manager.admins,
+        'exams': manager.exams,
+        'fee_structure': manager.fee_structure,
+        'fee_transactions': manager.fee_transactions,
+    })
+    buffers = []
+    stream = pickle.dumps(payload, protocol=5, buffer_callback=buffers.append)
+    raws = [buf.raw() for buf in buffers]
+    with open(filename, 'wb') as f:
+        f.write(MAGIC + bytes([VERSION]))
+        f.write(HEADER.pack(len(raws), len(stream)))
+        f.write(b''.join(struct.pack('<Q', raw.nbytes) for raw in raws))
+        f.write(stream)
+        for raw in raws:
+            f.write(raw)
+
+
+def load(filename):
+    """Read a snapshot back into its payload dict (columns for students and teachers)."""
+    with open(filename, 'rb') as f:
+        buf = f.read()
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filename} is not a school data snapshot")
+    version = buf[len(MAGIC)]
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    pos = len(MAGIC) + 1
+    n_buffers, stream_size = HEADER.unpack_from(buf, pos)
+    pos += HEADER.size
+    sizes = struct.unpack_from(f'<{n_buffers}Q', buf, pos)
+    pos += 8 * n_buffers
+    view = memoryview(buf)
+    stream = view[pos:pos + stream_size]
+    pos += stream_size
+    buffers = []
+    for size in sizes:
+        buffers.append(view[pos:pos + size])
+        pos += size
+    return pickle.loads(stream, buffers=buffers)
+
+
+def build_students(cols, student_cls):
+    """Student objects straight from the columns, skipping the JSON normalization."""
+    subjects = [subject_tuple(s) for s in cols['subjects']]
+    classes = [intern_str(c) for c in cols['classes']]
+    statuses = [intern_str(s) for s in cols['statuses']]
+    paid = _array('d', cols['paid'])
+    marks = _array('d', cols['marks'])
+    extra = cols['contact_extra']
+    new = student_cls.__new__
+    students = []
+    pos = 0
+    rows = zip(cols['ids'], cols['names'], cols['phones'], cols['emails'], cols['passwords'], paid,
+               _array('I', cols['subject_codes']), _array('I', cols['class_codes']),
+               _array('I', cols['status_codes']))
+    for student_id, name, phone, email, password, paid_amount, subject_code, class_code, status_code in rows:
+        stu = new(student_cls)
+        stu.name = name
+        stu.role = 'Student'
+        stu._phone = phone
+        stu._email = email
+        stu._contact_extra = None
+        stu._password = password
+        stu.set_student_id(student_id)
+        mark_subjects = subjects[subject_code]
+        stu._mark_subjects = mark_subjects
+        end = pos + len(mark_subjects)
+        stu._mark_values = marks[pos:end]
+        stu._mark_extra = None
+        pos = end
+        stu.paid_amount = paid_amount
+        stu._class_section = classes[class_code]
+        stu._fee_status = statuses[status_code]
+        students.append(stu)
+    for i, contact in extra.items():
+        students[i]._contact_extra = contact
+    # snapshots written before marks kept their original type have none
+    for i, kept in cols.get('mark_extra', {}).items():
+        students[i]._mark_extra = kept
+    return students
+
+
+def build_teachers(cols, teacher_cls):
+    subjects = [[intern_str(s) for s in group] for group in cols['subjects']]
+    roles = [intern_str(r) for r in cols['roles']]
+    new = teacher_cls.__new__
+    teachers = []
+    rows = zip(cols['ids'], cols['names'], cols['phones'], cols['emails'], cols['passwords'],
+               _array('I', cols['subject_codes']), _array('I', cols['role_codes']))
+    for teacher_id, name, phone, email, password, subject_code, role_code in rows:
+        teacher = new(teacher_cls)
+        teacher.name = name
+        teacher.role = 'Teacher'
+        teacher._phone = phone
+        teacher._email = email
+        teacher._contact_extra = None
+        teacher._password = password
+        teacher.set_teacher_id(teacher_id)
+        teacher.subject_assigned = list(subjects[subject_code])
+        teacher._role_description = roles[role_code]
+        teachers.append(teacher)
+    for i, contact in cols['contact_extra'].items():
+        teachers[i]._contact_extra = contact
+    return teachers
+
+
+def convert(source, target):
+    """Convert between school_data.json and a .bin snapshot; the direction follows the file names."""
+    from classes import SchoolManager
+
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    manager = SchoolManager(source, lazy=True)
+    if target.endswith('.bin'):
+        dump(manager, target)
+    else:
+        with open(target, 'w') as f:
+            json.dump(manager._snapshot_dict(), f, indent=4)
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) == 3:
+        convert(sys.argv[1], sys.argv[2])
+        print(f"Converted {sys.argv[1]} into {sys.argv[2]}")
+    else:
+        print("usage: python snapshot.py SOURCE TARGET   (a .bin name means snapshot, anything else JSON)")
@@ -0,0 +1,449 @@
+# storage.py
+# Persistence helpers for SchoolManager:
+# - append-only journal of per-record changes replayed on top of the JSON snapshot
+# - SQLite backend that writes only touched rows, plus a one-shot JSON migration
+
+import json
+import os
+import sqlite3
+
+# kind -> (list key in school_data.json, id field of each record)
+LIST_KINDS = {
+    'student': ('students', 'student_id'),
+    'teacher': ('teachers', 'teacher_id'),
+    'admin': ('admins', 'admin_id'),
+    'exam': ('exams', 'exam_id'),
+}
+
+
+def _record_key(kind, record):
+    field = LIST_KINDS[kind][1]
+    if kind == 'admin':
+        return record.get(field) or record.get('admin-id')
+    return record.get(field)
+
+
+def _result_extra(result):
+    # keys of an exam result besides marks and bonus, as JSON (None when there are none)
+    extra = {k: v for k, v in result.items() if k not in ('marks', 'bonus')}
+    return json.dumps(extra) if extra else None
+
+
+class Journal:
+    """
+    Append-only write-ahead log next to the data file.
+    One JSON object per line: {'op': 'put'|'del'|'meta', 'kind': ..., 'key': ..., 'data': ...}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.torn_path = path + '.torn'
+        self.count = self._count_lines()
+        # byte offset of the first unreadable line found by read(), if any
+        self.torn_at = None
+
+    def _count_lines(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+
+    def has_records(self):
+        return self.count > 0
+
+    def append(self, records):
+        if not records:
+            return
+        if self.torn_at is not None:
+            self.set_aside_torn()
+        lines = ''.join(json.dumps(r, separators=(',', ':')) + '\n' for r in records)
+        if not self._ends_with_newline():
+            # never glue a record onto a torn line left by a crash
+            lines = '\n' + lines
+        with open(self.path, 'a') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.count += len(records)
+
+    def _ends_with_newline(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return True
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def truncate(self):
+        if self.torn_at is not None:
+            self.set_aside_torn()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.count = 0
+
+    def read(self):
+        """
+        (records, torn_at): every readable record in order, and the byte offset
+        of the first line that couldn't be parsed (a crash mid-append), or None.
+        Torn lines are skipped so they can't hide later records; the file itself
+        is left alone until the next write, which moves them to torn_path.
+        """
+        self.torn_at = None
+        if not os.path.exists(self.path):
+            return [], None
+        records = []
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                start, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    if self.torn_at is None:
+                        self.torn_at = start
+        return records, self.torn_at
+
+    def set_aside_torn(self):
+        """Move the unreadable lines to torn_path and keep the good ones in the journal."""
+        good = []
+        torn = []
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    json.loads(line)
+                    kept = good
+                except ValueError:
+                    kept = torn
+                kept.append(line if line.endswith(b'\n') else line + b'\n')
+        with open(self.torn_path, 'ab') as f:
+            f.writelines(torn)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.writelines(good)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.count = len(good)
+        self.torn_at = None
+
+    def replay(self, data):
+        """Apply journal records onto the raw snapshot dict in place. Returns records applied."""
+        records, _ = self.read()
+        if not records:
+            return 0
+
+        positions = {}
+        fee_positions = None
+
+        def position_map(kind):
+            if kind not in positions:
+                list_key = LIST_KINDS[kind][0]
+                items = data.get(list_key) or []
+                data[list_key] = items
+                positions[kind] = {_record_key(kind, r): i for i, r in enumerate(items) if r is not None}
+            return positions[kind]
+
+        for rec in records:
+            op = rec.get('op')
+            kind = rec.get('kind')
+            key = rec.get('key')
+            if op == 'meta':
+                data.update(rec.get('data') or {})
+            elif kind in LIST_KINDS:
+                pos = position_map(kind)
+                items = data[LIST_KINDS[kind][0]]
+                if op == 'put':
+                    if key in pos:
+                        items[pos[key]] = rec.get('data')
+                    else:
+                        pos[key] = len(items)
+                        items.append(rec.get('data'))
+                elif op == 'del' and key in pos:
+                    items[pos.pop(key)] = None
+            elif kind == 'fee_structure':
+                structure = data.setdefault('fee_structure', {})
+                if op == 'put':
+                    structure[key] = rec.get('data')
+                else:
+                    structure.pop(key, None)
+            elif kind == 'fee_transaction':
+                # keyed by the transaction's seq; older snapshots without one used the position
+                txns = data.setdefault('fee_transactions', [])
+                if fee_positions is None:
+                    fee_positions = {t.get('seq', i): i for i, t in enumerate(txns) if t is not None}
+                if op == 'put':
+                    if key in fee_positions:
+                        txns[fee_positions[key]] = rec.get('data')
+                    else:
+                        fee_positions[key] = len(txns)
+                        txns.append(rec.get('data'))
+                elif op == 'del' and key in fee_positions:
+                    txns[fee_positions.pop(key)] = None
+
+        # drop deleted slots
+        for kind in positions:
+            list_key = LIST_KINDS[kind][0]
+            data[list_key] = [r for r in data[list_key] if r is not None]
+        if fee_positions is not None:
+            data['fee_transactions'] = [t for t in data['fee_transactions'] if t is not None]
+        return len(records)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS students (student_id TEXT PRIMARY KEY, class_section TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_students_class_section ON students(class_section);
+CREATE TABLE IF NOT EXISTS teachers (teacher_id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS admins (admin_id TEXT PRIMARY KEY, username TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS exams (exam_id TEXT PRIMARY KEY, class_section TEXT, date TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_exams_class_section ON exams(class_section);
+CREATE INDEX IF NOT EXISTS idx_exams_date ON exams(date);
+CREATE TABLE IF NOT EXISTS exam_results (
+    exam_id TEXT NOT NULL, student_id TEXT NOT NULL, marks REAL, bonus REAL, extra TEXT,
+    PRIMARY KEY (exam_id, student_id)
+);
+CREATE INDEX IF NOT EXISTS idx_exam_results_student_id ON exam_results(student_id);
+CREATE TABLE IF NOT EXISTS attendance (
+    date TEXT NOT NULL, student_id TEXT NOT NULL, status TEXT NOT NULL,
+    PRIMARY KEY (date, student_id)
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_student_id ON attendance(student_id);
+CREATE TABLE IF NOT EXISTS fee_structure (class_section TEXT PRIMARY KEY, amount TEXT);
+CREATE TABLE IF NOT EXISTS fee_transactions (
+    seq INTEGER PRIMARY KEY, student_id TEXT, amount REAL, date TEXT, method TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_fee_transactions_student_id ON fee_transactions(student_id);
+CREATE INDEX IF NOT EXISTS idx_fee_transactions_date ON fee_transactions(date);
+"""
+
+META_KEYS = ('last_student_id', 'last_teacher_id', 'last_admin_id', 'last_exam_id')
+
+
+class SQLiteStorage:
+    """
+    SQLite backend for SchoolManager(storage=...).
+    save_data only writes the rows named in manager._pending_changes, and
+    save_attendance only the dates in manager._pending_attendance.
+    """
+
+    def __init__(self, path='school_data.db'):
+        self.path = path
+        # the autosave worker writes from its own thread (serialized by manager.lock)
+        self._connect()
+
+    def _connect(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(exam_results)")}
+        if 'extra' not in columns:
+            # databases from before result keys other than marks/bonus were kept
+            self.conn.execute("ALTER TABLE exam_results ADD COLUMN extra TEXT")
+
+    def close(self):
+        self.conn.close()
+
+    def set_aside(self, suffix):
+        """Rename the database file to path + suffix and start an empty one; returns the new name."""
+        self.conn.close()
+        kept = self.path + suffix
+        os.replace(self.path, kept)
+        self._connect()
+        return kept
+
+    def is_empty(self):
+        return self.conn.execute("SELECT COUNT(*) FROM meta").fetchone()[0] == 0
+
+    # ---- loading ----
+    def load_data(self):
+        """Return a dict shaped like school_data.json, or None when the database is empty."""
+        if self.is_empty():
+            return None
+        cur = self.conn.cursor()
+        data = {k: int(v) for k, v in cur.execute("SELECT key, value FROM meta") if k in META_KEYS}
+        data['students'] = [json.loads(row[0]) for row in cur.execute("SELECT data FROM students ORDER BY rowid")]
+        data['teachers'] = [json.loads(row[0]) for row in cur.execute("SELECT data FROM teachers ORDER BY rowid")]
+        data['admins'] = [json.loads(row[0]) for row in cur.execute("SELECT data FROM admins ORDER BY rowid")]
+
+        exams = []
+        by_id = {}
+        for (raw,) in cur.execute("SELECT data FROM exams ORDER BY rowid"):
+            ex = json.loads(raw)
+            ex['results'] = {}
+            by_id[ex.get('exam_id')] = ex
+            exams.append(ex)
+        for exam_id, student_id, marks, bonus, extra in cur.execute(
+                "SELECT exam_id, student_id, marks, bonus, extra FROM exam_results ORDER BY rowid"):
+            if exam_id in by_id:
+                result = {'marks': marks, 'bonus': bonus}
+                if extra:
+                    result.update(json.loads(extra))
+                by_id[exam_id]['results'][student_id] = result
+        data['exams'] = exams
+
+        data['fee_structure'] = {cls: json.loads(amount) for cls, amount in
+                                 cur.execute("SELECT class_section, amount FROM fee_structure")}
+        data['fee_transactions'] = [
+            {'student_id': sid, 'amount': amount, 'date': date, 'method': method, 'seq': seq}
+            for seq, sid, amount, date, method in
+            cur.execute("SELECT seq, student_id, amount, date, method FROM fee_transactions ORDER BY seq")
+        ]
+        return data
+
+    def load_attendance(self):
+        attendance = {}
+        for date, sid, status in self.conn.execute(
+                "SELECT date, student_id, status FROM attendance ORDER BY date, rowid"):
+            attendance.setdefault(date, {})[sid] = status
+        return attendance
+
+    # ---- row writers ----
+    def _put_student(self, stu):
+        self.conn.execute(
+            "INSERT INTO students (student_id, class_section, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(student_id) DO UPDATE SET class_section=excluded.class_section, data=excluded.data",
+            (stu.get_student_id(), stu.class_section, json.dumps(stu.to_dict())))
+
+    def _put_teacher(self, teacher):
+        self.conn.execute(
+            "INSERT INTO teachers (teacher_id, data) VALUES (?, ?) "
+            "ON CONFLICT(teacher_id) DO UPDATE SET data=excluded.data",
+            (teacher.get_teacher_id(), json.dumps(teacher.to_dict())))
+
+    def _put_admin(self, admin):
+        self.conn.execute(
+            "INSERT INTO admins (admin_id, username, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(admin_id) DO UPDATE SET username=excluded.username, data=excluded.data",
+            (admin.get('admin_id'), admin.get('username'), json.dumps(admin)))
+
+    def _put_exam(self, exam):
+        exam_id = exam.get('exam_id')
+        meta = {k: v for k, v in exam.items() if k != 'results'}
+        self.conn.execute(
+            "INSERT INTO exams (exam_id, class_section, date, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(exam_id) DO UPDATE SET class_section=excluded.class_section, "
+            "date=excluded.date, data=excluded.data",
+            (exam_id, exam.get('class', ''), exam.get('date', ''), json.dumps(meta)))
+        self.conn.execute("DELETE FROM exam_results WHERE exam_id = ?", (exam_id,))
+        self.conn.executemany(
+            "INSERT INTO exam_results (exam_id, student_id, marks, bonus, extra) VALUES (?, ?, ?, ?, ?)",
+            [(exam_id, sid, res.get('marks'), res.get('bonus'), _result_extra(res))
+             for sid, res in (exam.get('results') or {}).items()])
+
+    def _put_attendance_day(self, date, records):
+        self.conn.execute("DELETE FROM attendance WHERE date = ?", (date,))
+        if records:
+            self.conn.executemany(
+                "INSERT INTO attendance (date, student_id, status) VALUES (?, ?, ?)",
+                [(date, sid, status) for sid, status in records.items()])
+
+    def _put_fee_transaction(self, txn):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO fee_transactions (seq, student_id, amount, date, method) VALUES (?, ?, ?, ?, ?)",
+            (txn['seq'], txn.get('student_id'), txn.get('amount'), txn.get('date'), txn.get('method')))
+
+    def _write_meta(self, manager):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(k, str(getattr(manager, k))) for k in META_KEYS])
+
+    # ---- saving ----
+    def write_all(self, manager):
+        """Replace every table with the manager's current state (used for migration)."""
+        with self.conn:
+            for table in ('students', 'teachers', 'admins', 'exams', 'exam_results',
+                          'attendance', 'fee_structure', 'fee_transactions'):
+                self.conn.execute(f"DELETE FROM {table}")
+            for stu in manager.students:
+                self._put_student(stu)
+            for t in manager.teachers:
+                self._put_teacher(t)
+            for a in manager.admins:
+                self._put_admin(a)
+            for ex in manager.exams:
+                self._put_exam(ex)
+            for date, records in manager.attendance.items():
+                self._put_attendance_day(date, records)
+            for cls, amount in manager.fee_structure.items():
+                self.conn.execute("INSERT INTO fee_structure (class_section, amount) VALUES (?, ?)",
+                                  (cls, json.dumps(amount)))
+            for txn in manager.fee_transactions:
+                self._put_fee_transaction(txn)
+            self._write_meta(manager)
+
+    def save_data(self, manager, full=False):
+        if full or self.is_empty():
+            self.write_all(manager)
+            return
+        with self.conn:
+            for kind, key in manager._pending_changes:
+                if kind == 'student':
+                    stu = manager.find_student_by_id(key)
+                    if stu:
+                        self._put_student(stu)
+                    else:
+                        self.conn.execute("DELETE FROM students WHERE student_id = ?", (key,))
+                elif kind == 'teacher':
+                    t = manager.find_teacher_id(key)
+                    if t:
+                        self._put_teacher(t)
+                    else:
+                        self.conn.execute("DELETE FROM teachers WHERE teacher_id = ?", (key,))
+                elif kind == 'admin':
+                    admin = manager.find_admin_by_id(key)
+                    if admin:
+                        self._put_admin(admin)
+                    else:
+                        self.conn.execute("DELETE FROM admins WHERE admin_id = ?", (key,))
+                elif kind == 'exam':
+                    exam = manager.find_exam_by_id(key)
+                    if exam:
+                        self._put_exam(exam)
+                    else:
+                        self.conn.execute("DELETE FROM exams WHERE exam_id = ?", (key,))
+                        self.conn.execute("DELETE FROM exam_results WHERE exam_id = ?", (key,))
+                elif kind == 'fee_structure':
+                    if key in manager.fee_structure:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO fee_structure (class_section, amount) VALUES (?, ?)",
+                            (key, json.dumps(manager.fee_structure[key])))
+                    else:
+                        self.conn.execute("DELETE FROM fee_structure WHERE class_section = ?", (key,))
+                elif kind == 'fee_transaction':
+                    txn = manager.find_fee_transaction(key)
+                    if txn:
+                        self._put_fee_transaction(txn)
+                    else:
+                        self.conn.execute("DELETE FROM fee_transactions WHERE seq = ?", (key,))
+            self._write_meta(manager)
+
+    def save_attendance(self, manager):
+        with self.conn:
+            for date in manager._pending_attendance:
+                self._put_attendance_day(date, manager.attendance.get(date))
+
+
+def migrate_json_to_sqlite(data_file='school_data.json', attendance_file='attendance.json', db_file='school_data.db'):
+    """One-shot copy of school_data.json + attendance.json into a SQLite database."""
+    from classes import SchoolManager
+
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(data_file)
+    manager = SchoolManager(data_file, attendance_file=attendance_file)
+    storage = SQLiteStorage(db_file)
+    storage.write_all(manager)
+    return storage
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) >= 2 and sys.argv[1] == 'migrate':
+        args = sys.argv[2:5]
+        storage = migrate_json_to_sqlite(*args)
+        print(f"Migrated into {storage.path}")
+        storage.close()
+    else:
+        print("usage: python storage.py migrate [school_data.json] [attendance.json] [school_data.db]")
@@ -0,0 +1,83 @@
+# Grades and class statistics: the NumPy path and the plain Python fallback
+# must give the same numbers, and the manager's gradebook must follow edits.
+
+import pytest
+
+import analytics
+from analytics import GradeBook, exam_statistics
+from classes import SchoolManager, Student
+
+STUDENTS = [
+    ('STU001', '1-A', {'Math': 95, 'Art': 88}),
+    ('STU002', '1-A', {'Math': 45}),
+    ('STU003', '1-A', {}),
+    ('STU004', '2-B', {'Math': 72.5, 'Science': 61, 'Art': 'absent'}),
+    ('STU005', '2-B', {'Science': 80}),
+]
+
+EXAMS = [
+    ('EX001', 100.0, [40, 55, 90, 100], [15, 0, 5, 10]),
+    ('EX002', 50.0, [20], [0]),
+    ('EX003', 0.0, [10], [0]),
+    ('EX004', 100.0, [], []),
+]
+
+
+def students():
+    out = []
+    for sid, cls, marks in STUDENTS:
+        stu = Student(sid, {'Phone': '', 'Email': ''}, sid)
+        stu.class_section = cls
+        stu.marks = marks
+        out.append(stu)
+    return out
+
+
+def same(a, b):
+    # equal structure, floats compared approximately
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for key in a:
+            same(a[key], b[key])
+    elif isinstance(a, float) or isinstance(b, float):
+        assert a == pytest.approx(b)
+    else:
+        assert a == b
+
+
+def figures(book):
+    return ([(book.average(sid), book.grade(sid)) for sid, _, _ in STUDENTS],
+            book.ranked(), book.class_stats())
+
+
+def test_gradebook_paths_agree(monkeypatch):
+    fast = GradeBook(students())
+    assert fast.vectorized
+    assert fast.grade('STU001') == 'A+' and fast.grade('STU003') is None
+    assert fast.ranked(2) == [('STU001', 91.5), ('STU005', 80.0)]
+    expected = figures(fast)
+
+    monkeypatch.setattr(analytics, 'np', None)
+    slow = GradeBook(students())
+    assert not slow.vectorized
+    averages, ranked, class_stats = figures(slow)
+    assert averages == expected[0]
+    assert ranked == expected[1]
+    same(class_stats, expected[2])
+
+
+def test_exam_statistics_paths_agree(monkeypatch):
+    fast = exam_statistics(EXAMS)
+    monkeypatch.setattr(analytics, 'np', None)
+    same(fast, exam_statistics(EXAMS))
+    assert fast['EX001']['bonus']['passed_by_bonus'] == 1
+    assert fast['EX001']['histogram'] == {'50-59': 2, '90-100': 1, '>100': 1}
+    assert fast['EX004'] == {'count': 0, 'histogram': {}}
+
+
+def test_manager_gradebook_follows_marks(tmp_path):
+    manager = SchoolManager(str(tmp_path / 'school_data.json'), attendance_file=str(tmp_path / 'attendance.json'))
+    bob = manager.service.add_student('Bob', class_section='1-A', marks={'Math': 40})
+    assert manager.gradebook().grade(bob.get_student_id()) == 'F'
+    manager.service.set_marks(bob.get_student_id(), {'Math': 95})
+    assert manager.gradebook().grade(bob.get_student_id()) == 'A+'
@@ -0,0 +1,104 @@
+import struct
+
+import pytest
+
+from attendance import MAGIC, AttendanceStore
+from classes import SchoolManager
+
+
+def _store():
+    store = AttendanceStore()
+    store.set('2025-01-06', 'S1', 'Present')
+    store.set('2025-01-06', 'S2', 'Absent')
+    store.set('2025-01-07', 'S1', 'Present')
+    store.set('2025-02-03', 'S2', 'Present')
+    return store
+
+
+def test_check_counters_consistent():
+    store = _store()
+    assert store.check_counters()
+    assert store.rollup('month') == [('2025-01', 2, 3, 2), ('2025-02', 1, 1, 1)]
+
+
+def test_check_counters_repairs_day_counters_and_rollups():
+    store = _store()
+    expected_month = store.rollup('month')
+    expected_week = store.rollup('week')
+    store._day_present[0] += 5
+    store._rollups['month']['2025-01'][1] += 2
+    store._rollups['week'].clear()
+
+    assert not store.check_counters()
+    assert store.check_counters()
+    assert store.rollup('month') == expected_month
+    assert store.rollup('week') == expected_week
+    assert store.counts_between('2025-01-06', '2025-01-06') == (1, 2)
+
+
+def test_check_counters_without_repair_leaves_drift():
+    store = _store()
+    store._day_total[1] += 1
+
+    assert not store.check_counters(repair=False)
+    assert store._day_total[1] == 2
+    assert not store.check_counters(repair=False)
+
+
+def test_clear_student_updates_every_counter():
+    store = _store()
+    assert store.clear_student('S2') == ['2025-01-06', '2025-02-03']
+    assert store.counts('S2') == (0, 0)
+    assert store.counts('S1') == (2, 2)
+    assert store.rollup('month') == [('2025-01', 2, 2, 2), ('2025-02', 0, 0, 1)]
+    assert store.check_counters(repair=False)
+    assert store.clear_student('S9') == []
+
+
+def test_binary_round_trip(tmp_path):
+    store = _store()
+    store.set('2025-01-08', 'odd\nname', 'Late')
+    path = str(tmp_path / 'attendance.bin')
+    store.save(path)
+    loaded = AttendanceStore.load(path)
+    assert loaded.to_dict() == store.to_dict()
+    assert loaded.counts('odd\nname') == (0, 1)
+    assert loaded.rollup('week') == store.rollup('week')
+    assert loaded.check_counters(repair=False)
+
+
+def test_damaged_binary_is_rejected(tmp_path):
+    path = tmp_path / 'attendance.bin'
+    _store().save(str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    with pytest.raises(ValueError):
+        AttendanceStore.load(str(path))
+    # one date too many in the header
+    path.write_bytes(data[:len(MAGIC) + 1] + struct.pack('<I', 4) + data[len(MAGIC) + 5:])
+    with pytest.raises(ValueError):
+        AttendanceStore.load(str(path))
+
+
+def test_version_1_binary_still_loads(tmp_path):
+    def block(names):
+        raw = '\n'.join(names).encode()
+        return struct.pack('<I', len(raw)) + raw
+
+    path = tmp_path / 'attendance.bin'
+    path.write_bytes(MAGIC + bytes([1]) + struct.pack('<III', 1, 2, 3) + block(['2025-01-06']) +
+                     block(['S1', 'S2']) + block(['', 'Present', 'Absent']) +
+                     struct.pack('<IIII', 1, 0, 1, 1) + bytes([1, 2]))
+    assert AttendanceStore.load(str(path)).to_dict() == {'2025-01-06': {'S1': 'Present', 'S2': 'Absent'}}
+
+
+def test_damaged_binary_falls_back_to_json(tmp_path):
+    data = str(tmp_path / 'school_data.json')
+    manager = SchoolManager(data, attendance_file=str(tmp_path / 'attendance.json'))
+    manager.service.add_student('Bob', class_section='1-A', student_id='STU001')
+    manager.set_attendance('2025-01-06', 'STU001', 'Present')
+    manager.save_attendance(str(tmp_path / 'attendance.json'))
+    (tmp_path / 'attendance.bin').write_bytes(MAGIC + bytes([2]) + b'\x01')
+
+    reopened = SchoolManager(data, attendance_file=str(tmp_path / 'attendance.bin'))
+    assert reopened.attendance.to_dict() == {'2025-01-06': {'STU001': 'Present'}}
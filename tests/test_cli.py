@@ -0,0 +1,58 @@
+# Exit codes of the batch commands, which scripts rely on.
+
+import os
+
+import pytest
+
+import cli
+from classes import SchoolManager
+
+
+@pytest.fixture
+def school(tmp_path):
+    data = str(tmp_path / 'school_data.json')
+    manager = SchoolManager(data, attendance_file=str(tmp_path / 'attendance.json'))
+    manager.service.add_student('Bob', class_section='1-A', marks={'Math': 80})
+    manager.save_data()
+    return ['--data', data, '--attendance', str(tmp_path / 'attendance.json')]
+
+
+def test_report_succeeds(school):
+    assert cli.main(school + ['report', 'students']) == 0
+    assert cli.main(school + ['report', 'class', '1-A']) == 0
+    assert cli.main(school + ['report', 'top', '--n', '3']) == 0
+
+
+def test_report_error_exits_non_zero(school):
+    assert cli.main(school + ['report', 'class', '9-Z']) == 1
+    assert cli.main(school + ['report', 'top', '--exam', 'EX999']) == 1
+    assert cli.main(school + ['report', 'exam-stats', '--exam', 'EX999']) == 1
+    assert cli.main(school + ['report', 'student-exams', 'STU999']) == 1
+
+
+def test_missing_data_file_is_not_created(tmp_path):
+    data = str(tmp_path / 'typo.json')
+    for command in (['report', 'students'], ['export', 'students'], ['search', 'students', 'bob']):
+        assert cli.main(['--data', data] + command) == 1
+    assert not os.path.exists(data)
+
+
+def test_import_may_start_a_new_school(tmp_path):
+    data = str(tmp_path / 'school_data.json')
+    source = tmp_path / 'students.csv'
+    source.write_text('Student ID,Name,Class,Phone,Email,Fee Status,Paid Amount\n'
+                      'STU001,Bob,1-A,9878567167,bob@example.com,Pending,0\n')
+    assert cli.main(['--data', data, '--attendance', str(tmp_path / 'a.json'), 'import', 'students', str(source)]) == 0
+    assert [stu.name for stu in SchoolManager(data, attendance_file=str(tmp_path / 'a.json')).students] == ['Bob']
+
+
+def test_parallel_import_saves_every_row(school, tmp_path):
+    source = tmp_path / 'fees.csv'
+    source.write_text('Student ID,Amount,Date,Method\n' +
+                      ''.join(f'STU001,{i % 7 + 1},2025-01-{i % 28 + 1:02d},Cash\n' for i in range(2000)))
+    assert cli.main(school + ['import', 'fees', str(source), '--workers', '2']) == 0
+
+    reopened = SchoolManager(school[1], attendance_file=school[3])
+    assert len(reopened.fee_transactions) == 2000
+    assert sum(t['amount'] for t in reopened.fee_transactions) == sum(i % 7 + 1 for i in range(2000))
+    assert [t['seq'] for t in reopened.fee_transactions] == list(range(2000))
@@ -0,0 +1,47 @@
+# Per-exam statistics are cached on the manager; any change to an exam's
+# results must drop its entry so the next query recomputes it.
+
+from classes import SchoolManager
+
+
+def open_manager(path):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'))
+
+
+def fresh(manager, exam_id):
+    manager._exam_stats = {}
+    return manager.exam_stats([exam_id])[exam_id]
+
+
+def test_cache_follows_results(tmp_path):
+    manager = open_manager(tmp_path)
+    s = manager.service
+    ann, bob = (s.add_student(name, class_section='1-A').get_student_id() for name in ('Ann', 'Bob'))
+    s.create_exam('1-A', 'Math', exam_id='EX001', max_marks=50, allow_bonus=True)
+    s.create_exam('1-A', 'Art', exam_id='EX002')
+    s.record_exam_results('EX001', {ann: (20, 0)})
+    s.record_exam_results('EX002', {ann: (90, 0)})
+
+    first = manager.exam_stats()
+    assert first['EX001']['count'] == 1
+    assert manager.exam_stats() == first
+
+    s.record_exam_results('EX001', {bob: (22, 4)})
+    stats = manager.exam_stats(['EX001'])['EX001']
+    assert (stats['count'], stats['max'], stats['bonus']['passed_by_bonus']) == (2, 26.0, 1)
+    # the other exam's entry was left alone
+    assert manager.exam_stats(['EX002'])['EX002'] is first['EX002']
+    assert stats == fresh(manager, 'EX001')
+
+
+def test_direct_edits_need_mark_changed(tmp_path):
+    manager = open_manager(tmp_path)
+    ann = manager.service.add_student('Ann', class_section='1-A').get_student_id()
+    exam = manager.service.create_exam('1-A', 'Math', exam_id='EX001')
+    manager.service.record_exam_results('EX001', {ann: (40, 0)})
+    assert manager.exam_stats(['EX001'])['EX001']['pass_rate'] == 0.0
+
+    exam['results'][ann]['marks'] = 60
+    manager.mark_changed('exam', 'EX001')
+    assert manager.exam_stats(['EX001'])['EX001']['pass_rate'] == 1.0
+    assert manager.exam_stats(['EX999']) == {}
@@ -0,0 +1,64 @@
+# CSV imports: serial and parallel parsing agree, and unparseable amounts are
+# imported as 0 with a warning, as the row-by-row import did.
+
+import csv
+
+from classes import SchoolManager, attendance_records, fee_transaction_records
+from importer import ImportStats, parallel_records, read_chunks
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def serial_records(filename, parse, stats):
+    records = []
+    with open(filename, newline='') as f:
+        for chunk in read_chunks(f, chunk_size=97):
+            stats.read(len(chunk))
+            records.extend(parse(chunk, stats))
+    return records
+
+
+def test_parallel_matches_serial(tmp_path):
+    rows = []
+    for i in range(3000):
+        date = 'not-a-date' if i % 500 == 7 else f'2025-01-{i % 28 + 1:02d}'
+        rows.append([date, f'STU{i % 40:03d}', '' if i % 333 == 5 else ('P' if i % 3 else 'Absent')])
+    filename = write_csv(tmp_path / 'attendance.csv', ['Date', 'Student ID', 'Status'], rows)
+    serial_stats, parallel_stats = ImportStats('attendance'), ImportStats('attendance')
+
+    serial = serial_records(filename, attendance_records, serial_stats)
+    parallel = parallel_records(filename, attendance_records, parallel_stats, workers=2)
+    assert parallel == serial
+    assert parallel_stats.rows == serial_stats.rows == 3000
+    assert parallel_stats.skipped == serial_stats.skipped
+    assert set(serial_stats.skipped) == {'incomplete', 'invalid date'}
+
+
+def test_parallel_fees_keep_warnings(tmp_path):
+    rows = [[f'STU{i:03d}', 'ten' if i % 100 == 0 else str(i), '2025-01-01', 'Cash'] for i in range(1000)]
+    filename = write_csv(tmp_path / 'fees.csv', ['Student ID', 'Amount', 'Date', 'Method'], rows)
+    serial_stats, parallel_stats = ImportStats('fee'), ImportStats('fee')
+
+    serial = serial_records(filename, fee_transaction_records, serial_stats)
+    assert parallel_records(filename, fee_transaction_records, parallel_stats, workers=2) == serial
+    assert len(serial) == 1000
+    assert parallel_stats.warnings == serial_stats.warnings == {'invalid amount, imported as 0': 10}
+
+
+def test_bad_amounts_are_imported_as_zero(tmp_path):
+    manager = SchoolManager(str(tmp_path / 'school_data.json'), attendance_file=str(tmp_path / 'attendance.json'))
+    students = write_csv(tmp_path / 'students.csv', ['Student ID', 'Name', 'Class', 'Paid Amount'],
+                         [['STU001', 'Bob', '1-A', 'abc'], ['STU002', 'Carol', '1-A', '250']])
+    fees = write_csv(tmp_path / 'fees.csv', ['Student ID', 'Amount', 'Date', 'Method'],
+                     [['STU001', 'n/a', '2025-01-01', 'Cash']])
+
+    assert manager.import_students_csv(students) == 2
+    assert [stu.paid_amount for stu in manager.students] == [0.0, 250.0]
+    assert manager.import_fee_transactions_csv(fees) == 1
+    assert manager.fee_transactions[0]['amount'] == 0.0
@@ -0,0 +1,87 @@
+# Journal mode: changes are appended to school_data.json.journal and replayed
+# on top of the snapshot by the next manager, as after a crash.
+
+import json
+
+from classes import SchoolManager
+from storage import Journal
+
+TORN = '{"op":"put","kind":"student","key":"STU0'
+
+
+def open_manager(path, **kwargs):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'),
+                         journal=True, **kwargs)
+
+
+def names(manager):
+    return [stu.name for stu in manager.students]
+
+
+def test_appended_changes_replay_after_a_crash(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.service.add_student('Bob', class_section='1-A')
+    manager.save_data()
+    assert manager._journal.count > 0
+
+    # no compaction or clean exit: the next manager rebuilds from the journal
+    reopened = open_manager(tmp_path)
+    assert names(reopened) == ['Bob']
+    assert reopened.last_student_id == manager.last_student_id
+
+
+def test_delete_then_replay(tmp_path):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A')
+    manager.service.add_student('Carol', class_section='1-A')
+    manager.save_data()
+    manager.service.delete_student(bob.get_student_id())
+    manager.save_data()
+
+    assert names(open_manager(tmp_path)) == ['Carol']
+
+
+def test_torn_tail_is_skipped_and_kept(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.service.add_student('Bob', class_section='1-A')
+    manager.save_data()
+    journal = tmp_path / 'school_data.json.journal'
+    with open(journal, 'a') as f:
+        f.write(TORN)
+    before = journal.read_bytes()
+
+    reopened = open_manager(tmp_path)
+    assert names(reopened) == ['Bob']
+    # loading never rewrites the journal
+    assert journal.read_bytes() == before
+    assert reopened._journal.torn_at == before.rindex(TORN.encode())
+
+    reopened.service.add_student('Carol', class_section='1-A')
+    reopened.save_data()
+    assert (tmp_path / 'school_data.json.journal.torn').read_text() == TORN + '\n'
+    assert names(open_manager(tmp_path)) == ['Bob', 'Carol']
+
+
+def test_read_reports_first_torn_line(tmp_path):
+    path = tmp_path / 'j'
+    good = json.dumps({'op': 'meta', 'data': {}})
+    path.write_text(good + '\n' + TORN + '\n' + good + '\n')
+    journal = Journal(str(path))
+    records, torn_at = journal.read()
+    assert len(records) == 2
+    assert torn_at == len(good) + 1
+
+
+def test_fee_transactions_replay_by_seq(tmp_path):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A')
+    manager.save_data()
+    manager.service.pay_fee(bob.get_student_id(), 100)
+    manager.service.pay_fee(bob.get_student_id(), 50)
+    manager.save_data()
+
+    reopened = open_manager(tmp_path)
+    assert [(t['seq'], t['amount']) for t in reopened.fee_transactions] == [(0, 100.0), (1, 50.0)]
+    assert reopened.find_fee_transaction(1)['amount'] == 50.0
+    reopened.service.pay_fee(bob.get_student_id(), 25)
+    assert reopened.fee_transactions[-1]['seq'] == 2
@@ -0,0 +1,55 @@
+# Leaderboards are built once and then updated in place; after any edit they
+# must rank exactly as boards rebuilt from scratch would.
+
+from classes import SchoolManager
+
+
+def open_manager(path):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'))
+
+
+def queries(manager):
+    return {
+        'overall': manager.top_students(10),
+        'classes': {cls: manager.top_students(10, class_name=cls) for cls in ('1-A', '2-B', '3-C')},
+        'subjects': {subject: manager.top_students(10, subject=subject) for subject in ('Math', 'Art')},
+        'exam': manager.top_students(10, exam_id='EX001'),
+    }
+
+
+def rebuilt(manager):
+    manager._leaderboards = None
+    manager._exam_boards = {}
+    return queries(manager)
+
+
+def test_boards_follow_edits(tmp_path):
+    manager = open_manager(tmp_path)
+    s = manager.service
+    ids = [s.add_student(name, class_section=cls, marks=marks).get_student_id() for name, cls, marks in [
+        ('Ann', '1-A', {'Math': 90, 'Art': 70}),
+        ('Bob', '1-A', {'Math': 80}),
+        ('Cid', '2-B', {'Math': 80, 'Art': 95}),
+        ('Dee', '2-B', {'Art': 60}),
+    ]]
+    s.create_exam('1-A', 'Math', exam_id='EX001', allow_bonus=True)
+    s.record_exam_results('EX001', {ids[0]: (70, 0), ids[1]: (65, 10)})
+    queries(manager)  # build the boards before editing
+
+    s.set_marks(ids[1], {'Art': 100})
+    s.update_student(ids[2], class_section='1-A')
+    s.delete_student(ids[0])
+    s.add_student('Eve', class_section='3-C', marks={'Math': 80})
+    s.record_exam_results('EX001', {ids[2]: (90, 0)})
+
+    incremental = queries(manager)
+    assert incremental == rebuilt(manager)
+    assert [sid for sid, _ in incremental['classes']['1-A']] == [ids[1], ids[2]]
+    assert incremental['exam'][0] == (ids[2], 90.0)
+
+
+def test_class_names_ignore_case_and_spaces(tmp_path):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A', marks={'Math': 80})
+    assert manager.top_students(5, class_name=' 1-a ') == [(bob.get_student_id(), 80.0)]
+    assert manager.top_students(5, class_name='9-Z') == []
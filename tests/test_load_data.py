@@ -0,0 +1,54 @@
+# Loading must never cost the user their data file: a file that fails to load
+# is left alone on exit and set aside (not overwritten) by the first real save.
+
+import glob
+import json
+import os
+
+from autosave import AutoSaver
+from classes import SchoolManager
+
+CORRUPT = '{"students": [{"name": "Alice", "student_id": "STU0'
+
+
+def open_manager(path, **kwargs):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'), **kwargs)
+
+
+def test_missing_file_is_created(tmp_path):
+    manager = open_manager(tmp_path)
+    assert not manager.data_changed
+    with open(tmp_path / 'school_data.json') as f:
+        assert json.load(f)['admins'][0]['username'] == 'admin'
+
+
+def test_unreadable_file_is_untouched_on_exit(tmp_path):
+    data_file = tmp_path / 'school_data.json'
+    data_file.write_text(CORRUPT)
+    manager = open_manager(tmp_path, lazy=True)
+    assert not manager.data_changed
+    AutoSaver(manager, backup=True).start().stop()
+    assert data_file.read_text() == CORRUPT
+    assert not glob.glob(str(tmp_path / 'school_data.json.unreadable-*'))
+
+
+def test_unreadable_file_is_set_aside_before_saving(tmp_path):
+    data_file = tmp_path / 'school_data.json'
+    data_file.write_text(CORRUPT)
+    manager = open_manager(tmp_path)
+    manager.service.add_student('Bob', class_section='1-A')
+    manager.save_data()
+    kept = glob.glob(str(tmp_path / 'school_data.json.unreadable-*'))
+    assert len(kept) == 1
+    with open(kept[0]) as f:
+        assert f.read() == CORRUPT
+    with open(data_file) as f:
+        assert [s['name'] for s in json.load(f)['students']] == ['Bob']
+
+
+def test_empty_file_is_not_rewritten_until_a_change(tmp_path):
+    data_file = tmp_path / 'school_data.json'
+    data_file.write_text('')
+    manager = open_manager(tmp_path)
+    assert not manager.data_changed
+    assert os.path.getsize(data_file) == 0
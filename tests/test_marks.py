@@ -0,0 +1,47 @@
+# Student marks live in a shared subject tuple plus an array of floats; marks
+# given as ints, strings or non-numeric values must come back unchanged.
+
+from classes import SchoolManager, Student
+
+
+def student(marks):
+    stu = Student('Bob', {'Phone': '', 'Email': ''}, 'STU001')
+    stu.marks = marks
+    return stu
+
+
+def test_marks_keep_their_type():
+    marks = {'Math': 85, 'Science': 72.5, 'Art': 'absent', 'Music': '90'}
+    stu = student(marks)
+    assert stu.to_dict()['marks'] == marks
+    assert type(stu.marks['Math']) is int
+    assert stu.marks['Art'] == 'absent'
+    assert 'Art' in stu.marks and len(stu.marks) == 4
+    # only numbers count towards the average
+    assert list(stu._mark_subjects) == ['Math', 'Science', 'Music']
+    assert stu.calculate_grade() is not None
+
+
+def test_editing_marks_keeps_view_and_values_in_step():
+    stu = student({'Math': 85, 'Art': 'absent'})
+    stu.marks['Math'] = 90.5
+    stu.marks['Art'] = 60
+    del stu.marks['Math']
+    assert dict(stu.marks.items()) == {'Art': 60}
+    assert list(stu._mark_values) == [60.0]
+    stu.marks['Art'] = 'absent'
+    assert dict(stu.marks.items()) == {'Art': 'absent'}
+    assert list(stu._mark_values) == []
+
+
+def test_json_and_snapshot_round_trips(tmp_path):
+    marks = {'Math': 85, 'Science': 72.5, 'Art': 'absent'}
+    for name in ('school_data.json', 'school_data.bin'):
+        data = str(tmp_path / name)
+        manager = SchoolManager(data, attendance_file=str(tmp_path / 'attendance.json'))
+        bob = manager.service.add_student('Bob', class_section='1-A')
+        bob.marks = marks
+        manager.mark_changed('student', bob.get_student_id())
+        manager.save_data()
+        reopened = SchoolManager(data, attendance_file=str(tmp_path / 'attendance.json'))
+        assert reopened.students[0].to_dict()['marks'] == marks
@@ -0,0 +1,59 @@
+# Paged list views: sorting, filtering and paging work on raw column values,
+# and output that isn't a terminal is a plain tab-separated dump.
+
+import pytest
+
+from classes import SchoolManager
+from pager import Column, Pager
+
+ROWS = [{'id': f'S{i}', 'name': name, 'score': score}
+        for i, (name, score) in enumerate([('bob', 70), ('Ann', 9.5), ('cid', 100), ('Dee', 70), ('eve', 'N/A')])]
+COLUMNS = [Column('ID', lambda r: r['id']), Column('Name', lambda r: r['name']), Column('Score', lambda r: r['score'])]
+
+
+def ids(pager):
+    return [r['id'] for r in pager.window()]
+
+
+def test_pages_and_commands():
+    pager = Pager(ROWS, COLUMNS, page_size=2)
+    assert pager.pages == 3 and ids(pager) == ['S0', 'S1']
+    assert pager.command('n') and ids(pager) == ['S2', 'S3']
+    assert pager.command('g 9') and ids(pager) == ['S4']
+    assert not pager.command('n')
+    assert pager.command('p') and pager.page == 1
+    assert not pager.command('q')
+
+
+def test_sort_and_filter():
+    pager = Pager(ROWS, COLUMNS, page_size=None)
+    # numbers before text, ties keep their order, text ignores case
+    pager.sort('score')
+    assert ids(pager) == ['S1', 'S0', 'S3', 'S2', 'S4']
+    pager.sort('score')
+    assert pager.reverse and ids(pager)[0] == 'S4'
+    pager.sort('na', reverse=False)
+    assert ids(pager) == ['S1', 'S0', 'S2', 'S3', 'S4']
+
+    pager.filter('name=E')
+    assert ids(pager) == ['S3', 'S4']
+    pager.filter('70')
+    assert ids(pager) == ['S0', 'S3']
+    assert pager.status() == 'Page 1/1 · 2 of 5 rows · sorted by Name · filter: 70'
+    pager.filter('')
+    assert len(pager.view) == 5
+    with pytest.raises(ValueError):
+        pager.sort('nope')
+
+
+def test_list_students_dumps_plain_rows(tmp_path, capsys):
+    manager = SchoolManager(str(tmp_path / 'school_data.json'), attendance_file=str(tmp_path / 'attendance.json'))
+    for name, cls in [('Bob', '2-B'), ('Ann', '1-A'), ('Cid', '1-A')]:
+        manager.service.add_student(name, class_section=cls)
+    capsys.readouterr()
+
+    manager.list_students(sort='-name', query='class=1-a')
+    lines = capsys.readouterr().out.splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith('ID\t'))
+    assert [line.split('\t')[1] for line in lines[start + 1:start + 3]] == ['Cid', 'Ann']
+    assert 'Bob' not in '\n'.join(lines[start:])
@@ -0,0 +1,59 @@
+# Student and teacher search go through a trigram index kept up to date as
+# records change; results must match a plain substring scan of the same fields.
+
+from classes import SchoolManager
+
+
+def open_manager(path):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'))
+
+
+def scan(manager, query):
+    query = query.lower()
+    return {stu.get_student_id() for stu in manager.students
+            if any(query in str(field).lower() for field in manager._student_search_fields(stu))}
+
+
+def found(manager, query):
+    return {stu.get_student_id() for stu in manager.find_students(query)}
+
+
+QUERIES = ['an', 'ann', 'nna', '1-a', '2-b', 'paid', 'pending', 'stu00', '@example', 'zzz']
+
+
+def test_student_search_follows_edits(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.fee_structure['1-A'] = 100
+    s = manager.service
+    ids = [s.add_student(name, email=f'{name.lower()}@example.com', class_section=cls).get_student_id()
+           for name, cls in [('Anna', '1-A'), ('Bob', '1-A'), ('Hannah', '2-B')]]
+    for query in QUERIES:
+        assert found(manager, query) == scan(manager, query)
+
+    s.update_student(ids[1], name='Joanna', class_section='2-B')
+    s.delete_student(ids[2])
+    s.add_student('Dan', class_section='1-A')
+    s.pay_fee(ids[0], 100)
+
+    for query in QUERIES:
+        assert found(manager, query) == scan(manager, query), query
+    assert found(manager, 'hannah') == set()
+    assert found(manager, 'joanna') == {ids[1]}
+
+
+def test_name_matches_rank_first(tmp_path):
+    manager = open_manager(tmp_path)
+    a = manager.service.add_student('Zed', email='ann@example.com', class_section='1-A')
+    b = manager.service.add_student('Ann', class_section='1-A')
+    assert [stu.get_student_id() for stu in manager.find_students('ann')] == [b.get_student_id(), a.get_student_id()]
+    assert len(manager.find_students('an', limit=1)) == 1
+
+
+def test_teacher_search_follows_new_teachers(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.service.add_teacher('Tess', subjects=['Math', 'Art'])
+    assert [t.name for t in manager.find_teachers('math')] == ['Tess']
+    manager.service.add_teacher('Mathilda', subjects=['Music'])
+    assert {t.name for t in manager.find_teachers('math')} == {'Tess', 'Mathilda'}
+    # subjects are indexed apart, so a query can't straddle two of them
+    assert manager.find_teachers('hart') == []
@@ -0,0 +1,53 @@
+# The class-section index is kept up to date as students change; after any
+# edit it must group students exactly as filtering the student list would.
+
+from classes import SchoolManager
+from sections import class_key
+
+
+def open_manager(path):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'))
+
+
+def by_filter(manager):
+    groups = {}
+    for stu in manager.students:
+        groups.setdefault(class_key(stu.class_section), []).append(stu.get_student_id())
+    return groups
+
+
+def by_index(manager):
+    return {key: [stu.get_student_id() for stu in members] for key, members in manager.section_index().groups()}
+
+
+def test_index_follows_edits(tmp_path):
+    manager = open_manager(tmp_path)
+    s = manager.service
+    ids = [s.add_student(name, class_section=cls).get_student_id()
+           for name, cls in [('Ann', '1-A'), ('Bob', '1-a'), ('Cid', '2-B'), ('Dee', '3-C')]]
+    assert by_index(manager) == by_filter(manager)
+
+    s.update_student(ids[0], class_section='2-B')
+    s.delete_student(ids[3])
+    s.add_student('Eve', class_section='1-A')
+    s.update_student(ids[2], name='Cyd')
+
+    assert by_index(manager) == by_filter(manager)
+    # a student moved into a class keeps their place in list order
+    assert [stu.name for stu in manager.students_in_class('2-b')] == ['Ann', 'Cyd']
+    assert manager.students_in_class('3-C') == []
+    assert '3-c' not in manager.section_index()
+
+
+def test_class_groups_totals(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.fee_structure['1-A'] = 500
+    for name in ('Ann', 'Bob'):
+        manager.service.add_student(name, class_section='1-A')
+    manager.service.pay_fee(manager.students[0].get_student_id(), 200)
+    manager.service.update_student(manager.students[1].get_student_id(), class_section='2-B')
+
+    groups = manager.class_groups()
+    assert sorted(groups) == ['1-a', '2-b']
+    assert (groups['1-a']['students'], groups['1-a']['paid'], groups['1-a']['outstanding']) == (1, 200.0, 300.0)
+    assert groups['2-b']['students'] == 1
@@ -0,0 +1,87 @@
+# SchoolService rejects bad input with ValueError before changing anything.
+
+import json
+
+import pytest
+
+from classes import SchoolManager
+
+
+def open_manager(path):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'))
+
+
+@pytest.mark.parametrize('max_marks', [0, -10, 'abc'])
+def test_create_exam_rejects_bad_max_marks(tmp_path, max_marks):
+    manager = open_manager(tmp_path)
+    with pytest.raises(ValueError):
+        manager.service.create_exam('1-A', 'Math', max_marks=max_marks)
+    assert manager.exams == []
+
+
+def test_create_exam_rejects_a_duplicate_id(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.service.create_exam('1-A', 'Math', exam_id='EX010')
+    with pytest.raises(ValueError):
+        manager.service.create_exam('1-A', 'Science', exam_id='EX010')
+    assert [ex['subject'] for ex in manager.exams] == ['Math']
+
+
+def test_stored_exams_load_as_they_are(tmp_path):
+    exams = [
+        {'exam_id': 'EX001', 'class': '1-A', 'subject': 'Math', 'max_marks': 0, 'results': {}},
+        {'exam_id': 'EX001', 'class': '1-A', 'subject': 'Art', 'max_marks': -5, 'results': {}},
+    ]
+    (tmp_path / 'school_data.json').write_text(json.dumps({'exams': exams}))
+    manager = open_manager(tmp_path)
+    assert [ex['subject'] for ex in manager.exams] == ['Math', 'Art']
+
+
+def test_record_exam_results_checks_every_result_first(tmp_path):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A')
+    carol = manager.service.add_student('Carol', class_section='1-A')
+    exam = manager.service.create_exam('1-A', 'Math', max_marks=50)
+    with pytest.raises(ValueError):
+        manager.service.record_exam_results(exam['exam_id'], {bob.get_student_id(): 40,
+                                                              carol.get_student_id(): 60})
+    assert exam['results'] == {}
+    assert manager.service.record_exam_results(exam['exam_id'], {bob.get_student_id(): (40, 0)}) == 1
+    assert exam['results'] == {bob.get_student_id(): {'marks': 40.0, 'bonus': 0.0}}
+
+
+def test_enter_marks_keeps_marks_typed_before_an_interrupt(tmp_path, monkeypatch):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A')
+    manager.service.add_student('Carol', class_section='1-A')
+    exam = manager.service.create_exam('1-A', 'Math')
+    answers = iter(['1', '75'])
+
+    def fake_input(prompt=''):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise KeyboardInterrupt from None
+
+    monkeypatch.setattr('builtins.input', fake_input)
+    with pytest.raises(KeyboardInterrupt):
+        manager.enter_marks()
+    assert exam['results'] == {bob.get_student_id(): {'marks': 75.0, 'bonus': 0.0}}
+    # saved as it was typed
+    saved = json.loads((tmp_path / 'school_data.json').read_text())['exams'][0]['results']
+    assert saved == {bob.get_student_id(): {'marks': 75.0, 'bonus': 0.0}}
+
+
+def test_delete_student_clears_their_attendance(tmp_path):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A')
+    carol = manager.service.add_student('Carol', class_section='1-A')
+    manager.service.record_attendance('2025-01-06', {bob.get_student_id(): 'Present',
+                                                     carol.get_student_id(): 'Absent'})
+    manager.service.delete_student(carol.get_student_id())
+
+    assert manager.attendance.total_recorded() == 1
+    assert manager.attendance.counts_between() == (1, 1)
+    assert manager.check_attendance_counters(repair=False)
+    assert '2025-01-06' in manager.pending_changes()['attendance']
+    assert carol.get_student_id() not in manager.attendance['2025-01-06']
@@ -0,0 +1,48 @@
+# Binary snapshot: a .bin data file must hold exactly what school_data.json
+# holds, on its own and with a journal replayed on top.
+
+import snapshot
+from classes import SchoolManager
+
+
+def populate(manager):
+    bob = manager.service.add_student('Bob', phone='5551234567', email='bob@example.com', class_section='1-A',
+                                      marks={'Math': 85, 'Science': 72.5})
+    manager.service.add_student('Carol', class_section='2-B')
+    manager.service.add_teacher('Tess', role='Teacher', subjects=['Math', 'Art'])
+    manager.service.create_exam('1-A', 'Math', exam_id='EX001')
+    manager.service.record_exam_results('EX001', {bob.get_student_id(): (70, 0)})
+    manager.service.pay_fee(bob.get_student_id(), 120)
+    manager.save_data()
+    return manager
+
+
+def open_manager(path, name, **kwargs):
+    return SchoolManager(str(path / name), attendance_file=str(path / 'attendance.json'), **kwargs)
+
+
+def test_convert_round_trip(tmp_path):
+    source = populate(open_manager(tmp_path, 'school_data.json'))
+    snapshot.convert(str(tmp_path / 'school_data.json'), str(tmp_path / 'school_data.bin'))
+    snapshot.convert(str(tmp_path / 'school_data.bin'), str(tmp_path / 'back.json'))
+
+    assert open_manager(tmp_path, 'school_data.bin')._snapshot_dict() == source._snapshot_dict()
+    assert open_manager(tmp_path, 'back.json')._snapshot_dict() == source._snapshot_dict()
+
+
+def test_binary_data_file_round_trip(tmp_path):
+    source = populate(open_manager(tmp_path, 'school_data.bin'))
+    reopened = open_manager(tmp_path, 'school_data.bin')
+    assert reopened._snapshot_dict() == source._snapshot_dict()
+    assert reopened.find_student_by_id(source.students[0].get_student_id()).name == 'Bob'
+
+
+def test_journal_replays_on_a_binary_snapshot(tmp_path):
+    manager = populate(open_manager(tmp_path, 'school_data.bin', journal=True))
+    manager.compact_journal()
+    manager.service.update_student(manager.students[0].get_student_id(), class_section='3-C')
+    manager.service.add_student('Dan', class_section='1-A')
+    manager.save_data()
+
+    reopened = open_manager(tmp_path, 'school_data.bin', journal=True)
+    assert reopened._snapshot_dict() == manager._snapshot_dict()
@@ -0,0 +1,63 @@
+# SQLite backend: round trips through the database and never writes over a
+# database that failed to load.
+
+import glob
+import sqlite3
+
+from classes import SchoolManager
+from storage import SQLiteStorage
+
+
+def open_manager(path):
+    return SchoolManager(str(path / 'school_data.json'), attendance_file=str(path / 'attendance.json'),
+                         storage=SQLiteStorage(str(path / 'school.db')))
+
+
+def test_round_trip(tmp_path):
+    manager = open_manager(tmp_path)
+    bob = manager.service.add_student('Bob', class_section='1-A', marks={'Math': 85})
+    exam = manager.service.create_exam('1-A', 'Math', exam_id='EX001', allow_bonus=True)
+    manager.service.record_exam_results('EX001', {bob.get_student_id(): (70, 5)})
+    exam['results'][bob.get_student_id()]['remarks'] = 'late paper'
+    manager.mark_changed('exam', 'EX001')
+    manager.service.pay_fee(bob.get_student_id(), 120)
+    manager.service.record_attendance('2025-01-06', {bob.get_student_id(): 'Present'})
+    manager.save_data()
+    manager.save_attendance()
+
+    reopened = open_manager(tmp_path)
+    stu = reopened.find_student_by_id(bob.get_student_id())
+    assert (stu.name, stu.class_section, stu.marks) == ('Bob', '1-A', {'Math': 85.0})
+    assert reopened.find_exam_by_id('EX001')['results'] == {
+        bob.get_student_id(): {'marks': 70.0, 'bonus': 5.0, 'remarks': 'late paper'}}
+    assert [(t['seq'], t['amount']) for t in reopened.fee_transactions] == [(0, 120.0)]
+    assert reopened.attendance['2025-01-06'][bob.get_student_id()] == 'Present'
+
+
+def test_old_database_gains_the_extra_column(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE exam_results (exam_id TEXT NOT NULL, student_id TEXT NOT NULL, "
+                 "marks REAL, bonus REAL, PRIMARY KEY (exam_id, student_id))")
+    conn.close()
+    storage = SQLiteStorage(path)
+    assert 'extra' in {row[1] for row in storage.conn.execute("PRAGMA table_info(exam_results)")}
+
+
+def test_unreadable_database_is_set_aside_not_overwritten(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.service.add_student('Bob', class_section='1-A')
+    manager.save_data()
+    manager.storage.conn.execute("UPDATE students SET data = '{broken'")
+    manager.storage.conn.commit()
+    manager.storage.close()
+
+    failed = open_manager(tmp_path)
+    assert failed._load_failed and not failed.data_changed
+    failed.service.add_student('Carol', class_section='1-A')
+    failed.save_data()
+
+    kept = glob.glob(str(tmp_path / 'school.db.unreadable-*'))
+    assert len(kept) == 1
+    assert sqlite3.connect(kept[0]).execute("SELECT data FROM students").fetchall() == [('{broken',)]
+    assert [stu.name for stu in open_manager(tmp_path).students] == ['Carol']